@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""Initialisation de module(s)."""
+
+from .priority import Priority
+from .setting import AdmissionSetting
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Priority
+
+Enum for admission priority classes.
+This class defines the priority classes of the calls waiting for a provider.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from enum import Enum, unique
+
+
+@unique
+class Priority(str, Enum):
+    """
+    Enum for admission priority classes.
+    Queued calls are admitted by priority class (interactive first, batch last), then in arrival order.
+    """
+
+    Interactive = "INTERACTIVE"
+    Normal = "NORMAL"
+    Batch = "BATCH"
+
+    @property
+    def rank(self) -> int:
+        """The rank of the priority class, lower ranks are admitted first."""
+        return list(Priority).index(self)
+
+    @classmethod
+    def has_value(cls, value) -> bool:
+        return value in cls._value2member_map_
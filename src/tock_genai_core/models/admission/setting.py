@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+AdmissionSetting
+
+Configuration settings for the admission control of a provider.
+This class defines how many calls can be sent concurrently to a provider, and how the other calls are queued.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class AdmissionSetting(BaseModel):
+    """
+    Configuration settings for the admission control of a provider.
+    Calls beyond `max_in_flight` are queued by priority class, and rejected when the queue is full or when they
+    waited longer than `queue_timeout`.
+
+    Attributes
+    ----------
+    name: Optional[str]
+        Name of the admission controller, settings with the same name share their limits (e.g. several models served
+        by the same server) (default: None, the limits only apply to the calls of the setting)
+    max_in_flight: int
+        Maximum number of calls sent concurrently to the provider
+    max_queue: int
+        Maximum number of calls waiting for the provider, further calls are rejected (default: 100)
+    queue_timeout: Optional[float]
+        Maximum time in seconds a call waits for the provider before being rejected (default: None, no timeout)
+    """
+
+    name: Optional[str] = Field(
+        description="Name of the admission controller, settings with the same name share their limits.",
+        default=None,
+        examples=["vllm-server"],
+    )
+    max_in_flight: int = Field(description="Maximum number of calls sent concurrently to the provider.", gt=0)
+    max_queue: int = Field(
+        description="Maximum number of calls waiting for the provider, further calls are rejected.", default=100, ge=0
+    )
+    queue_timeout: Optional[float] = Field(
+        description="Maximum time in seconds a call waits for the provider before being rejected.", default=None, gt=0
+    )
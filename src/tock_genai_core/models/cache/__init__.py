@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""Initialisation de module(s)."""
+
+from .backend import CacheBackend
+from .setting import LLMCacheSetting, SemanticCacheSetting
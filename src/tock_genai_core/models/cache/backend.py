@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+CacheBackend
+
+Enum for cache storage backends.
+This class defines the available cache storage backends.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from enum import Enum, unique
+
+
+@unique
+class CacheBackend(str, Enum):
+    """
+    Enum for cache storage backends.
+    This class defines the available cache storage backends.
+    """
+
+    Memory = "MEMORY"
+    SQLite = "SQLITE"
+
+    @classmethod
+    def has_value(cls, value) -> bool:
+        return value in cls._value2member_map_
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+LLMCacheSetting, SemanticCacheSetting
+
+Configuration settings for the LLM response caches.
+These classes define how the responses of an LLM are cached and evicted.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from tock_genai_core.models.cache.backend import CacheBackend
+from tock_genai_core.models.database.types import DBSetting
+from tock_genai_core.models.embedding.types import EMSetting
+
+
+class LLMCacheSetting(BaseModel):
+    """
+    Configuration settings for the LLM response cache.
+    Responses are cached by exact match on the provider, the model, the prompt, the temperature and the other
+    generation parameters. It is meant for deterministic calls (e.g. temperature 0 classification or query rewriting).
+
+    Attributes
+    ----------
+    backend: CacheBackend
+        The cache storage backend (default: CacheBackend.Memory)
+    ttl: Optional[float]
+        Time in seconds after which a cached response expires (default: None, never)
+    max_size: int
+        Maximum number of cached responses, the least recently used ones are evicted first (default: 1024)
+    path: Optional[str]
+        Path of the SQLite database file, required by the SQLite backend (default: None)
+    """
+
+    backend: CacheBackend = Field(description="The cache storage backend.", default=CacheBackend.Memory)
+    ttl: Optional[float] = Field(
+        description="Time in seconds after which a cached response expires.", default=None, gt=0
+    )
+    max_size: int = Field(
+        description="Maximum number of cached responses, the least recently used ones are evicted first.",
+        default=1024,
+        gt=0,
+    )
+    path: Optional[str] = Field(
+        description="Path of the SQLite database file, required by the SQLite backend.",
+        default=None,
+        examples=["/tmp/llm_cache.sqlite"],
+    )
+
+    @model_validator(mode="after")
+    def check_path(self) -> "LLMCacheSetting":
+        if self.backend == CacheBackend.SQLite and not self.path:
+            raise ValueError("The SQLite cache backend requires a path.")
+        return self
+
+
+class SemanticCacheSetting(BaseModel):
+    """
+    Configuration settings for the semantic LLM answer cache.
+    Prompts are embedded, and the answer of a previous prompt similar enough to the new one is returned without
+    calling the LLM. It is meant for LLMs answering user questions that are often paraphrases of each other.
+
+    Attributes
+    ----------
+    em_settings: EMSetting
+        The embedding model used to embed the prompts
+    db_settings: Optional[DBSetting]
+        The vector database storing the cached answers (default: None, a local in-process index is used)
+    namespace: str
+        The namespace of the cached answers, answers are never shared between namespaces (default: default)
+    similarity_threshold: float
+        Minimum similarity (cosine similarity, or relevance score of the vector database) for a cached answer to be
+        returned (default: 0.95)
+    ttl: Optional[float]
+        Time in seconds after which a cached answer expires (default: None, never)
+    max_size: int
+        Maximum number of answers kept in the local index, the oldest ones are evicted first (default: 1024)
+    """
+
+    em_settings: EMSetting = Field(description="The embedding model used to embed the prompts.")
+    db_settings: Optional[DBSetting] = Field(
+        description="The vector database storing the cached answers, a local in-process index is used if not set.",
+        default=None,
+    )
+    namespace: str = Field(
+        description="The namespace of the cached answers, answers are never shared between namespaces.",
+        default="default",
+    )
+    similarity_threshold: float = Field(
+        description="Minimum similarity for a cached answer to be returned.", default=0.95, ge=0, le=1
+    )
+    ttl: Optional[float] = Field(description="Time in seconds after which a cached answer expires.", default=None, gt=0)
+    max_size: int = Field(
+        description="Maximum number of answers kept in the local index, the oldest ones are evicted first.",
+        default=1024,
+        gt=0,
+    )
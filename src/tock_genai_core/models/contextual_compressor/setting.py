@@ -15,6 +15,7 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from tock_genai_core.models.admission.setting import AdmissionSetting
 from tock_genai_core.models.contextual_compressor.provider import (
     ContextualCompressorProvider,
 )
@@ -35,6 +36,8 @@ class BaseCompressorSetting(BaseModel):
         Scoring model endpoint
     api_key: Optional[SecretKey]
         The API key used to authenticate requests to the provider API
+    admission: Optional[AdmissionSetting]
+        Admission control of the calls sent to the provider (default: None, no limit)
     """
 
     provider: ContextualCompressorProvider = Field(description="The contextual compressor provider.")
@@ -44,3 +47,6 @@ class BaseCompressorSetting(BaseModel):
         default=None,
         examples=[KubernetesSecretKey(secret_name="openai_credentials")],
     )
+    admission: Optional[AdmissionSetting] = Field(
+        description="Admission control of the calls sent to the provider.", default=None
+    )
@@ -5,7 +5,10 @@ from .provider import VectorDBProvider
 from .setting import BaseVectorDBSetting
 from .types import DBSetting
 
-# from .metadata import MetadataFilter
+from .metadata import MetadataFilter
+from .retrieval_cache import RetrievalCacheSetting
 
 from .opensearch.opensearch_db_setting import OpenSearchSetting
 from .pgvector.pgvector_db_setting import PGVectorSetting
+from .fan_out.fan_out_db_setting import FanOutSetting
+from .local.local_db_setting import LocalSetting
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+FanOutSetting
+
+Configuration settings for the fan-out vector store.
+This class defines a vector store searching several configured vector stores concurrently.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import Field
+
+from tock_genai_core.models.database.provider import VectorDBProvider
+from tock_genai_core.models.database.setting import BaseVectorDBSetting
+from tock_genai_core.models.database.opensearch.opensearch_db_setting import OpenSearchSetting
+from tock_genai_core.models.database.pgvector.pgvector_db_setting import PGVectorSetting
+from tock_genai_core.models.database.local.local_db_setting import LocalSetting
+
+# Vector stores that can be searched by a fan-out vector store (fan-out vector stores cannot be nested).
+CombinableDBSetting = Annotated[
+    Union[OpenSearchSetting, PGVectorSetting, LocalSetting], Field(discriminator="provider")
+]
+
+
+class FanOutSetting(BaseVectorDBSetting):
+    """
+    Configuration settings for the fan-out vector store.
+    This class defines a vector store searching several configured vector stores (e.g. one index or collection per
+    knowledge base) concurrently, and merging their results by relevance score into a global top-k. The sources
+    share the embedding model, so that the query is embedded once.
+
+    Attributes
+    ----------
+    provider: Literal[VectorDBProvider.FanOut]
+        The vector store used (default: VectorDBProvider.FanOut)
+    db_url: Optional[str]
+        Not used by the fan-out vector store (default: None)
+    sources: List[CombinableDBSetting]
+        The vector stores to search concurrently
+    timeout: Optional[float]
+        Maximum time in seconds to wait for each source, the results of the sources answering later are left out
+        (default: None, no timeout)
+    """
+
+    provider: Literal[VectorDBProvider.FanOut] = Field(
+        description="The vector store used.", default=VectorDBProvider.FanOut
+    )
+    db_url: Optional[str] = Field(description="Not used by the fan-out vector store.", default=None)
+    sources: List[CombinableDBSetting] = Field(description="The vector stores to search concurrently.", min_length=1)
+    timeout: Optional[float] = Field(description="Maximum time in seconds to wait for each source.", default=None, gt=0)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+LocalSetting
+
+Configuration settings for the local vector store.
+This class defines an in-process vector store, optionally persisted to a directory.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from typing import Literal, Optional
+
+from pydantic import Field, model_validator
+
+from tock_genai_core.models.database.provider import VectorDBProvider
+from tock_genai_core.models.database.setting import BaseVectorDBSetting
+
+
+class LocalSetting(BaseVectorDBSetting):
+    """
+    Configuration settings for the local vector store.
+    This class defines an in-process vector store (e.g. for small knowledge bases, tests or edge deployments), keeping
+    the vectors in a contiguous matrix searched exactly, or in an HNSW graph from `hnsw_threshold` vectors. The vector
+    store is persisted as snapshot files in the `path` directory, named after the index: read-only workers
+    memory-map the same snapshot, so that they share its vectors through the page cache.
+
+    Attributes
+    ----------
+    provider: Literal[VectorDBProvider.Local]
+        The vector store used (default: VectorDBProvider.Local)
+    db_url: Optional[str]
+        Not used by the local vector store (default: None)
+    path: Optional[str]
+        Directory of the snapshot of the vector store, loaded when it exists and saved at the end of each bulk load
+        (default: None, not persisted)
+    read_only: bool
+        Whether the snapshot is memory-mapped read-only, the vector store rejecting writes (default: False)
+    hnsw_threshold: Optional[int]
+        Number of vectors from which the searches use an HNSW graph (requires the `hnswlib` package) instead of an
+        exact search (default: None, exact search only)
+    m: int
+        Maximum number of connections per node of the HNSW graph (default: 16)
+    ef_construction: int
+        Size of the candidate list used to build the HNSW graph (default: 200)
+    ef_search: int
+        Size of the candidate list of the searches (default: 64)
+    """
+
+    provider: Literal[VectorDBProvider.Local] = Field(
+        description="The vector store used.", default=VectorDBProvider.Local
+    )
+    db_url: Optional[str] = Field(description="Not used by the local vector store.", default=None)
+    path: Optional[str] = Field(description="Directory of the snapshot of the vector store.", default=None)
+    read_only: bool = Field(
+        description="Whether the snapshot is memory-mapped read-only, the vector store rejecting writes.",
+        default=False,
+    )
+    hnsw_threshold: Optional[int] = Field(
+        description="Number of vectors from which the searches use an HNSW graph.", default=None, gt=0
+    )
+    m: int = Field(description="Maximum number of connections per node of the HNSW graph.", default=16, gt=1)
+    ef_construction: int = Field(
+        description="Size of the candidate list used to build the HNSW graph.", default=200, gt=0
+    )
+    ef_search: int = Field(description="Size of the candidate list of the searches.", default=64, gt=0)
+
+    @model_validator(mode="after")
+    def check_read_only(self) -> "LocalSetting":
+        if self.read_only and not self.path:
+            raise ValueError("A read-only local vector store requires the path of its snapshot.")
+        return self
@@ -10,13 +10,23 @@ Authors:
     * Luigi Bokalli: luigi.bokalli@partnre.com
     * Noé Chabanon: noe.chabanon@partnre.com
 """
+from typing import Union
+
 from pydantic import BaseModel
 
 
 class MetadataFilter(BaseModel):
     """
     Represents a filter for metadata. This class defines a filter that can be applied to metadata.
+
+    Attributes
+    ----------
+    field: str
+        The metadata field
+    value: Union[str, dict]
+        The value the field must be equal to, or conditions by operator (`$eq`, `$ne`, `$in`, `$nin`, `$gt`, `$gte`,
+        `$lt`, `$lte`, `$exists`), e.g. `{"$in": ["faq", "guide"]}`
     """
 
     field: str
-    value: str | dict
+    value: Union[str, dict]
@@ -11,9 +11,9 @@ Authors:
     * Luigi Bokalli: luigi.bokalli@partnre.com
     * Noé Chabanon: noe.chabanon@partnre.com
 """
-from typing import Literal
+from typing import Literal, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from tock_genai_core.models.database.provider import VectorDBProvider
 from tock_genai_core.models.database.setting import BaseVectorDBSetting
@@ -37,6 +37,37 @@ class OpenSearchSetting(BaseVectorDBSetting):
         Use an SSL connection or not
     verify_certs: bool
         Verify certificates authenticity or not
+    pool_maxsize: int
+        Maximum number of connections kept open to each node (default: 10)
+    timeout: float
+        Maximum time in seconds of a request (default: 10)
+    max_retries: int
+        Maximum number of retries of a failed request (default: 3)
+    retry_on_timeout: bool
+        Whether the requests that timed out are retried (default: False)
+    bulk_load: bool
+        Whether the ingestion indexes with concurrent bulk requests, with the refresh and the replicas of the index
+        disabled during the load (default: False)
+    bulk_chunk_size: int
+        Number of documents sent by a single bulk request (default: 500)
+    bulk_thread_count: int
+        Number of bulk requests sent at the same time (default: 4)
+    force_merge_segments: Optional[int]
+        Number of segments the index is force-merged to after a bulk load (default: None, no force-merge)
+    engine: Literal["nmslib", "faiss", "lucene"]
+        The k-NN engine of the index, `faiss` and `lucene` support efficient filtering (default: nmslib)
+    m: int
+        Maximum number of connections per node of the HNSW graph (default: 16)
+    ef_construction: int
+        Size of the candidate list used to build the HNSW graph (default: 512)
+    ef_search: int
+        Size of the candidate list of the searches (default: 512)
+    vector_compression: Optional[Literal["fp16", "int8", "byte"]]
+        Compact storage of the vectors: `fp16` (Faiss scalar quantization to half precision), `int8` (Lucene scalar
+        quantization) or `byte` (byte vectors, quantized by the factory with `byte_scale`) (default: None, float32)
+    byte_scale: float
+        Factor applied to the embeddings before rounding them to bytes, 127 suits normalized embeddings
+        (default: 127.0)
     """
 
     provider: Literal[VectorDBProvider.OpenSearch] = Field(
@@ -46,3 +77,37 @@ class OpenSearchSetting(BaseVectorDBSetting):
     password: SecretKey = Field(description="Database password.", default=None)
     use_ssl: bool = Field(description="Use an SSL connection or not.")
     verify_certs: bool = Field(description="Verify certificates authenticity or not.")
+    pool_maxsize: int = Field(description="Maximum number of connections kept open to each node.", default=10, gt=0)
+    timeout: float = Field(description="Maximum time in seconds of a request.", default=10, gt=0)
+    max_retries: int = Field(description="Maximum number of retries of a failed request.", default=3, ge=0)
+    retry_on_timeout: bool = Field(description="Whether the requests that timed out are retried.", default=False)
+    bulk_load: bool = Field(
+        description="Whether the ingestion indexes with concurrent bulk requests, with the refresh and the replicas "
+        "of the index disabled during the load.",
+        default=False,
+    )
+    bulk_chunk_size: int = Field(description="Number of documents sent by a single bulk request.", default=500, gt=0)
+    bulk_thread_count: int = Field(description="Number of bulk requests sent at the same time.", default=4, gt=0)
+    force_merge_segments: Optional[int] = Field(
+        description="Number of segments the index is force-merged to after a bulk load.", default=None, gt=0
+    )
+    engine: Literal["nmslib", "faiss", "lucene"] = Field(description="The k-NN engine of the index.", default="nmslib")
+    m: int = Field(description="Maximum number of connections per node of the HNSW graph.", default=16, gt=1)
+    ef_construction: int = Field(
+        description="Size of the candidate list used to build the HNSW graph.", default=512, gt=0
+    )
+    ef_search: int = Field(description="Size of the candidate list of the searches.", default=512, gt=0)
+    vector_compression: Optional[Literal["fp16", "int8", "byte"]] = Field(
+        description="Compact storage of the vectors.", default=None
+    )
+    byte_scale: float = Field(
+        description="Factor applied to the embeddings before rounding them to bytes.", default=127.0, gt=0
+    )
+
+    @model_validator(mode="after")
+    def check_vector_compression(self) -> "OpenSearchSetting":
+        engines = {"fp16": ["faiss"], "int8": ["lucene"], "byte": ["faiss", "lucene"]}
+        if self.vector_compression and self.engine not in engines[self.vector_compression]:
+            required = " or ".join(engines[self.vector_compression])
+            raise ValueError(f"The {self.vector_compression} vector compression requires the {required} engine.")
+        return self
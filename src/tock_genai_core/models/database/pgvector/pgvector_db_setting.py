@@ -12,7 +12,7 @@ Authors:
     * Noé Chabanon: noe.chabanon@partnre.com
 """
 from typing import Literal, Optional
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from tock_genai_core.models.database.provider import VectorDBProvider
 from tock_genai_core.models.database.setting import BaseVectorDBSetting
@@ -38,6 +38,43 @@ class PGVectorSetting(BaseVectorDBSetting):
         The SSL mode used in the connection with the database  (default: require)
     namespace: str
         Name of the application in use
+    pool_size: int
+        Number of connections kept open in the pool of the database engine (default: 5)
+    max_overflow: int
+        Number of connections opened beyond the pool size under load (default: 10)
+    pool_recycle: int
+        Age in seconds after which a pooled connection is replaced, -1 to never replace them (default: 1800)
+    statement_timeout: Optional[int]
+        Maximum time in milliseconds of a SQL statement (default: None, no limit)
+    async_mode: bool
+        Whether the vector store uses an async engine, to run its searches concurrently on the event loop
+        (default: False). The vector store then only supports the async methods
+    bulk_load: bool
+        Whether the ingestion writes the embeddings with `COPY` rather than `INSERT` statements (default: False)
+    bulk_batch_size: int
+        Number of rows copied by a single `COPY` statement (default: 5000)
+    bulk_commit_size: int
+        Number of rows written by a single transaction of the bulk load (default: 50000)
+    defer_index_builds: bool
+        Whether the secondary indexes of the embedding table are dropped during an ingestion, and built again
+        afterwards (default: False)
+    index_type: Optional[Literal["hnsw", "ivfflat"]]
+        The approximate nearest neighbour index built on the embeddings (default: None, exact searches)
+    m: int
+        Maximum number of connections per node of an HNSW index (default: 16)
+    ef_construction: int
+        Size of the candidate list used to build an HNSW index (default: 64)
+    lists: int
+        Number of lists of an IVFFlat index, about rows / 1000 up to 1M rows and sqrt(rows) beyond (default: 100)
+    ef_search: Optional[int]
+        Size of the candidate list of the HNSW searches (default: None, the pgvector default of 40)
+    probes: Optional[int]
+        Number of lists visited by the IVFFlat searches (default: None, the pgvector default of 1)
+    vector_compression: Optional[Literal["halfvec", "bit"]]
+        Compact representation of the vectors in the `index_type` index, `halfvec` (half precision) or `bit` (binary
+        quantization). The candidates are re-ranked on the full precision vectors (default: None, full precision)
+    rerank_factor: int
+        Number of candidates per result read from the compressed index and re-ranked (default: 4)
     """
 
     provider: Literal[VectorDBProvider.PGVector] = Field(
@@ -50,3 +87,54 @@ class PGVectorSetting(BaseVectorDBSetting):
         description="The SSL mode used in the connection with the database.", default="require"
     )
     namespace: str = Field(description="Name of the application in use")
+    pool_size: int = Field(
+        description="Number of connections kept open in the pool of the database engine.", default=5, gt=0
+    )
+    max_overflow: int = Field(description="Number of connections opened beyond the pool size under load.", default=10)
+    pool_recycle: int = Field(
+        description="Age in seconds after which a pooled connection is replaced, -1 to never replace them.",
+        default=1800,
+    )
+    statement_timeout: Optional[int] = Field(
+        description="Maximum time in milliseconds of a SQL statement.", default=None, gt=0
+    )
+    async_mode: bool = Field(
+        description="Whether the vector store uses an async engine, to run its searches concurrently on the event loop.",
+        default=False,
+    )
+    bulk_load: bool = Field(
+        description="Whether the ingestion writes the embeddings with COPY rather than INSERT statements.",
+        default=False,
+    )
+    bulk_batch_size: int = Field(description="Number of rows copied by a single COPY statement.", default=5000, gt=0)
+    bulk_commit_size: int = Field(
+        description="Number of rows written by a single transaction of the bulk load.", default=50000, gt=0
+    )
+    defer_index_builds: bool = Field(
+        description="Whether the secondary indexes of the embedding table are dropped during an ingestion, "
+        "and built again afterwards.",
+        default=False,
+    )
+    index_type: Optional[Literal["hnsw", "ivfflat"]] = Field(
+        description="The approximate nearest neighbour index built on the embeddings.", default=None
+    )
+    m: int = Field(description="Maximum number of connections per node of an HNSW index.", default=16, gt=1)
+    ef_construction: int = Field(
+        description="Size of the candidate list used to build an HNSW index.", default=64, gt=0
+    )
+    lists: int = Field(description="Number of lists of an IVFFlat index.", default=100, gt=0)
+    ef_search: Optional[int] = Field(description="Size of the candidate list of the HNSW searches.", default=None, gt=0)
+    probes: Optional[int] = Field(description="Number of lists visited by the IVFFlat searches.", default=None, gt=0)
+    vector_compression: Optional[Literal["halfvec", "bit"]] = Field(
+        description="Compact representation of the vectors in the index, re-ranked on the full precision vectors.",
+        default=None,
+    )
+    rerank_factor: int = Field(
+        description="Number of candidates per result read from the compressed index and re-ranked.", default=4, gt=0
+    )
+
+    @model_validator(mode="after")
+    def check_vector_compression(self) -> "PGVectorSetting":
+        if self.vector_compression and self.index_type is None:
+            raise ValueError("The vector compression requires an index_type.")
+        return self
@@ -23,6 +23,8 @@ class VectorDBProvider(str, Enum):
 
     OpenSearch = "OPENSEARCH"
     PGVector = "PGVECTOR"
+    FanOut = "FANOUT"
+    Local = "LOCAL"
 
     @classmethod
     def has_value(cls, value) -> bool:
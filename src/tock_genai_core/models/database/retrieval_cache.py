@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+RetrievalCacheSetting
+
+Configuration settings for the retrieval result cache.
+This class defines how the results of the similarity searches of a vector store are cached and evicted.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class RetrievalCacheSetting(BaseModel):
+    """
+    Configuration settings for the retrieval result cache.
+    Search results are cached by exact match on the index, the normalized query (or the query vector), `k`, the
+    filters and the other search parameters. Every write to the index through this process invalidates its cached
+    results.
+
+    Attributes
+    ----------
+    max_size: int
+        Maximum number of cached search results, the least recently used ones are evicted first (default: 1024)
+    ttl: Optional[float]
+        Time in seconds after which cached search results expire, bounding their staleness when the index is written
+        by other processes (default: 300)
+    """
+
+    max_size: int = Field(
+        description="Maximum number of cached search results, the least recently used ones are evicted first.",
+        default=1024,
+        gt=0,
+    )
+    ttl: Optional[float] = Field(
+        description="Time in seconds after which cached search results expire.", default=300, gt=0
+    )
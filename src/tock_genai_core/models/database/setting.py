@@ -16,6 +16,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from tock_genai_core.models.database.provider import VectorDBProvider
+from tock_genai_core.models.database.retrieval_cache import RetrievalCacheSetting
 
 
 class BaseVectorDBSetting(BaseModel):
@@ -31,8 +32,13 @@ class BaseVectorDBSetting(BaseModel):
         The vector store used
     db_url: str
         The URL of the database
+    retrieval_cache: Optional[RetrievalCacheSetting]
+        Cache of the search results of the vector store (default: None, no cache)
     """
 
     index: Optional[str] = Field(description="Index name", default=None)
     provider: VectorDBProvider = Field(description="The vector store used.")
     db_url: str = Field(description="The URL of the database.")
+    retrieval_cache: Optional[RetrievalCacheSetting] = Field(
+        description="Cache of the search results of the vector store.", default=None
+    )
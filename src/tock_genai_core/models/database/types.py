@@ -6,7 +6,11 @@ from tock_genai_core.models.database.opensearch.opensearch_db_setting import (
     OpenSearchSetting,
 )
 from tock_genai_core.models.database.pgvector.pgvector_db_setting import PGVectorSetting
+from tock_genai_core.models.database.fan_out.fan_out_db_setting import FanOutSetting
+from tock_genai_core.models.database.local.local_db_setting import LocalSetting
 
 # DBSetting is a type annotation that defines a union of possible database settings.
 # The settings are determined by the value of the "provider" field, which acts as a discriminator.
-DBSetting = Annotated[Union[OpenSearchSetting, PGVectorSetting], Field(discriminator="provider")]
+DBSetting = Annotated[
+    Union[OpenSearchSetting, PGVectorSetting, FanOutSetting, LocalSetting], Field(discriminator="provider")
+]
@@ -11,7 +11,7 @@ Authors:
     * Luigi Bokalli: luigi.bokalli@partnre.com
     * Noé Chabanon: noe.chabanon@partnre.com
 """
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import Field
 
@@ -34,6 +34,10 @@ class AzureOpenAIEMSetting(BaseEMSetting):
         AzureOpenAI API version
     deployment: str
         Deployment name
+    tpm_limit: Optional[int]
+        Tokens per minute quota of the deployment, used to pace the requests (default: None, no limit)
+    rpm_limit: Optional[int]
+        Requests per minute quota of the deployment, used to pace the requests (default: None, no limit)
     """
 
     provider: Literal[EMProvider.AzureOpenAI] = Field(
@@ -42,3 +46,9 @@ class AzureOpenAIEMSetting(BaseEMSetting):
     api_base: str = Field(description="Base endpoint of AzureOpenAI API.")
     api_version: str = Field(description="AzureOpenAI API version.", examples=["2023-05-15"])
     deployment: str = Field(description="Deployment name.")
+    tpm_limit: Optional[int] = Field(
+        description="Tokens per minute quota of the deployment, used to pace the requests.", default=None, gt=0
+    )
+    rpm_limit: Optional[int] = Field(
+        description="Requests per minute quota of the deployment, used to pace the requests.", default=None, gt=0
+    )
@@ -15,6 +15,7 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from tock_genai_core.models.admission.setting import AdmissionSetting
 from tock_genai_core.models.embedding.provider import EMProvider
 from tock_genai_core.models.security.security_type import SecretKey
 from tock_genai_core.models.security.kube_secret_key import KubernetesSecretKey
@@ -40,6 +41,8 @@ class BaseEMSetting(BaseModel):
         Pooling method (default: None)
     space_type: Optional[str]
         The space type used to search vector (eg. `l2` for Bloomz, `cosin` for Ada) (default: l2)
+    admission: Optional[AdmissionSetting]
+        Admission control of the calls sent to the provider (default: None, no limit)
     """
 
     provider: EMProvider = Field(description="The Embedding Model provider.")
@@ -55,3 +58,6 @@ class BaseEMSetting(BaseModel):
         description="The space type used to search vector (eg. `l2` for Bloomz, `cosin` for Ada)",
         default="l2",
     )
+    admission: Optional[AdmissionSetting] = Field(
+        description="Admission control of the calls sent to the provider.", default=None
+    )
@@ -11,8 +11,9 @@ Authors:
     * Luigi Bokalli: luigi.bokalli@partnre.com
     * Noé Chabanon: noe.chabanon@partnre.com
 """
-from typing import Literal
-from pydantic import Field
+from typing import Literal, Optional
+from urllib.parse import urlparse
+from pydantic import Field, model_validator
 
 from tock_genai_core.models.embedding.provider import EMProvider
 from tock_genai_core.models.embedding.setting import BaseEMSetting
@@ -30,7 +31,33 @@ class VLLMEMSetting(BaseEMSetting):
         The Embedding Model provider (default: EMProvider.Vllm)
     models: str
         Model name
+    batch_size: int
+        Maximum number of texts sent in a single request (default: 64)
+    max_concurrency: int
+        Maximum number of requests sent at the same time (default: 4)
+    base64: bool
+        Whether the embeddings are returned base64 encoded rather than as JSON lists of floats (default: True)
+    timeout: Optional[float]
+        Maximum time in seconds of a request (default: None)
+
+    The `api_base` is the OpenAI-compatible base URL of the vLLM server (e.g. http://vllm:8000/v1).
     """
 
     provider: Literal[EMProvider.Vllm] = Field(description="The Embedding Model provider.", default=EMProvider.Vllm)
     model: str = Field(description="Model name.")
+    batch_size: int = Field(description="Maximum number of texts sent in a single request.", default=64, gt=0)
+    max_concurrency: int = Field(description="Maximum number of requests sent at the same time.", default=4, gt=0)
+    base64: bool = Field(
+        description="Whether the embeddings are returned base64 encoded rather than as JSON lists of floats.",
+        default=True,
+    )
+    timeout: Optional[float] = Field(description="Maximum time in seconds of a request.", default=None, gt=0)
+
+    @model_validator(mode="after")
+    def check_api_base(self) -> "VLLMEMSetting":
+        # The api_base used to be an Azure endpoint (the server root), it's now the OpenAI-compatible base URL
+        if urlparse(self.api_base).path.strip("/") == "":
+            raise ValueError(
+                "The api_base must be the OpenAI-compatible base URL of the vLLM server (e.g. http://vllm:8000/v1)."
+            )
+        return self
@@ -6,3 +6,4 @@ from .setting import BaseGuardrailSetting
 from .types import GuardrailSetting
 
 from .bloomz.bloomz_guardrail_setting import BloomZGuardrailSetting
+from .composite.composite_guardrail_setting import CompositeGuardrailSetting
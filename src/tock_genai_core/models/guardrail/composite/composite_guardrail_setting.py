@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+CompositeGuardrailSetting
+
+Configuration settings for the composite guardrail.
+This class defines a guardrail that runs several configured guardrails concurrently.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import Field
+
+from tock_genai_core.models.guardrail.provider import GuardrailProvider
+from tock_genai_core.models.guardrail.setting import BaseGuardrailSetting
+from tock_genai_core.models.guardrail.bloomz.bloomz_guardrail_setting import BloomZGuardrailSetting
+
+# Guardrails that can be combined by a composite guardrail (composites cannot be nested).
+CombinableGuardrailSetting = Annotated[Union[BloomZGuardrailSetting], Field(discriminator="provider")]
+
+
+class CompositeGuardrailSetting(BaseGuardrailSetting):
+    """
+    Configuration settings for the composite guardrail.
+    This class defines a guardrail that runs several configured guardrails concurrently, merges their
+    reasons and stops as soon as one of them flags the text.
+
+    Attributes
+    ----------
+
+    provider: Literal[GuardrailProvider.Composite]
+        The guardrail model provider (default: GuardrailProvider.Composite)
+    api_base: Optional[str]
+        Not used by the composite guardrail (default: None)
+    guardrails: List[CombinableGuardrailSetting]
+        The guardrails to run concurrently
+    max_workers: Optional[int]
+        Maximum number of guardrails running at the same time (default: None, all of them)
+    timeout: Optional[float]
+        Maximum time in seconds to wait for the guardrails verdict (default: None, no timeout)
+    """
+
+    provider: Literal[GuardrailProvider.Composite] = Field(
+        description="The guardrail model provider.", default=GuardrailProvider.Composite
+    )
+    api_base: Optional[str] = Field(description="Not used by the composite guardrail.", default=None)
+    guardrails: List[CombinableGuardrailSetting] = Field(
+        description="The guardrails to run concurrently.", min_length=1
+    )
+    max_workers: Optional[int] = Field(
+        description="Maximum number of guardrails running at the same time.", default=None, gt=0
+    )
+    timeout: Optional[float] = Field(
+        description="Maximum time in seconds to wait for the guardrails verdict.", default=None, gt=0
+    )
@@ -22,6 +22,7 @@ class GuardrailProvider(str, Enum):
     """
 
     BloomZ = "BloomzGuardrail"
+    Composite = "CompositeGuardrail"
 
     @classmethod
     def has_value(cls, value) -> bool:
@@ -14,6 +14,7 @@ Authors:
 from typing import Optional
 from pydantic import BaseModel, Field
 
+from tock_genai_core.models.admission.setting import AdmissionSetting
 from tock_genai_core.models.guardrail.provider import GuardrailProvider
 from tock_genai_core.models.security.security_type import SecretKey
 from tock_genai_core.models.security.kube_secret_key import KubernetesSecretKey
@@ -35,6 +36,8 @@ class BaseGuardrailSetting(BaseModel):
         The maximum acceptable toxicity score (default: 0.3)
     api_key: Optional[SecretKey]
         The API key used to authenticate requests to the provider API (default: None)
+    admission: Optional[AdmissionSetting]
+        Admission control of the calls sent to the provider (default: None, no limit)
     """
 
     provider: GuardrailProvider = Field(description="The guardrail provider.")
@@ -45,3 +48,6 @@ class BaseGuardrailSetting(BaseModel):
         default=None,
         examples=[KubernetesSecretKey(secret_name="openai_credentials")],
     )
+    admission: Optional[AdmissionSetting] = Field(
+        description="Admission control of the calls sent to the provider.", default=None
+    )
@@ -8,3 +8,4 @@ from .types import LLMSetting
 from .tgi.tgi_llm_setting import HuggingFaceTextGenInferenceLLMSetting
 from .azure_openai.azure_openai_llm_setting import AzureOpenAILLMSetting
 from .vllm.vllm_setting import VllmSetting
+from .router.router_llm_setting import RouterLLMSetting
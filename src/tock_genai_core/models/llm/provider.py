@@ -24,6 +24,7 @@ class LLMProvider(str, Enum):
     TGI = "HuggingFaceTextGenInference"
     AzureOpenAI = "AzureOpenAI"
     Vllm = "Vllm"
+    Router = "Router"
 
     @classmethod
     def has_value(cls, value):
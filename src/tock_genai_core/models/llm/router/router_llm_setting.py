@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+RouterLLMSetting
+
+Configuration settings for the LLM router.
+This class defines a set of LLM replicas, and fallbacks, among which each call is routed.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from typing import Annotated, List, Literal, Union
+
+from pydantic import Field
+
+from tock_genai_core.models.llm.provider import LLMProvider
+from tock_genai_core.models.llm.setting import BaseLLMSetting
+from tock_genai_core.models.llm.tgi.tgi_llm_setting import HuggingFaceTextGenInferenceLLMSetting
+from tock_genai_core.models.llm.azure_openai.azure_openai_llm_setting import AzureOpenAILLMSetting
+from tock_genai_core.models.llm.vllm.vllm_setting import VllmSetting
+
+# LLMs that can be routed by the LLM router (routers cannot be nested).
+RoutableLLMSetting = Annotated[
+    Union[HuggingFaceTextGenInferenceLLMSetting, AzureOpenAILLMSetting, VllmSetting],
+    Field(discriminator="provider"),
+]
+
+
+class RouterLLMSetting(BaseLLMSetting):
+    """
+    Configuration settings for the LLM router.
+    This class defines a set of LLM replicas among which each call is routed, depending on their observed latency
+    or outstanding requests. Replicas failing repeatedly are ejected for a while, and the fallbacks are only used
+    when no replica is available.
+
+    Attributes
+    ----------
+    provider: Literal[LLMProvider.Router]
+        The Large Language Model provider (default: LLMProvider.Router)
+    replicas: List[RoutableLLMSetting]
+        The LLM replicas among which the calls are balanced
+    fallbacks: List[RoutableLLMSetting]
+        The LLMs used, in order, when no replica is available (default: [])
+    strategy: Literal["least_outstanding", "least_latency"]
+        The replica selection strategy (default: least_outstanding)
+    max_failures: int
+        Number of consecutive failures after which a replica is ejected (default: 3)
+    ejection_duration: float
+        Time in seconds during which an ejected replica doesn't receive calls (default: 30)
+    """
+
+    provider: Literal[LLMProvider.Router] = Field(
+        description="The Large Language Model provider.", default=LLMProvider.Router
+    )
+    replicas: List[RoutableLLMSetting] = Field(
+        description="The LLM replicas among which the calls are balanced.", min_length=1
+    )
+    fallbacks: List[RoutableLLMSetting] = Field(
+        description="The LLMs used, in order, when no replica is available.", default=[]
+    )
+    strategy: Literal["least_outstanding", "least_latency"] = Field(
+        description="The replica selection strategy.", default="least_outstanding"
+    )
+    max_failures: int = Field(
+        description="Number of consecutive failures after which a replica is ejected.", default=3, ge=1
+    )
+    ejection_duration: float = Field(
+        description="Time in seconds during which an ejected replica doesn't receive calls.", default=30.0, ge=0
+    )
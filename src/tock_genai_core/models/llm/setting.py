@@ -15,6 +15,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from tock_genai_core.models.admission.setting import AdmissionSetting
+from tock_genai_core.models.cache.setting import LLMCacheSetting, SemanticCacheSetting
 from tock_genai_core.models.llm.provider import LLMProvider
 from tock_genai_core.models.security.security_type import RawSecretKey, SecretKey
 
@@ -35,6 +37,14 @@ class BaseLLMSetting(BaseModel):
         The API key used to authenticate requests to the provider API (default: None)
     temperature: float
         The temperature that controls the randomness of the text generated (default: 0.5)
+    streaming: bool
+        Enable streaming response, the time to first token and the tokens per second are recorded (default: False)
+    cache: Optional[LLMCacheSetting]
+        Opt-in exact-match cache of the LLM responses (default: None, no cache)
+    semantic_cache: Optional[SemanticCacheSetting]
+        Opt-in semantic cache of the LLM answers, looked up after the exact-match cache (default: None, no cache)
+    admission: Optional[AdmissionSetting]
+        Admission control of the calls sent to the provider (default: None, no limit)
 
     """
 
@@ -52,3 +62,18 @@ class BaseLLMSetting(BaseModel):
         ge=0,
         le=2,
     )
+    streaming: bool = Field(
+        description="Enable streaming response, the time to first token and the tokens per second are recorded.",
+        default=False,
+    )
+    cache: Optional[LLMCacheSetting] = Field(
+        description="Opt-in exact-match cache of the LLM responses.",
+        default=None,
+    )
+    semantic_cache: Optional[SemanticCacheSetting] = Field(
+        description="Opt-in semantic cache of the LLM answers, looked up after the exact-match cache.",
+        default=None,
+    )
+    admission: Optional[AdmissionSetting] = Field(
+        description="Admission control of the calls sent to the provider.", default=None
+    )
@@ -11,7 +11,7 @@ Authors:
     * Luigi Bokalli: luigi.bokalli@partnre.com
     * Noé Chabanon: noe.chabanon@partnre.com
 """
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import Field
 
@@ -35,8 +35,12 @@ class HuggingFaceTextGenInferenceLLMSetting(BaseLLMSetting):
         Maximum length of the llm response (default: 256)
     api_base: str
         TGI API base URL
-    streaming: bool
-        Enable streaming response (default: False)
+    timeout: float
+        Maximum time in seconds of a call (default: 120)
+    connect_timeout: Optional[float]
+        Maximum time in seconds to open a connection (default: None, bounded by the call timeout)
+    max_connections: int
+        Maximum number of connections kept open to the server (default: 100)
     """
 
     provider: Literal[LLMProvider.TGI] = Field(
@@ -45,4 +49,10 @@ class HuggingFaceTextGenInferenceLLMSetting(BaseLLMSetting):
     repetition_penalty: float = Field(description="Penalty on model repetition.", default=1.0)
     max_new_tokens: int = Field(description="Maximum length of the llm response.", default=256)
     api_base: str = Field(description="TGI API base URL.")
-    streaming: bool = Field(description="Enable streaming response.", default=False)
+    timeout: float = Field(description="Maximum time in seconds of a call.", default=120.0, gt=0)
+    connect_timeout: Optional[float] = Field(
+        description="Maximum time in seconds to open a connection.", default=None, gt=0
+    )
+    max_connections: int = Field(
+        description="Maximum number of connections kept open to the server.", default=100, gt=0
+    )
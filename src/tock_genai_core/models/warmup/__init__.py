@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""Initialisation de module(s)."""
+
+from .setting import WarmupSetting, VectorDBWarmupSetting
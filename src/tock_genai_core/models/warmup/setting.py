@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+WarmupSetting
+
+Configuration settings for the startup warmup.
+This class defines the bundle of providers to warm up before serving requests.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from tock_genai_core.models.llm.types import LLMSetting
+from tock_genai_core.models.database.types import DBSetting
+from tock_genai_core.models.embedding.types import EMSetting
+from tock_genai_core.models.guardrail.types import GuardrailSetting
+from tock_genai_core.models.contextual_compressor.types import CompressorSetting
+
+
+class VectorDBWarmupSetting(BaseModel):
+    """
+    A vector database to warm up, with the embedding model used to query it.
+
+    Attributes
+    ----------
+    db_settings: DBSetting
+        The vector database settings
+    em_settings: EMSetting
+        The embedding model settings
+    """
+
+    db_settings: DBSetting = Field(description="The vector database settings.")
+    em_settings: EMSetting = Field(description="The embedding model settings.")
+
+
+class WarmupSetting(BaseModel):
+    """
+    Configuration settings for the startup warmup.
+    This class defines the bundle of providers to warm up before serving requests.
+
+    Attributes
+    ----------
+    llm: List[LLMSetting]
+        The LLMs to warm up (default: [])
+    em: List[EMSetting]
+        The embedding models to warm up (default: [])
+    vector_db: List[VectorDBWarmupSetting]
+        The vector databases to warm up (default: [])
+    compressor: List[CompressorSetting]
+        The contextual compressors to warm up (default: [])
+    guardrail: List[GuardrailSetting]
+        The guardrails to warm up (default: [])
+    """
+
+    llm: List[LLMSetting] = Field(description="The LLMs to warm up.", default=[])
+    em: List[EMSetting] = Field(description="The embedding models to warm up.", default=[])
+    vector_db: List[VectorDBWarmupSetting] = Field(description="The vector databases to warm up.", default=[])
+    compressor: List[CompressorSetting] = Field(description="The contextual compressors to warm up.", default=[])
+    guardrail: List[GuardrailSetting] = Field(description="The guardrails to warm up.", default=[])
@@ -0,0 +1,475 @@
+import heapq
+import asyncio
+import logging
+import threading
+from itertools import count
+from contextvars import ContextVar
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from pydantic import BaseModel, ConfigDict, Field
+from langchain_core.callbacks import Callbacks
+from langchain_core.documents import BaseDocumentCompressor, Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.outputs import LLMResult
+from langchain_core.language_models import BaseChatModel, BaseLLM
+from langchain_core.output_parsers import BaseOutputParser
+from langchain_core.output_parsers.transform import BaseCumulativeTransformOutputParser
+
+from tock_genai_core.models.admission import AdmissionSetting, Priority
+from tock_genai_core.services.langchain.factory.registry import settings_fingerprint
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_priority: ContextVar[Priority] = ContextVar("admission_priority", default=Priority.Normal)
+# Admission controllers holding a slot for the current call, so that nested calls don't wait for a second slot
+_admitted: ContextVar[FrozenSet[int]] = ContextVar("admitted", default=frozenset())
+
+
+_DEFAULT_ASTREAMS = (BaseLLM._astream, BaseChatModel._astream)
+
+
+class AdmissionRejectedError(RuntimeError):
+    """Raised when a call is rejected by an admission controller (queue full or queue timeout)."""
+
+
+@contextmanager
+def admission_priority(priority: Priority) -> Iterator[None]:
+    """
+    Sets the priority class of the calls made in the block (and in the asyncio tasks it creates).
+
+    Parameters
+    ----------
+    priority : Priority
+        The priority class of the calls.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _Waiter:
+    """A call waiting for a slot. `notify` is called (under the controller lock) when the slot is granted."""
+
+    def __init__(self, notify: Callable[[], None]):
+        self.notify = notify
+        self.granted = False
+
+
+class AdmissionController:
+    """
+    Limits the number of calls sent concurrently to a provider.
+    Calls beyond `max_in_flight` wait in a queue, ordered by priority class then by arrival. A released slot is
+    handed over to the first waiting call. Calls are rejected when the queue is full or when they waited longer than
+    `queue_timeout`. Sync and async calls share the same slots.
+
+    Attributes
+    ----------
+    name : str
+        The name of the controller, used in the logs and metrics.
+    max_in_flight : int
+        Maximum number of calls sent concurrently to the provider.
+    max_queue : int
+        Maximum number of waiting calls.
+    queue_timeout : Optional[float]
+        Maximum time in seconds a call waits for a slot.
+    in_flight : int
+        Number of calls in progress.
+    admitted : int
+        Number of admitted calls.
+    queued : int
+        Number of calls that had to wait for a slot.
+    rejected : int
+        Number of calls rejected because the queue was full.
+    timed_out : int
+        Number of calls rejected because they waited longer than `queue_timeout`.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int = 100, queue_timeout: Optional[float] = None):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: List[Tuple[int, int, _Waiter]] = []
+        self._sequence = count()
+        self._lock = threading.Lock()
+
+    @property
+    def queue_size(self) -> int:
+        """Number of calls waiting for a slot."""
+        return len(self._waiters)
+
+    def metrics(self) -> Dict[str, int]:
+        """Returns the current load and the counters of the controller."""
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "queue_size": len(self._waiters),
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+    def _enter(self, notify: Callable[[], None]) -> Optional[_Waiter]:
+        """Takes a free slot and returns None, or queues a waiter. Raises if the queue is full."""
+        with self._lock:
+            if self.in_flight < self.max_in_flight:
+                self.in_flight += 1
+                self.admitted += 1
+                return None
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejectedError(f"Too many calls waiting for {self.name}.")
+            waiter = _Waiter(notify)
+            heapq.heappush(self._waiters, (_priority.get().rank, next(self._sequence), waiter))
+            self.queued += 1
+            return waiter
+
+    def _abandon(self, waiter: _Waiter, timed_out: bool = True) -> bool:
+        """Removes a waiter from the queue. Returns True if the slot was granted in the meantime."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters = [entry for entry in self._waiters if entry[2] is not waiter]
+            heapq.heapify(self._waiters)
+            if timed_out:
+                self.timed_out += 1
+            return False
+
+    def release(self) -> None:
+        """Releases a slot, handing it over to the first waiting call if any."""
+        with self._lock:
+            if self._waiters:
+                _, _, waiter = heapq.heappop(self._waiters)
+                waiter.granted = True
+                self.admitted += 1
+                waiter.notify()
+            else:
+                self.in_flight -= 1
+
+    def acquire(self) -> None:
+        """Waits for a slot."""
+        event = threading.Event()
+        waiter = self._enter(event.set)
+        if waiter is not None and not event.wait(self.queue_timeout) and not self._abandon(waiter):
+            raise AdmissionRejectedError(f"Timed out waiting for {self.name}.")
+
+    async def aacquire(self) -> None:
+        """Waits asynchronously for a slot."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def notify():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._enter(notify)
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                raise AdmissionRejectedError(f"Timed out waiting for {self.name}.")
+        except asyncio.CancelledError:
+            if self._abandon(waiter, timed_out=False):
+                self.release()
+            raise
+
+    @contextmanager
+    def slot(self, reentrant: bool = True) -> Iterator[None]:
+        """
+        Holds a slot during the block. With `reentrant`, the calls nested in the block share the slot. A generator
+        runs in the context of its consumer, so it must hold its slot with `reentrant=False`: otherwise the other
+        calls of its consumer would share the slot of the open stream.
+        """
+        if id(self) in _admitted.get():
+            yield
+            return
+        self.acquire()
+        token = _admitted.set(_admitted.get() | {id(self)}) if reentrant else None
+        try:
+            yield
+        finally:
+            if token is not None:
+                _admitted.reset(token)
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, reentrant: bool = True) -> AsyncIterator[None]:
+        """
+        Holds a slot during the async block. With `reentrant`, the calls nested in the block share the slot (see
+        `slot`, async generators must use `reentrant=False`).
+        """
+        if id(self) in _admitted.get():
+            yield
+            return
+        await self.aacquire()
+        token = _admitted.set(_admitted.get() | {id(self)}) if reentrant else None
+        try:
+            yield
+        finally:
+            if token is not None:
+                _admitted.reset(token)
+            self.release()
+
+
+_controllers: Dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_admission_controller(settings: Optional[AdmissionSetting], owner: BaseModel) -> Optional[AdmissionController]:
+    """
+    Returns the admission controller configured by the settings.
+    Controllers are kept for the life of the process, so that the models rebuilt with the same settings (or
+    configured with the same controller name) share the same slots. The settings sharing a controller name must
+    define the same limits.
+
+    Parameters
+    ----------
+    settings : Optional[AdmissionSetting]
+        The admission control settings.
+    owner : BaseModel
+        The provider settings holding the admission control settings.
+
+    Returns
+    -------
+    Optional[AdmissionController]
+        The admission controller, or None if the settings are None.
+
+    Raises
+    ------
+    ValueError
+        If a controller with the same name is already configured with other limits.
+    """
+    if settings is None:
+        return None
+
+    name = settings.name or f"{owner.provider.value}:{settings_fingerprint(owner)[:12]}"
+    limits = dict(
+        max_in_flight=settings.max_in_flight, max_queue=settings.max_queue, queue_timeout=settings.queue_timeout
+    )
+    with _controllers_lock:
+        if name not in _controllers:
+            _controllers[name] = AdmissionController(name=name, **limits)
+        controller = _controllers[name]
+    configured = dict(
+        max_in_flight=controller.max_in_flight, max_queue=controller.max_queue, queue_timeout=controller.queue_timeout
+    )
+    if configured != limits:
+        # The providers sharing a controller must share its limits
+        raise ValueError(f"The admission controller {name} is already configured with other limits: {configured}.")
+    return controller
+
+
+def admission_metrics() -> Dict[str, Dict[str, int]]:
+    """Returns the current load and the counters of every admission controller, by name."""
+    with _controllers_lock:
+        controllers = list(_controllers.values())
+    return {controller.name: controller.metrics() for controller in controllers}
+
+
+class AdmissionControlMixin(BaseModel):
+    """
+    Mixin for LLMs and chat models sending their calls through an admission controller.
+    Without controller, the calls are sent directly. The model must implement `_stream`. The LLMs sending the prompts
+    of an async batch as concurrent requests set `concurrent_batches`, so that each prompt holds its own slot.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    concurrent_batches: ClassVar[bool] = False
+    """Whether the prompts of an async batch are sent as concurrent requests."""
+
+    admission_controller: Optional[AdmissionController] = Field(default=None, exclude=True)
+    """The admission controller of the calls."""
+
+    def _generate(self, *args: Any, **kwargs: Any) -> Any:
+        if self.admission_controller is None:
+            return super()._generate(*args, **kwargs)
+        with self.admission_controller.slot():
+            return super()._generate(*args, **kwargs)
+
+    async def _agenerate(self, *args: Any, **kwargs: Any) -> Any:
+        if self.admission_controller is None:
+            return await super()._agenerate(*args, **kwargs)
+        if self.concurrent_batches and len(args[0]) > 1:
+            prompts, *args = args
+            results = await asyncio.gather(*(self._agenerate([prompt], *args, **kwargs) for prompt in prompts))
+            return LLMResult(generations=[result.generations[0] for result in results])
+        async with self.admission_controller.aslot():
+            return await super()._agenerate(*args, **kwargs)
+
+    def _stream(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        if self.admission_controller is None:
+            yield from super()._stream(*args, **kwargs)
+            return
+        with self.admission_controller.slot(reentrant=False):
+            yield from super()._stream(*args, **kwargs)
+
+    async def _astream(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        # The default `_astream` runs `_stream` in a thread, which holds the slot itself
+        if self.admission_controller is None or super()._astream.__func__ in _DEFAULT_ASTREAMS:
+            async for chunk in super()._astream(*args, **kwargs):
+                yield chunk
+            return
+        async with self.admission_controller.aslot(reentrant=False):
+            async for chunk in super()._astream(*args, **kwargs):
+                yield chunk
+
+
+class AdmissionControlledEmbeddings(Embeddings):
+    """
+    Embedding model sending its calls through an admission controller.
+
+    Attributes
+    ----------
+    embeddings : Embeddings
+        The embedding model.
+    admission_controller : AdmissionController
+        The admission controller of the calls.
+    """
+
+    def __init__(self, embeddings: Embeddings, admission_controller: AdmissionController):
+        self.embeddings = embeddings
+        self.admission_controller = admission_controller
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self.admission_controller.slot():
+            return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with self.admission_controller.slot():
+            return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        async with self.admission_controller.aslot():
+            return await self.embeddings.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        async with self.admission_controller.aslot():
+            return await self.embeddings.aembed_query(text)
+
+
+class AdmissionControlledCompressor(BaseDocumentCompressor):
+    """
+    Document compressor sending its calls through an admission controller.
+
+    Attributes
+    ----------
+    compressor : BaseDocumentCompressor
+        The document compressor.
+    admission_controller : AdmissionController
+        The admission controller of the calls.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    compressor: BaseDocumentCompressor
+    """The document compressor."""
+    admission_controller: AdmissionController
+    """The admission controller of the calls."""
+
+    def compress_documents(
+        self, documents: Sequence[Document], query: str, callbacks: Optional[Callbacks] = None
+    ) -> Sequence[Document]:
+        with self.admission_controller.slot():
+            return self.compressor.compress_documents(documents, query, callbacks)
+
+    async def acompress_documents(
+        self, documents: Sequence[Document], query: str, callbacks: Optional[Callbacks] = None
+    ) -> Sequence[Document]:
+        async with self.admission_controller.aslot():
+            return await self.compressor.acompress_documents(documents, query, callbacks)
+
+
+class AdmissionControlledOutputParser(BaseCumulativeTransformOutputParser[dict]):
+    """
+    Guardrail output parser sending its calls through an admission controller.
+
+    Attributes
+    ----------
+    parser : BaseOutputParser
+        The guardrail output parser.
+    admission_controller : AdmissionController
+        The admission controller of the calls.
+    diff : bool
+        A flag to indicate whether or not to compute differences between consecutive outputs.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    parser: BaseOutputParser
+    """The guardrail output parser."""
+    admission_controller: AdmissionController
+    """The admission controller of the calls."""
+    diff: bool = True
+
+    @property
+    def _type(self) -> str:
+        """Return the output parser type for serialization."""
+        return "default"
+
+    def _diff(self, prev: Optional[dict], next: dict) -> dict:
+        """Calculate the difference between the previous and current output, if applicable."""
+        return self.parser._diff(prev, next)
+
+    def parse(self, text: str) -> dict:
+        with self.admission_controller.slot():
+            return self.parser.parse(text)
+
+    async def aparse(self, text: str) -> dict:
+        async with self.admission_controller.aslot():
+            return await self.parser.aparse(text)
+
+
+def admission_controlled(instance: T, settings: BaseModel) -> T:
+    """
+    Sends the calls of an embedding model, a document compressor or a guardrail output parser through the
+    admission controller configured by its settings.
+
+    Parameters
+    ----------
+    instance : T
+        The embedding model, document compressor or guardrail output parser.
+    settings : BaseModel
+        The provider settings used to build the instance.
+
+    Returns
+    -------
+    T
+        The instance wrapped with its admission controller, or the instance itself if admission control is disabled.
+    """
+    controller = get_admission_controller(settings.admission, settings)
+    if controller is None:
+        return instance
+    if isinstance(instance, Embeddings):
+        return AdmissionControlledEmbeddings(embeddings=instance, admission_controller=controller)
+    if isinstance(instance, BaseDocumentCompressor):
+        return AdmissionControlledCompressor(compressor=instance, admission_controller=controller)
+    if isinstance(instance, BaseOutputParser):
+        return AdmissionControlledOutputParser(parser=instance, admission_controller=controller)
+    raise ValueError(f"Admission control is not supported for {type(instance).__name__}.")
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import logging
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from pydantic import BaseModel
+from langchain_core.messages import BaseMessage
+
+from tock_genai_core.models.llm import LLMSetting
+from tock_genai_core.services.langchain.factory import get_llm_factory
+
+
+logger = logging.getLogger(__name__)
+
+BatchPrompt = Union[str, Tuple[str, str]]
+"""A prompt, or an (id, prompt) pair. Prompts without id are identified by their position in the batch."""
+
+
+class BatchReport(BaseModel):
+    """
+    The report of a batch generation.
+
+    Attributes
+    ----------
+    total : int
+        Number of prompts in the batch.
+    skipped : int
+        Number of prompts already generated by a previous run, and not generated again.
+    succeeded : int
+        Number of prompts generated by this run.
+    failed : int
+        Number of prompts whose generation failed (they are generated again by the next run).
+    duration : float
+        Time in seconds spent generating.
+    """
+
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    duration: float = 0.0
+
+
+def _load_checkpoint(output_path: str) -> Set[str]:
+    """Returns the ids of the prompts successfully generated in the output file by previous runs."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as output:
+        for line in output:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Last line truncated by an interrupted run
+                continue
+            if "output" in record:
+                done.add(record["id"])
+    return done
+
+
+def _ends_with_newline(output_path: str) -> bool:
+    """Returns whether the output file is empty or ends with a complete line."""
+    if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        return True
+    with open(output_path, "rb") as output:
+        output.seek(-1, os.SEEK_END)
+        return output.read(1) == b"\n"
+
+
+def _with_ids(prompts: Iterable[BatchPrompt]) -> Iterator[Tuple[str, str]]:
+    """Yields the (id, prompt) pairs of the batch."""
+    for position, prompt in enumerate(prompts):
+        yield (str(position), prompt) if isinstance(prompt, str) else (str(prompt[0]), prompt[1])
+
+
+def _grouped_by_prefix(prompts: Iterator[Tuple[str, str]], window: int) -> Iterator[Tuple[str, str]]:
+    """
+    Reorders the prompts window by window, so that prompts sharing a common prefix (e.g. the same instructions or
+    the same document) are submitted together and hit the prefix cache of the server.
+    """
+    while True:
+        chunk = list(islice(prompts, window))
+        if not chunk:
+            return
+        yield from sorted(chunk, key=lambda item: item[1])
+
+
+def generate_batch(
+    settings: LLMSetting,
+    prompts: Iterable[BatchPrompt],
+    output_path: str,
+    max_concurrency: int = 8,
+    window: int = 1000,
+    **kwargs: Any,
+) -> BatchReport:
+    """
+    Generates the answers of a batch of prompts (e.g. nightly summaries or synthetic Q&A) with an LLM, typically a
+    vLLM server.
+    Prompts are submitted with a bounded concurrency, ordered so that prompts sharing a common prefix are sent
+    together (which makes the vLLM prefix caching effective). Each answer is appended to the JSON lines output file
+    as soon as it is generated (`{"id": ..., "output": ...}`, or `{"id": ..., "error": ...}` on failure). The output
+    file is also the checkpoint of the batch: when run again on the same file, the prompts already generated are
+    skipped, so that an interrupted job resumes where it stopped.
+
+    Parameters
+    ----------
+    settings : LLMSetting
+        The LLM settings.
+    prompts : Iterable[BatchPrompt]
+        The prompts, or (id, prompt) pairs. The prompts are read lazily, window by window.
+    output_path : str
+        Path of the JSON lines output file.
+    max_concurrency : int
+        Maximum number of prompts generated at the same time (default: 8).
+    window : int
+        Number of prompts reordered together to group the common prefixes (default: 1000).
+    **kwargs : Any
+        Generation parameters given to each LLM call.
+
+    Returns
+    -------
+    BatchReport
+        The report of the batch generation.
+    """
+    start = time.perf_counter()
+    model = get_llm_factory(settings).get_model()
+    done = _load_checkpoint(output_path)
+    complete = _ends_with_newline(output_path)
+    report = BatchReport()
+
+    def generate(prompt: str) -> str:
+        output = model.invoke(prompt, **kwargs)
+        return output.content if isinstance(output, BaseMessage) else output
+
+    pending: Dict[Future, str] = {}
+
+    def write_completed(output, futures: Iterable[Future]) -> None:
+        for future in futures:
+            prompt_id = pending.pop(future)
+            record: Dict[str, Optional[str]] = {"id": prompt_id}
+            try:
+                record["output"] = future.result()
+                report.succeeded += 1
+            except Exception as e:
+                logger.warning("Generation of prompt %s failed: %s", prompt_id, e)
+                record["error"] = repr(e)
+                report.failed += 1
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    with open(output_path, "a", encoding="utf-8") as output, ThreadPoolExecutor(
+        max_workers=max_concurrency, thread_name_prefix="batch-generation"
+    ) as executor:
+        if not complete:
+            output.write("\n")
+        for prompt_id, prompt in _grouped_by_prefix(_with_ids(prompts), window):
+            report.total += 1
+            if prompt_id in done:
+                report.skipped += 1
+                continue
+            # Bounds the prompts held in memory to the ones being generated
+            if len(pending) >= max_concurrency:
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                write_completed(output, completed)
+            pending[executor.submit(generate, prompt)] = prompt_id
+
+        write_completed(output, list(wait(pending).done))
+
+    report.duration = time.perf_counter() - start
+    logger.info(
+        "Batch generation of %s prompts done in %.3fs (%s skipped, %s failed).",
+        report.total,
+        report.duration,
+        report.skipped,
+        report.failed,
+    )
+    return report
@@ -4,8 +4,8 @@ from typing import Sequence, Optional
 
 import requests
 from langchain_core.documents import Document
-from langchain.callbacks.manager import Callbacks
-from langchain.retrievers.document_compressors.base import BaseDocumentCompressor
+from langchain_core.callbacks import Callbacks
+from langchain_core.documents import BaseDocumentCompressor
 
 
 logger = logging.getLogger(__name__)
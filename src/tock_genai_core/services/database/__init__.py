@@ -1,4 +1,19 @@
 # -*- coding: utf-8 -*-
 """Initialisation de module(s)."""
 
-from .opensearch import get_db_client
+from tock_genai_core.utils.lazy_import import lazy_getattr
+
+# The database clients (and their SDKs) are only imported when first used.
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "get_db_client": ".opensearch",
+        "get_async_db_client": ".opensearch",
+        "get_engine": ".pgvector",
+        "to_opensearch_filter": ".metadata_filter",
+        "to_pgvector_filter": ".metadata_filter",
+        "to_metadata_predicate": ".metadata_filter",
+        "get_retrieval_cache": ".retrieval_cache",
+        "bump_generation": ".retrieval_cache",
+    },
+)
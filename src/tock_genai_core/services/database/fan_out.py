@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables.config import run_in_executor
+from langchain_core.vectorstores import VectorStore
+
+
+logger = logging.getLogger(__name__)
+
+ScoredDocuments = List[Tuple[Document, float]]
+
+
+class FanOutVectorStore(VectorStore):
+    """
+    Read-only vector store searching several vector stores concurrently, and merging their results into a global
+    top-k.
+    The query is embedded once, then every source is searched by vector for the `k` nearest documents. Scores are
+    normalized to relevance scores in [0, 1] with the relevance function of each source (which depends on its
+    distance strategy), so that the results of the sources can be merged. A source that fails or doesn't answer
+    within `timeout` is left out of the results, which are only an error if no source answers.
+
+    Attributes
+    ----------
+    stores : List[VectorStore]
+        The vector stores to search.
+    embedding : Embeddings
+        The embedding model shared by the vector stores.
+    timeout : Optional[float]
+        Maximum time in seconds to wait for each source.
+    """
+
+    def __init__(self, stores: List[VectorStore], embedding: Embeddings, timeout: Optional[float] = None):
+        self.stores = stores
+        self.embedding = embedding
+        self.timeout = timeout
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        raise NotImplementedError("The fan-out vector store is read-only, texts must be added to one of its sources.")
+
+    @classmethod
+    def from_texts(cls, *args: Any, **kwargs: Any) -> "FanOutVectorStore":
+        raise NotImplementedError("The fan-out vector store is built from existing vector stores.")
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # The merged scores already are relevance scores
+        return lambda score: score
+
+    @staticmethod
+    def _search(store: VectorStore, embedding: List[float], k: int, **kwargs: Any) -> ScoredDocuments:
+        relevance = store._select_relevance_score_fn()
+        results = store.similarity_search_with_score_by_vector(embedding, k=k, **kwargs)
+        return [(document, relevance(score)) for document, score in results]
+
+    @staticmethod
+    async def _asearch(store: VectorStore, embedding: List[float], k: int, **kwargs: Any) -> ScoredDocuments:
+        search = getattr(store, "asimilarity_search_with_score_by_vector", None)
+        if search is None:
+            return await run_in_executor(None, FanOutVectorStore._search, store, embedding, k, **kwargs)
+        relevance = store._select_relevance_score_fn()
+        return [(document, relevance(score)) for document, score in await search(embedding, k=k, **kwargs)]
+
+    def _merge(self, results: Sequence[Any], k: int) -> ScoredDocuments:
+        """Merges the results of the sources into the global top-k, leaving out the sources that failed."""
+        merged = []
+        errors = []
+        for store, result in zip(self.stores, results):
+            if isinstance(result, BaseException):
+                logger.warning("Search of %s failed, its results are left out: %r", type(store).__name__, result)
+                errors.append(result)
+            else:
+                merged.extend(result)
+        if len(errors) == len(self.stores):
+            raise RuntimeError("No source of the fan-out vector store answered.") from errors[0]
+        return sorted(merged, key=lambda result: result[1], reverse=True)[:k]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> ScoredDocuments:
+        """Searches the sources concurrently, each one in its own thread, and merges their results."""
+        executor = ThreadPoolExecutor(max_workers=len(self.stores), thread_name_prefix="fan-out-search")
+        try:
+            futures = [executor.submit(self._search, store, embedding, k, **kwargs) for store in self.stores]
+            # The sources are searched at the same time, so the timeout applies to each of them
+            wait(futures, timeout=self.timeout)
+            results = [
+                (
+                    future.exception() or future.result()
+                    if future.done()
+                    else TimeoutError(f"No answer within {self.timeout}s.")
+                )
+                for future in futures
+            ]
+        finally:
+            # Don't wait for the sources that timed out
+            executor.shutdown(wait=False, cancel_futures=True)
+        return self._merge(results, k)
+
+    async def asimilarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> ScoredDocuments:
+        """Searches the sources concurrently as asyncio tasks, and merges their results."""
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._asearch(store, embedding, k, **kwargs), self.timeout) for store in self.stores),
+            return_exceptions=True,
+        )
+        return self._merge(results, k)
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> ScoredDocuments:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    async def asimilarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> ScoredDocuments:
+        return await self.asimilarity_search_with_score_by_vector(await self.embedding.aembed_query(query), k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    async def asimilarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in await self.asimilarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in await self.asimilarity_search_with_score(query, k, **kwargs)]
@@ -0,0 +1,444 @@
+import os
+import re
+import json
+import uuid
+import logging
+import threading
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from tock_genai_core.services.database.metadata_filter import is_metadata_filter, to_metadata_predicate
+
+
+logger = logging.getLogger(__name__)
+
+METRICS = {"l2": "l2", "cosine": "cosine", "cosin": "cosine", "inner": "inner"}
+"""The metrics of the embedding space types."""
+
+_HNSW_SPACES = {"l2": "l2", "cosine": "ip", "inner": "ip"}
+"""The hnswlib spaces of the metrics (cosine vectors are normalized when written)."""
+
+
+def _import_hnswlib() -> Any:
+    try:
+        import hnswlib
+    except ImportError as e:
+        raise ImportError(
+            "The HNSW index of the local vector store requires the hnswlib package, install it with "
+            "`pip install hnswlib`."
+        ) from e
+    return hnswlib
+
+
+def _replace(path: str, write: Callable[[Any], None], mode: str = "wb") -> None:
+    """Writes a file atomically, so that readers never load a partially written snapshot."""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, mode) as file:
+        write(file)
+    os.replace(temporary_path, path)
+
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process vector store, keeping the vectors in a contiguous float32 matrix (one row per document).
+    Searches are exact and vectorized (a single matrix-vector product), or go through an HNSW graph (`hnswlib`) once
+    the store holds `hnsw_threshold` vectors. Search filters are lists of MetadataFilter, or predicates on the
+    documents. Scores are distances, lower is better: cosine distance, euclidean distance or negative inner product,
+    as the PGVector distance strategies.
+    The store is persisted by `snapshot` as a `.npy` matrix, the HNSW graph (if built) and a JSON file of the
+    documents, pointing to the version of their matrix and graph. `load` memory-maps the matrix of a snapshot:
+    read-only stores of several worker processes share the same pages, and search without locking.
+
+    Attributes
+    ----------
+    embedding : Embeddings
+        The embedding model.
+    metric : str
+        The distance metric: `cosine`, `l2` or `inner`.
+    hnsw_threshold : Optional[int]
+        Number of vectors from which searches use an HNSW graph, None for exact searches only.
+    m : int
+        Maximum number of connections per node of the HNSW graph.
+    ef_construction : int
+        Size of the candidate list used to build the HNSW graph.
+    ef_search : int
+        Size of the candidate list of the searches.
+    read_only : bool
+        Whether the store rejects writes.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        metric: str = "cosine",
+        hnsw_threshold: Optional[int] = None,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        read_only: bool = False,
+    ):
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric {metric}, expected one of {list(METRICS)}.")
+        self.embedding = embedding
+        self.metric = METRICS[metric]
+        self.hnsw_threshold = hnsw_threshold
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.read_only = read_only
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._rows: Dict[str, int] = {}
+        self._squared_norms: Optional[np.ndarray] = None
+        self._hnsw: Any = None
+        self._hnsw_size = 0
+        self._lock = threading.RLock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reading(self) -> Any:
+        # Read-only stores are never modified, their searches don't need to be serialized
+        return nullcontext() if self.read_only else self._lock
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise ValueError("The local vector store is read-only.")
+
+    def _prepare(self, embeddings: Sequence[List[float]]) -> np.ndarray:
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+        if self.metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+        return vectors
+
+    def _reserve(self, size: int, dimension: int) -> None:
+        """Grows the matrix to hold `size` rows, doubling its capacity to amortize the copies."""
+        if self._matrix is None:
+            self._matrix = np.empty((max(size, 16), dimension), dtype=np.float32)
+            self._squared_norms = np.empty(max(size, 16), dtype=np.float32)
+        elif self._matrix.shape[1] != dimension:
+            raise ValueError(f"Invalid embedding dimension {dimension}, expected {self._matrix.shape[1]}.")
+        elif size > len(self._matrix):
+            capacity = max(size, 2 * len(self._matrix))
+            matrix = np.empty((capacity, dimension), dtype=np.float32)
+            matrix[: self._size] = self._matrix[: self._size]
+            squared_norms = np.empty(capacity, dtype=np.float32)
+            squared_norms[: self._size] = self._squared_norms[: self._size]
+            self._matrix, self._squared_norms = matrix, squared_norms
+
+    def add_embeddings(
+        self,
+        texts: Iterable[str],
+        embeddings: Sequence[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Adds texts with their precomputed embeddings, the documents of existing ids are overwritten."""
+        self._check_writable()
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = [str(id_) for id_ in ids] if ids else [str(uuid.uuid4()) for _ in texts]
+        vectors = self._prepare(embeddings)
+        with self._lock:
+            self._reserve(self._size + len(texts), vectors.shape[1])
+            for id_, text, metadata, vector in zip(ids, texts, metadatas, vectors):
+                row = self._rows.get(id_)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows[id_] = row
+                    self._ids.append(id_)
+                    self._texts.append(text)
+                    self._metadatas.append(metadata)
+                else:
+                    self._texts[row], self._metadatas[row] = text, metadata
+                    if row < self._hnsw_size:
+                        # The HNSW graph holds the previous vector, it's rebuilt by the next search
+                        self._hnsw, self._hnsw_size = None, 0
+                self._matrix[row] = vector
+                self._squared_norms[row] = vector @ vector
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        return self.add_embeddings(texts, self.embedding.embed_documents(texts), metadatas=metadatas, ids=ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Deletes documents by id, moving the last rows of the matrix to the deleted rows to keep it contiguous."""
+        self._check_writable()
+        with self._lock:
+            for id_ in ids or []:
+                row = self._rows.pop(str(id_), None)
+                if row is None:
+                    continue
+                last = self._size - 1
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._squared_norms[row] = self._squared_norms[last]
+                    self._ids[row], self._texts[row], self._metadatas[row] = (
+                        self._ids[last],
+                        self._texts[last],
+                        self._metadatas[last],
+                    )
+                    self._rows[self._ids[row]] = row
+                del self._ids[last], self._texts[last], self._metadatas[last]
+                self._size = last
+                self._hnsw, self._hnsw_size = None, 0
+        return True
+
+    def metadata_values(self, field: str, include_missing: bool = False) -> Dict[str, Any]:
+        """
+        Returns the values of a metadata field of the documents having it, by id (and None for the other documents,
+        if `include_missing` is set).
+        """
+        with self._reading():
+            return {
+                id_: metadata.get(field)
+                for id_, metadata in zip(self._ids, self._metadatas)
+                if include_missing or field in metadata
+            }
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        with self._reading():
+            return [self._document(self._rows[id_]) for id_ in ids if id_ in self._rows]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(embedding=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    def _document(self, row: int) -> Document:
+        return Document(id=self._ids[row], page_content=self._texts[row], metadata=dict(self._metadatas[row]))
+
+    def _candidates(self, filter: Any) -> Optional[np.ndarray]:
+        """Returns the rows matching the search filter, or None if there is no filter."""
+        if filter is None:
+            return None
+        if is_metadata_filter(filter):
+            predicate = to_metadata_predicate(filter)
+            return np.fromiter((row for row in range(self._size) if predicate(self._metadatas[row])), dtype=np.int64)
+        if callable(filter):
+            return np.fromiter((row for row in range(self._size) if filter(self._document(row))), dtype=np.int64)
+        raise ValueError("The local vector store filters are lists of MetadataFilter or predicates on documents.")
+
+    def _distances(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Computes the distances of the query to the rows (all of them if None) with a matrix-vector product."""
+        matrix = self._matrix[: self._size] if rows is None else self._matrix[rows]
+        products = matrix @ query
+        if self.metric == "cosine":
+            return 1.0 - products
+        if self.metric == "inner":
+            return -products
+        squared_norms = self._squared_norms[: self._size] if rows is None else self._squared_norms[rows]
+        return np.sqrt(np.maximum(squared_norms - 2.0 * products + query @ query, 0.0))
+
+    def _exact_search(self, query: np.ndarray, k: int, rows: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        distances = self._distances(query, rows)
+        k = min(k, len(distances))
+        if k == 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return [(int(row if rows is None else rows[row]), float(distances[row])) for row in nearest]
+
+    def _hnsw_index(self) -> Any:
+        """Returns the HNSW graph of the vectors, building it or adding the vectors appended since it was built."""
+        with self._lock:
+            if self._hnsw is not None and self._hnsw_size == self._size:
+                return self._hnsw
+            hnswlib = _import_hnswlib()
+            if self._hnsw is None:
+                index = hnswlib.Index(space=_HNSW_SPACES[self.metric], dim=self._matrix.shape[1])
+                index.init_index(max_elements=self._size, ef_construction=self.ef_construction, M=self.m)
+            else:
+                index = self._hnsw
+                index.resize_index(max(self._size, 2 * index.get_max_elements()))
+            index.add_items(self._matrix[self._hnsw_size : self._size], np.arange(self._hnsw_size, self._size))
+            index.set_ef(self.ef_search)
+            self._hnsw, self._hnsw_size = index, self._size
+            return index
+
+    def _hnsw_search(self, query: np.ndarray, k: int, rows: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        index = self._hnsw_index()
+        allowed = None
+        if rows is not None:
+            mask = np.zeros(self._size, dtype=bool)
+            mask[rows] = True
+            allowed = mask.__getitem__
+        k = min(k, self._size if rows is None else len(rows))
+        labels, distances = index.knn_query(query, k=k, filter=allowed)
+        results = []
+        for row, distance in zip(labels[0], distances[0]):
+            if self.metric == "l2":
+                # hnswlib returns squared euclidean distances
+                distance = np.sqrt(distance)
+            elif self.metric == "inner":
+                # hnswlib returns 1 - inner product
+                distance = distance - 1.0
+            results.append((int(row), float(distance)))
+        return results
+
+    def _search(self, embedding: List[float], k: int, filter: Any) -> List[Tuple[Document, float]]:
+        query = self._prepare([embedding])[0]
+        with self._reading():
+            if not self._size or k <= 0:
+                return []
+            rows = self._candidates(filter)
+            searched = self._size if rows is None else len(rows)
+            if self.hnsw_threshold is not None and searched >= self.hnsw_threshold:
+                try:
+                    results = self._hnsw_search(query, k, rows)
+                except RuntimeError:
+                    # hnswlib can't find k neighbours among few filtered vectors
+                    logger.debug("HNSW search failed, falling back to the exact search.", exc_info=True)
+                    results = self._exact_search(query, k, rows)
+            else:
+                results = self._exact_search(query, k, rows)
+            return [(self._document(row), distance) for row, distance in results]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, filter: Any = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self._search(embedding, k, filter)
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, filter: Any = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self._search(self.embedding.embed_query(query), k, filter)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, filter: Any = None, **kwargs: Any
+    ) -> List[Document]:
+        return [document for document, _ in self._search(embedding, k, filter)]
+
+    def similarity_search(self, query: str, k: int = 4, filter: Any = None, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        if self.metric == "cosine":
+            return self._cosine_relevance_score_fn
+        if self.metric == "inner":
+            return self._max_inner_product_relevance_score_fn
+        return self._euclidean_relevance_score_fn
+
+    def build_index(self) -> None:
+        """Builds the HNSW graph ahead of the first search, if the store holds `hnsw_threshold` vectors."""
+        if self.hnsw_threshold is not None and self._size >= self.hnsw_threshold:
+            self._hnsw_index()
+
+    def snapshot(self, path: str, name: str = "vectors") -> None:
+        """
+        Saves the store to snapshot files in a directory: `<name>.<version>.npy` (the matrix),
+        `<name>.<version>.hnsw` (the HNSW graph, if built) and `<name>.json` (the documents, with the version of their
+        matrix and graph). The documents are replaced atomically once the matrix and graph of their version are
+        written, so that a snapshot is always loaded with its own matrix and graph. The files of the previous version
+        are kept for the workers loading it, the older ones are deleted.
+
+        Parameters
+        ----------
+        path : str
+            The directory of the snapshot, created if it doesn't exist.
+        name : str
+            The name of the snapshot files (default: "vectors").
+        """
+        os.makedirs(path, exist_ok=True)
+        base = os.path.join(path, name)
+        version = uuid.uuid4().hex
+        with self._reading():
+            matrix = self._matrix[: self._size] if self._matrix is not None else np.empty((0, 0), dtype=np.float32)
+            _replace(f"{base}.{version}.npy", lambda file: np.save(file, np.ascontiguousarray(matrix)))
+            hnsw = self._hnsw is not None and self._hnsw_size == self._size
+            if hnsw:
+                self._hnsw.save_index(f"{base}.{version}.hnsw")
+            documents = {
+                "version": version,
+                "hnsw": hnsw,
+                "metric": self.metric,
+                "ids": self._ids,
+                "texts": self._texts,
+                "metadatas": self._metadatas,
+            }
+            _replace(f"{base}.json", lambda file: json.dump(documents, file, ensure_ascii=False), mode="w")
+        versions: Dict[str, float] = {}
+        for file_name in os.listdir(path):
+            match = re.fullmatch(rf"{re.escape(name)}\.([0-9a-f]{{32}})\.(npy|hnsw)", file_name)
+            if match:
+                versions[match.group(1)] = os.path.getmtime(os.path.join(path, file_name))
+        for old_version in sorted(versions.keys() - {version}, key=versions.get, reverse=True)[1:]:
+            for extension in ("npy", "hnsw"):
+                if os.path.exists(f"{base}.{old_version}.{extension}"):
+                    os.remove(f"{base}.{old_version}.{extension}")
+
+    @classmethod
+    def load(cls, path: str, embedding: Embeddings, name: str = "vectors", **kwargs: Any) -> "LocalVectorStore":
+        """
+        Loads a store from its snapshot files. The matrix of a read-only store is memory-mapped, the matrix of a
+        writable store is copied in memory.
+
+        Parameters
+        ----------
+        path : str
+            The directory of the snapshot.
+        embedding : Embeddings
+            The embedding model.
+        name : str
+            The name of the snapshot files (default: "vectors").
+        **kwargs : Any
+            The other parameters of the store (`hnsw_threshold`, `read_only`...).
+
+        Returns
+        -------
+        LocalVectorStore
+            The loaded store.
+        """
+        base = os.path.join(path, name)
+        with open(f"{base}.json", encoding="utf-8") as file:
+            documents = json.load(file)
+        # The matrix and graph of the version of the documents, even if a newer snapshot was saved since
+        base = f"{base}.{documents['version']}"
+        store = cls(embedding=embedding, metric=documents["metric"], **kwargs)
+        matrix = np.load(f"{base}.npy", mmap_mode="r" if store.read_only else None)
+        if len(matrix) != len(documents["ids"]):
+            raise ValueError(f"The snapshot {base} is inconsistent, its matrix and documents differ in size.")
+        store._ids, store._texts, store._metadatas = documents["ids"], documents["texts"], documents["metadatas"]
+        store._rows = {id_: row for row, id_ in enumerate(store._ids)}
+        store._size = len(matrix)
+        if store._size:
+            store._matrix = matrix
+            store._squared_norms = np.einsum("ij,ij->i", matrix, matrix)
+            if documents["hnsw"] and store.hnsw_threshold is not None:
+                hnsw = _import_hnswlib().Index(space=_HNSW_SPACES[store.metric], dim=matrix.shape[1])
+                hnsw.load_index(f"{base}.hnsw", max_elements=store._size)
+                hnsw.set_ef(store.ef_search)
+                store._hnsw, store._hnsw_size = hnsw, store._size
+        return store
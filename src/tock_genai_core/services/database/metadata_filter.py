@@ -0,0 +1,173 @@
+import json
+import operator as operators
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import and_, cast, false, not_, or_, true
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+from sqlalchemy.sql.elements import ColumnElement
+
+from tock_genai_core.models.database.metadata import MetadataFilter
+
+
+SUPPORTED_OPERATORS = ("$eq", "$ne", "$in", "$nin", "$gt", "$gte", "$lt", "$lte", "$exists")
+
+_RANGES = {"$gt": "gt", "$gte": "gte", "$lt": "lt", "$lte": "lte"}
+_JSONPATH_RANGES = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+_COMPARISONS = {"$gt": operators.gt, "$gte": operators.ge, "$lt": operators.lt, "$lte": operators.le}
+
+
+def is_metadata_filter(value: Any) -> bool:
+    """Returns whether a search filter is a list of MetadataFilter."""
+    return isinstance(value, (list, tuple)) and all(isinstance(item, MetadataFilter) for item in value)
+
+
+def _conditions(filters: Sequence[MetadataFilter]) -> List[Tuple[str, str, Any]]:
+    """Returns the (field, operator, value) conditions of the filters, all of them must be met."""
+    conditions = []
+    for metadata_filter in filters:
+        if not metadata_filter.field.isidentifier():
+            raise ValueError(f"Invalid metadata field {metadata_filter.field!r}, expected an identifier.")
+        operations = (
+            metadata_filter.value if isinstance(metadata_filter.value, dict) else {"$eq": metadata_filter.value}
+        )
+        for operator, value in operations.items():
+            if operator not in SUPPORTED_OPERATORS:
+                raise ValueError(f"Invalid operator {operator!r}, expected one of {SUPPORTED_OPERATORS}.")
+            if operator in ("$in", "$nin") and not isinstance(value, (list, tuple)):
+                raise ValueError(f"The {operator} operator expects a list of values.")
+            conditions.append((metadata_filter.field, operator, value))
+    return conditions
+
+
+def to_opensearch_filter(
+    filters: Sequence[MetadataFilter], metadata_field: str = "metadata", keyword_suffix: str = ".keyword"
+) -> Dict[str, Any]:
+    """
+    Compiles metadata filters into an OpenSearch `bool` query, usable as the efficient `filter` of a k-NN query
+    (Lucene and Faiss engines): the k nearest neighbours are searched among the matching documents only.
+
+    Parameters
+    ----------
+    filters : Sequence[MetadataFilter]
+        The metadata filters, all of them must match.
+    metadata_field : str
+        The field holding the metadata in the documents (default: "metadata", as `OpenSearchVectorSearch`).
+    keyword_suffix : str
+        The suffix of the keyword sub-field matched by exact string values (default: ".keyword", as the dynamic
+        mapping of string fields). Use "" for fields mapped as keywords.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The `bool` query.
+    """
+    must: List[Dict[str, Any]] = []
+    must_not: List[Dict[str, Any]] = []
+
+    def term_field(field: str, value: Any) -> str:
+        return f"{metadata_field}.{field}{keyword_suffix if isinstance(value, str) else ''}"
+
+    for field, operator, value in _conditions(filters):
+        if operator in ("$eq", "$ne"):
+            clause = {"term": {term_field(field, value): value}}
+            (must if operator == "$eq" else must_not).append(clause)
+        elif operator in ("$in", "$nin"):
+            clause = {"terms": {term_field(field, value[0] if value else ""): list(value)}}
+            (must if operator == "$in" else must_not).append(clause)
+        elif operator in _RANGES:
+            must.append({"range": {f"{metadata_field}.{field}": {_RANGES[operator]: value}}})
+        else:
+            clause = {"exists": {"field": f"{metadata_field}.{field}"}}
+            (must if value else must_not).append(clause)
+
+    query: Dict[str, Any] = {}
+    if must:
+        query["filter"] = must
+    if must_not:
+        query["must_not"] = must_not
+    return {"bool": query}
+
+
+def to_pgvector_filter(filters: Sequence[MetadataFilter], metadata_column: Any) -> ColumnElement:
+    """
+    Compiles metadata filters into a SQL predicate on the JSONB metadata column of PGVector.
+    The predicate only uses the containment (`@>`) and JSON path (`@@`, `@?`) operators, which are served by the
+    GIN `jsonb_path_ops` index of the metadata column, unlike the `jsonb_path_match` function used by the PGVector
+    filters.
+
+    Parameters
+    ----------
+    filters : Sequence[MetadataFilter]
+        The metadata filters, all of them must match.
+    metadata_column : Any
+        The JSONB metadata column (e.g. `PGVector.EmbeddingStore.cmetadata`).
+
+    Returns
+    -------
+    ColumnElement
+        The SQL predicate.
+    """
+
+    def contains(field: str, value: Any) -> ColumnElement:
+        return metadata_column.op("@>", is_comparison=True)(cast({field: value}, JSONB))
+
+    clauses = []
+    for field, operator, value in _conditions(filters):
+        if operator == "$eq":
+            clauses.append(contains(field, value))
+        elif operator == "$ne":
+            clauses.append(not_(contains(field, value)))
+        elif operator == "$in":
+            clauses.append(or_(false(), *(contains(field, item) for item in value)))
+        elif operator == "$nin":
+            clauses.append(not_(or_(false(), *(contains(field, item) for item in value))))
+        elif operator in _JSONPATH_RANGES:
+            # The field is an identifier and the value a JSON literal, both are valid in a JSON path
+            path = f"$.{field} {_JSONPATH_RANGES[operator]} {json.dumps(value)}"
+            clauses.append(metadata_column.op("@@", is_comparison=True)(cast(path, JSONPATH)))
+        else:
+            exists = metadata_column.op("@?", is_comparison=True)(cast(f"$.{field}", JSONPATH))
+            clauses.append(exists if value else not_(exists))
+    return and_(true(), *clauses)
+
+
+def to_metadata_predicate(filters: Sequence[MetadataFilter]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compiles metadata filters into a predicate on the metadata of a document, for the vector stores filtering in
+    process. The predicate has the semantics of the compiled queries: a missing field only matches `$ne`, `$nin` and
+    `$exists: false`, and a range comparison with a value of another type doesn't match.
+
+    Parameters
+    ----------
+    filters : Sequence[MetadataFilter]
+        The metadata filters, all of them must match.
+
+    Returns
+    -------
+    Callable[[Dict[str, Any]], bool]
+        The predicate, returning whether the metadata of a document match all the filters.
+    """
+    conditions = _conditions(filters)
+
+    def matches(field: str, operator: str, value: Any, metadata: Dict[str, Any]) -> bool:
+        present = field in metadata
+        actual = metadata.get(field)
+        if operator == "$eq":
+            return present and actual == value
+        if operator == "$ne":
+            return not present or actual != value
+        if operator == "$in":
+            return present and actual in value
+        if operator == "$nin":
+            return not present or actual not in value
+        if operator in _COMPARISONS:
+            try:
+                return present and actual is not None and _COMPARISONS[operator](actual, value)
+            except TypeError:
+                return False
+        return present == bool(value)
+
+    def predicate(metadata: Dict[str, Any]) -> bool:
+        return all(matches(field, operator, value, metadata) for field, operator, value in conditions)
+
+    return predicate
@@ -1,10 +1,20 @@
+import math
+import uuid
+import asyncio
 import logging
+import threading
+from weakref import WeakKeyDictionary
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
-from opensearchpy import OpenSearch
+from opensearchpy import AsyncOpenSearch, OpenSearch, RequestError
+from opensearchpy.helpers import parallel_bulk, scan
+from langchain_core.vectorstores import VectorStore
 
 from tock_genai_core.models.database.opensearch.opensearch_db_setting import (
     OpenSearchSetting,
 )
+from tock_genai_core.services.langchain.factory.registry import factory_registry, settings_fingerprint
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
 
@@ -13,26 +23,369 @@ logger = logging.getLogger(__name__)
 logging.basicConfig()
 logging.getLogger().setLevel(logging.INFO)
 
+SPACE_TYPES = {"l2": "l2", "cosine": "cosinesimil", "cosin": "cosinesimil", "inner": "innerproduct"}
+"""The k-NN space types of the embedding space types (other space types are used as is)."""
 
-def get_db_client(db_settings: OpenSearchSetting) -> OpenSearch:
+
+def relevance_score_fn(space_type: str, engine: str, byte_scale: Optional[float] = None) -> Callable[[float], float]:
     """
-    Create an OpenSearch client using the provided database settings.
+    Returns the function converting the k-NN scores of an index into relevance scores on the scale of the other
+    vector stores (e.g. PGVector): the distance is recovered from the score with the scoring formula of the space
+    type and engine, then converted into a relevance score by the relevance function of its distance strategy. The
+    results of an OpenSearch index and of other vector stores can then be compared.
 
     Parameters
     ----------
-    db_settings : OpenSearchSetting
-        The settings for connecting to the OpenSearch database.
+    space_type : str
+        The space type of the index (embedding space type or k-NN space type).
+    engine : str
+        The k-NN engine of the index.
+    byte_scale : Optional[float]
+        The factor applied to the embeddings of a byte vector index (default: None, float vectors).
 
     Returns
     -------
-    OpenSearch
-        An OpenSearch client instance configured with the provided settings.
+    Callable[[float], float]
+        The relevance function, the identity for the space types without an equivalent distance strategy.
     """
-    return OpenSearch(
+    space_type = SPACE_TYPES.get(space_type, space_type)
+    scale = byte_scale or 1.0
+    if space_type == "cosinesimil":
+        # Lucene scores (2 - d) / 2, nmslib and Faiss score 1 / (1 + d), with d = 1 - cosine
+        if engine == "lucene":
+            return lambda score: VectorStore._cosine_relevance_score_fn(2.0 - 2.0 * score)
+        return lambda score: VectorStore._cosine_relevance_score_fn(1.0 / score - 1.0)
+    if space_type == "innerproduct":
+        # Scores are 1 + ip for positive inner products, 1 / (1 - ip) otherwise
+        return lambda score: VectorStore._max_inner_product_relevance_score_fn(
+            -(score - 1.0 if score >= 1.0 else 1.0 - 1.0 / score) / scale**2
+        )
+    if space_type == "l2":
+        # Scores are 1 / (1 + d), with d the squared euclidean distance
+        return lambda score: VectorStore._euclidean_relevance_score_fn(math.sqrt(max(0.0, 1.0 / score - 1.0)) / scale)
+    return lambda score: score
+
+
+_async_clients_lock = threading.Lock()
+
+
+def _client_settings(db_settings: OpenSearchSetting) -> OpenSearchSetting:
+    """Returns the settings of the client, without the index (the clients are shared by the indices)."""
+    return db_settings.model_copy(update={"index": None})
+
+
+def _client_args(db_settings: OpenSearchSetting) -> Dict[str, Any]:
+    """Returns the arguments of the clients configured by the settings, resolving the secrets."""
+    return dict(
         hosts=db_settings.db_url,
         http_auth=(fetch_secret_key_value(db_settings.username), fetch_secret_key_value(db_settings.password)),
         use_ssl=db_settings.use_ssl,
         verify_certs=db_settings.verify_certs,
         ssl_assert_hostname=False,
         ssl_show_warn=False,
+        timeout=db_settings.timeout,
+        max_retries=db_settings.max_retries,
+        retry_on_timeout=db_settings.retry_on_timeout,
     )
+
+
+def get_db_client(db_settings: OpenSearchSetting) -> OpenSearch:
+    """
+    Returns the OpenSearch client of the provided database settings.
+    Clients are memoized in the factory registry: calls with the same settings (whatever the index) reuse the same
+    client, its resolved secrets and its warm HTTP connections.
+
+    Parameters
+    ----------
+    db_settings : OpenSearchSetting
+        The settings for connecting to the OpenSearch database.
+
+    Returns
+    -------
+    OpenSearch
+        An OpenSearch client instance configured with the provided settings.
+    """
+    settings = _client_settings(db_settings)
+    return factory_registry.get_or_create(
+        f"{__name__}.get_db_client:{settings_fingerprint(settings)}",
+        lambda: OpenSearch(pool_maxsize=settings.pool_maxsize, **_client_args(settings)),
+        settings,
+    )
+
+
+def get_async_db_client(db_settings: OpenSearchSetting) -> AsyncOpenSearch:
+    """
+    Returns the AsyncOpenSearch client of the provided database settings for the running event loop, for async calls.
+    An async client is bound to the event loop of its connections: the clients are memoized per settings (as in
+    `get_db_client`) and per event loop, so this function must be called from the event loop using the client.
+
+    Parameters
+    ----------
+    db_settings : OpenSearchSetting
+        The settings for connecting to the OpenSearch database.
+
+    Returns
+    -------
+    AsyncOpenSearch
+        An AsyncOpenSearch client instance configured with the provided settings.
+    """
+    loop = asyncio.get_running_loop()
+    settings = _client_settings(db_settings)
+    clients = factory_registry.get_or_create(
+        f"{__name__}.get_async_db_client:{settings_fingerprint(settings)}", WeakKeyDictionary, settings
+    )
+    with _async_clients_lock:
+        client = clients.get(loop)
+        if client is None:
+            client = clients[loop] = AsyncOpenSearch(maxsize=settings.pool_maxsize, **_client_args(settings))
+        return client
+
+
+def parallel_bulk_embeddings(
+    client: OpenSearch,
+    index_name: str,
+    texts: List[str],
+    embeddings: List[List[float]],
+    metadatas: Optional[List[dict]] = None,
+    ids: Optional[List[str]] = None,
+    chunk_size: int = 500,
+    thread_count: int = 4,
+    vector_field: str = "vector_field",
+    text_field: str = "text",
+) -> int:
+    """
+    Indexes embeddings with concurrent bulk requests (`parallel_bulk`), in the document format of
+    `OpenSearchVectorSearch`. Unlike `OpenSearchVectorSearch.add_embeddings`, the index isn't refreshed.
+
+    Parameters
+    ----------
+    client : OpenSearch
+        The OpenSearch client.
+    index_name : str
+        The name of the index, which must already exist.
+    texts : List[str]
+        The texts.
+    embeddings : List[List[float]]
+        The embeddings of the texts.
+    metadatas : Optional[List[dict]]
+        The metadata of the texts (default: None, empty metadata).
+    ids : Optional[List[str]]
+        The ids of the texts (default: None, random ids).
+    chunk_size : int
+        Number of documents sent by a single bulk request (default: 500).
+    thread_count : int
+        Number of bulk requests sent at the same time (default: 4).
+    vector_field : str
+        The field of the embeddings (default: "vector_field").
+    text_field : str
+        The field of the texts (default: "text").
+
+    Returns
+    -------
+    int
+        The number of indexed documents.
+    """
+    actions = (
+        {
+            "_op_type": "index",
+            "_index": index_name,
+            "_id": ids[i] if ids else str(uuid.uuid4()),
+            vector_field: embeddings[i],
+            text_field: texts[i],
+            "metadata": metadatas[i] if metadatas else {},
+        }
+        for i in range(len(texts))
+    )
+    # Raises a BulkIndexError if a document isn't indexed
+    return sum(1 for _ in parallel_bulk(client, actions, thread_count=thread_count, chunk_size=chunk_size))
+
+
+def parallel_bulk_delete(
+    client: OpenSearch, index_name: str, ids: List[str], chunk_size: int = 500, thread_count: int = 4
+) -> int:
+    """
+    Deletes documents by id with concurrent bulk requests. The ids of missing documents are ignored, and the index
+    isn't refreshed.
+
+    Parameters
+    ----------
+    client : OpenSearch
+        The OpenSearch client.
+    index_name : str
+        The name of the index.
+    ids : List[str]
+        The ids of the documents.
+    chunk_size : int
+        Number of documents deleted by a single bulk request (default: 500).
+    thread_count : int
+        Number of bulk requests sent at the same time (default: 4).
+
+    Returns
+    -------
+    int
+        The number of deleted documents.
+    """
+    actions = ({"_op_type": "delete", "_index": index_name, "_id": id_} for id_ in ids)
+    # Raises a BulkIndexError if a document isn't deleted, unless it doesn't exist
+    return sum(
+        ok
+        for ok, _ in parallel_bulk(
+            client, actions, thread_count=thread_count, chunk_size=chunk_size, ignore_status=(404,)
+        )
+    )
+
+
+def fetch_metadata_values(
+    client: OpenSearch,
+    index_name: str,
+    field: str,
+    metadata_field: str = "metadata",
+    batch_size: int = 5000,
+    include_missing: bool = False,
+) -> Dict[str, Any]:
+    """
+    Reads the values of a metadata field of all the documents of an index, scrolling through the documents having
+    the field and only fetching the field (not the vectors nor the texts).
+
+    Parameters
+    ----------
+    client : OpenSearch
+        The OpenSearch client.
+    index_name : str
+        The name of the index.
+    field : str
+        The metadata field.
+    metadata_field : str
+        The field holding the metadata in the documents (default: "metadata", as `OpenSearchVectorSearch`).
+    batch_size : int
+        Number of documents read by a single scroll request (default: 5000).
+    include_missing : bool
+        Whether the documents without the field are read too, with a None value (default: False, left out).
+
+    Returns
+    -------
+    Dict[str, Any]
+        The values of the field by document id, or an empty dict if the index doesn't exist.
+    """
+    if not client.indices.exists(index=index_name):
+        return {}
+    path = f"{metadata_field}.{field}"
+    query = {"match_all": {}} if include_missing else {"exists": {"field": path}}
+    hits = scan(client, index=index_name, query={"query": query, "_source": [path]}, size=batch_size)
+    return {hit["_id"]: hit["_source"].get(metadata_field, {}).get(field) for hit in hits}
+
+
+@contextmanager
+def bulk_index_settings(
+    client: OpenSearch, index_name: str, force_merge_segments: Optional[int] = None
+) -> Iterator[None]:
+    """
+    Disables the refresh and the replicas of an index during a bulk load, and restores them afterwards (the
+    replicas are then copied from the primary shards, rather than indexing every document twice).
+
+    Parameters
+    ----------
+    client : OpenSearch
+        The OpenSearch client.
+    index_name : str
+        The name of the index.
+    force_merge_segments : Optional[int]
+        The number of segments the index is force-merged to after a successful load (default: None, no
+        force-merge). Fewer segments make the k-NN searches faster.
+    """
+    settings = client.indices.get_settings(index=index_name)[index_name]["settings"]["index"]
+    # A missing refresh interval is restored to the default one
+    previous = {
+        "refresh_interval": settings.get("refresh_interval"),
+        "number_of_replicas": settings.get("number_of_replicas"),
+    }
+    client.indices.put_settings(index=index_name, body={"index": {"refresh_interval": "-1", "number_of_replicas": 0}})
+    logger.info("Disabled the refresh and the replicas of index %s for a bulk load.", index_name)
+    try:
+        yield
+    finally:
+        client.indices.put_settings(index=index_name, body={"index": previous})
+        client.indices.refresh(index=index_name)
+        logger.info("Restored the refresh and the replicas of index %s.", index_name)
+    if force_merge_segments:
+        logger.info("Force-merging index %s to %s segments.", index_name, force_merge_segments)
+        client.indices.forcemerge(index=index_name, max_num_segments=force_merge_segments)
+
+
+def quantize_to_bytes(embedding: List[float], scale: float) -> List[int]:
+    """Quantizes an embedding to a byte vector, scaling its components and clipping them to [-128, 127]."""
+    return [max(-128, min(127, round(value * scale))) for value in embedding]
+
+
+def ensure_index(
+    client: OpenSearch,
+    index_name: str,
+    dimension: int,
+    engine: str = "nmslib",
+    space_type: str = "l2",
+    m: int = 16,
+    ef_construction: int = 512,
+    ef_search: int = 512,
+    vector_field: str = "vector_field",
+    vector_compression: Optional[str] = None,
+) -> bool:
+    """
+    Creates a k-NN index with the HNSW parameters, in the mapping of `OpenSearchVectorSearch`, if it doesn't exist
+    yet. The build parameters of an existing index can't be changed, but its `ef_search` is updated with the NMSLIB
+    engine (it is part of the mapping with the other engines).
+
+    Parameters
+    ----------
+    client : OpenSearch
+        The OpenSearch client.
+    index_name : str
+        The name of the index.
+    dimension : int
+        The dimension of the embeddings.
+    engine : str
+        The k-NN engine (default: "nmslib").
+    space_type : str
+        The space type of the embeddings, `l2`, `cosine`, `inner` or a k-NN space type (default: "l2").
+    m : int
+        Maximum number of connections per node of the HNSW graph (default: 16).
+    ef_construction : int
+        Size of the candidate list used to build the HNSW graph (default: 512).
+    ef_search : int
+        Size of the candidate list of the searches (default: 512).
+    vector_field : str
+        The field of the embeddings (default: "vector_field").
+    vector_compression : Optional[str]
+        The compact storage of the vectors: `fp16` (Faiss scalar quantization), `int8` (Lucene scalar quantization)
+        or `byte` (byte vectors) (default: None, float32 vectors).
+
+    Returns
+    -------
+    bool
+        Whether the index was created.
+    """
+    from langchain_community.vectorstores.opensearch_vector_search import _default_text_mapping
+
+    if not client.indices.exists(index=index_name):
+        mapping = _default_text_mapping(
+            dimension, engine, SPACE_TYPES.get(space_type, space_type), ef_search, ef_construction, m, vector_field
+        )
+        vector_mapping = mapping["mappings"]["properties"][vector_field]
+        if vector_compression == "byte":
+            vector_mapping["data_type"] = "byte"
+        elif vector_compression == "fp16":
+            vector_mapping["method"]["parameters"]["encoder"] = {"name": "sq", "parameters": {"type": "fp16"}}
+        elif vector_compression == "int8":
+            vector_mapping["method"]["parameters"]["encoder"] = {"name": "sq"}
+        try:
+            client.indices.create(index=index_name, body=mapping)
+            logger.info(
+                "Created index %s (engine %s, m %s, ef_construction %s).", index_name, engine, m, ef_construction
+            )
+            return True
+        except RequestError as e:
+            # Created concurrently by another writer
+            if e.error != "resource_already_exists_exception":
+                raise
+    if engine == "nmslib":
+        client.indices.put_settings(index=index_name, body={"index": {"knn.algo_param.ef_search": ef_search}})
+    return False
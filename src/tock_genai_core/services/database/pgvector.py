@@ -0,0 +1,469 @@
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from pgvector.sqlalchemy import BIT, HALFVEC, VECTOR
+from sqlalchemy import ColumnElement, Engine, cast, create_engine, func, literal, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from langchain_core.embeddings import Embeddings
+
+from tock_genai_core.models.database.pgvector.pgvector_db_setting import PGVectorSetting
+
+
+logger = logging.getLogger(__name__)
+
+_engines: Dict[Tuple, Union[Engine, AsyncEngine]] = {}
+_engines_lock = threading.Lock()
+
+
+def _engine_args(db_settings: PGVectorSetting) -> Dict[str, Any]:
+    """Returns the pool and connection arguments of the engines configured by the settings."""
+    engine_args: Dict[str, Any] = dict(
+        pool_size=db_settings.pool_size,
+        max_overflow=db_settings.max_overflow,
+        pool_recycle=db_settings.pool_recycle,
+        pool_pre_ping=True,
+    )
+    options = {
+        "statement_timeout": db_settings.statement_timeout,
+        "hnsw.ef_search": db_settings.ef_search,
+        "ivfflat.probes": db_settings.probes,
+    }
+    if any(options.values()):
+        engine_args["connect_args"] = {
+            "options": " ".join(f"-c {name}={value}" for name, value in options.items() if value)
+        }
+    return engine_args
+
+
+def get_engine(connection_string: str, db_settings: PGVectorSetting) -> Union[Engine, AsyncEngine]:
+    """
+    Returns the SQLAlchemy engine of a PostgreSQL database, async if the settings enable `async_mode`.
+    Engines (and their connection pools) are shared by every vector store using the same connection string and
+    pool settings, whatever their collection.
+
+    Parameters
+    ----------
+    connection_string : str
+        The PostgreSQL connection string.
+    db_settings : PGVectorSetting
+        The settings of the engine pool.
+
+    Returns
+    -------
+    Union[Engine, AsyncEngine]
+        The shared engine.
+    """
+    engine_args = _engine_args(db_settings)
+    key = (connection_string, db_settings.async_mode, repr(sorted(engine_args.items())))
+    with _engines_lock:
+        if key not in _engines:
+            logger.info(
+                "Creating %s engine for database %s.",
+                "async" if db_settings.async_mode else "sync",
+                db_settings.db_url,
+            )
+            factory = create_async_engine if db_settings.async_mode else create_engine
+            _engines[key] = factory(connection_string, **engine_args)
+        return _engines[key]
+
+
+EMBEDDING_TABLE = "langchain_pg_embedding"
+"""The table of the embeddings of the PGVector collections (langchain_postgres schema)."""
+
+COLLECTION_TABLE = "langchain_pg_collection"
+"""The table of the PGVector collections (langchain_postgres schema)."""
+
+DEFERRED_INDEX_TABLE = "tock_pg_deferred_index"
+"""The table keeping the definitions of the indexes dropped by the bulk loads, until they are built again."""
+
+_STAGING_TABLE = "tock_pg_embedding_staging"
+_COLUMNS = "id, collection_id, embedding, document, cmetadata"
+
+
+def ensure_collection(
+    engine: Engine, collection_name: str, embeddings: Embeddings, collection_metadata: Optional[dict] = None
+) -> None:
+    """
+    Creates a PGVector collection (and the PGVector extension and tables) if it doesn't exist yet, over a sync engine.
+    The async vector stores don't create their collection when built, so the bulk loads create it before copying.
+
+    Parameters
+    ----------
+    engine : Engine
+        The (sync) engine of the database.
+    collection_name : str
+        The name of the collection.
+    embeddings : Embeddings
+        The embedding model of the collection.
+    collection_metadata : Optional[dict]
+        The metadata of the collection, if it's created (default: None).
+    """
+    from langchain_postgres.vectorstores import PGVector
+
+    # A sync vector store creates the extension, the tables and its collection when built
+    PGVector(
+        embeddings=embeddings,
+        connection=engine,
+        collection_name=collection_name,
+        collection_metadata=collection_metadata,
+        use_jsonb=True,
+    )
+
+
+def copy_embeddings(
+    engine: Engine,
+    collection_name: str,
+    texts: List[str],
+    embeddings: List[List[float]],
+    metadatas: Optional[List[dict]] = None,
+    ids: Optional[List[str]] = None,
+    batch_size: int = 5000,
+    commit_size: int = 50000,
+) -> None:
+    """
+    Writes embeddings to a PGVector collection with `COPY` (binary format), much faster than `INSERT` statements.
+    Rows are copied to a temporary staging table, then merged into the embedding table: existing ids are updated, so
+    that a load can be run again after an interruption (and only the last of the rows sharing an id is written).
+
+    Parameters
+    ----------
+    engine : Engine
+        The (sync) engine of the database.
+    collection_name : str
+        The name of the collection, which must already exist.
+    texts : List[str]
+        The texts.
+    embeddings : List[List[float]]
+        The embeddings of the texts.
+    metadatas : Optional[List[dict]]
+        The metadata of the texts (default: None, empty metadata).
+    ids : Optional[List[str]]
+        The ids of the texts (default: None, random ids).
+    batch_size : int
+        Number of rows copied by a single `COPY` statement (default: 5000).
+    commit_size : int
+        Number of rows written by a single transaction (default: 50000).
+    """
+    from psycopg.types.json import Jsonb
+    from pgvector.psycopg import Vector, register_vector
+
+    ids = ids or [str(uuid.uuid4()) for _ in texts]
+    metadatas = metadatas or [{} for _ in texts]
+    # An id can only be merged once by a statement, the last row of each id is kept
+    rows = sorted({id_: i for i, id_ in enumerate(ids)}.values())
+    with engine.connect() as connection:
+        driver_connection = connection.connection.driver_connection
+        register_vector(driver_connection)
+        collection_id = connection.execute(
+            text(f"SELECT uuid FROM {COLLECTION_TABLE} WHERE name = :name"), {"name": collection_name}
+        ).scalar()
+        if collection_id is None:
+            raise ValueError(f"The PGVector collection {collection_name!r} doesn't exist.")
+        connection.execute(
+            text(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {_STAGING_TABLE} "
+                f"(LIKE {EMBEDDING_TABLE} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+        )
+        for commit_start in range(0, len(rows), commit_size):
+            commit_end = min(commit_start + commit_size, len(rows))
+            for start in range(commit_start, commit_end, batch_size):
+                end = min(start + batch_size, commit_end)
+                with driver_connection.cursor() as cursor:
+                    with cursor.copy(f"COPY {_STAGING_TABLE} ({_COLUMNS}) FROM STDIN WITH (FORMAT BINARY)") as copy:
+                        copy.set_types(["varchar", "uuid", "vector", "varchar", "jsonb"])
+                        for i in rows[start:end]:
+                            copy.write_row(
+                                (ids[i], collection_id, Vector(embeddings[i]), texts[i], Jsonb(metadatas[i]))
+                            )
+            connection.execute(
+                text(
+                    f"INSERT INTO {EMBEDDING_TABLE} ({_COLUMNS}) SELECT {_COLUMNS} FROM {_STAGING_TABLE} "
+                    "ON CONFLICT (id) DO UPDATE SET collection_id = EXCLUDED.collection_id, "
+                    "embedding = EXCLUDED.embedding, document = EXCLUDED.document, cmetadata = EXCLUDED.cmetadata"
+                )
+            )
+            connection.commit()
+            logger.debug("Copied %s embeddings to collection %s.", commit_end - commit_start, collection_name)
+
+
+def delete_embeddings(engine: Engine, collection_name: str, ids: List[str]) -> int:
+    """
+    Deletes embeddings of a PGVector collection by id, in a single statement.
+
+    Parameters
+    ----------
+    engine : Engine
+        The (sync) engine of the database.
+    collection_name : str
+        The name of the collection.
+    ids : List[str]
+        The ids of the embeddings.
+
+    Returns
+    -------
+    int
+        The number of deleted embeddings.
+    """
+    with engine.connect() as connection:
+        result = connection.execute(
+            text(
+                f"DELETE FROM {EMBEDDING_TABLE} e USING {COLLECTION_TABLE} c "
+                "WHERE e.collection_id = c.uuid AND c.name = :name AND e.id = ANY(:ids)"
+            ),
+            {"name": collection_name, "ids": list(ids)},
+        )
+        connection.commit()
+    return result.rowcount
+
+
+def fetch_metadata_values(
+    engine: Engine, collection_name: str, field: str, include_missing: bool = False
+) -> Dict[str, Any]:
+    """
+    Reads the values of a metadata field of all the embeddings of a PGVector collection, streaming the ids and the
+    field only (not the vectors nor the texts).
+
+    Parameters
+    ----------
+    engine : Engine
+        The (sync) engine of the database.
+    collection_name : str
+        The name of the collection.
+    field : str
+        The metadata field.
+    include_missing : bool
+        Whether the embeddings without the field are read too, with a None value (default: False, left out).
+
+    Returns
+    -------
+    Dict[str, Any]
+        The values of the field by embedding id.
+    """
+    condition = "" if include_missing else " AND e.cmetadata -> :field IS NOT NULL"
+    with engine.connect() as connection:
+        rows = connection.execution_options(stream_results=True, yield_per=10000).execute(
+            text(
+                f"SELECT e.id, e.cmetadata -> :field FROM {EMBEDDING_TABLE} e JOIN {COLLECTION_TABLE} c "
+                f"ON e.collection_id = c.uuid WHERE c.name = :name{condition}"
+            ),
+            {"name": collection_name, "field": field},
+        )
+        return {id_: value for id_, value in rows}
+
+
+def _pending_indexes(connection: Any) -> List[Tuple[str, str]]:
+    """Returns the (name, definition) of the indexes dropped by bulk loads and not built again yet."""
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {DEFERRED_INDEX_TABLE} " "(indexname text PRIMARY KEY, indexdef text NOT NULL)"
+        )
+    )
+    return [tuple(row) for row in connection.execute(text(f"SELECT indexname, indexdef FROM {DEFERRED_INDEX_TABLE}"))]
+
+
+def _build_indexes(connection: Any, indexes: List[Tuple[str, str]]) -> None:
+    """Builds the indexes which don't exist, and removes them from the pending indexes (index by index)."""
+    existing = set(
+        connection.execute(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table"),
+            {"table": EMBEDDING_TABLE},
+        ).scalars()
+    )
+    for name, definition in indexes:
+        if name not in existing:
+            logger.info("Building index %s.", name)
+            connection.execute(text(definition))
+        connection.execute(text(f"DELETE FROM {DEFERRED_INDEX_TABLE} WHERE indexname = :name"), {"name": name})
+        connection.commit()
+
+
+def restore_deferred_indexes(engine: Engine) -> List[str]:
+    """
+    Builds the indexes dropped by an interrupted bulk load (see `deferred_indexes`), whose definitions are kept in
+    the database until they are built again.
+
+    Parameters
+    ----------
+    engine : Engine
+        The (sync) engine of the database.
+
+    Returns
+    -------
+    List[str]
+        The names of the restored indexes.
+    """
+    with engine.connect() as connection:
+        pending = _pending_indexes(connection)
+        connection.commit()
+        _build_indexes(connection, pending)
+    return [name for name, _ in pending]
+
+
+@contextmanager
+def deferred_indexes(engine: Engine) -> Iterator[List[str]]:
+    """
+    Drops the secondary indexes of the embedding table (e.g. the metadata GIN index or a vector index) during a bulk
+    load, and builds them again afterwards: building an index once is much faster than updating it for each row.
+    Searches on the table are slower until the indexes are built again, for every collection.
+    The definitions of the dropped indexes are saved in the database with the drops, so that the indexes of an
+    interrupted load (e.g. a killed process) are built again by the next bulk load, along with its own.
+
+    Parameters
+    ----------
+    engine : Engine
+        The (sync) engine of the database.
+
+    Yields
+    ------
+    List[str]
+        The names of the dropped indexes.
+    """
+    with engine.connect() as connection:
+        pending = dict(_pending_indexes(connection))
+        indexes = connection.execute(
+            text(
+                "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() "
+                "AND tablename = :table AND indexname NOT IN "
+                "(SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass))"
+            ),
+            {"table": EMBEDDING_TABLE},
+        ).all()
+        for name, definition in indexes:
+            connection.execute(
+                text(
+                    f"INSERT INTO {DEFERRED_INDEX_TABLE} (indexname, indexdef) VALUES (:name, :definition) "
+                    "ON CONFLICT (indexname) DO UPDATE SET indexdef = EXCLUDED.indexdef"
+                ),
+                {"name": name, "definition": definition},
+            )
+            connection.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+            pending[name] = definition
+        connection.commit()
+    logger.info("Deferred the build of indexes %s.", list(pending))
+    try:
+        yield list(pending)
+    finally:
+        with engine.connect() as connection:
+            _build_indexes(connection, list(pending.items()))
+
+
+_OPERATOR_CLASSES = {"l2": "vector_l2_ops", "cosine": "vector_cosine_ops", "inner": "vector_ip_ops"}
+
+_DISTANCES = {"l2": "l2_distance", "cosine": "cosine_distance", "inner": "max_inner_product"}
+
+
+def _indexed_expression(vector_compression: Optional[str], distance_strategy: str, dimension: int) -> Tuple[str, str]:
+    """Returns the indexed expression of the embeddings and its operator class."""
+    if vector_compression == "halfvec":
+        return f"(CAST(embedding AS halfvec({dimension})))", _OPERATOR_CLASSES[distance_strategy].replace(
+            "vector", "halfvec"
+        )
+    if vector_compression == "bit":
+        return f"(CAST(binary_quantize(embedding) AS bit({dimension})))", "bit_hamming_ops"
+    return "embedding", _OPERATOR_CLASSES[distance_strategy]
+
+
+def compressed_distance(
+    column: Any, embedding: List[float], vector_compression: str, distance_strategy: str
+) -> ColumnElement:
+    """
+    Returns the distance between the compressed embeddings of a column and a query embedding, served by the index
+    built by `ensure_vector_index` with the same compression.
+
+    Parameters
+    ----------
+    column : Any
+        The embedding column.
+    embedding : List[float]
+        The query embedding.
+    vector_compression : str
+        The compression of the index (`halfvec` or `bit`).
+    distance_strategy : str
+        The distance strategy of the searches (`l2`, `cosine` or `inner`), the Hamming distance is used with `bit`.
+
+    Returns
+    -------
+    ColumnElement
+        The distance expression.
+    """
+    dimension = len(embedding)
+    query = cast(literal(embedding, VECTOR(dimension)), VECTOR(dimension))
+    if vector_compression == "halfvec":
+        return getattr(cast(column, HALFVEC(dimension)), _DISTANCES[distance_strategy])(cast(query, HALFVEC(dimension)))
+    if vector_compression == "bit":
+        return cast(func.binary_quantize(column), BIT(dimension)).hamming_distance(
+            cast(func.binary_quantize(query), BIT(dimension))
+        )
+    raise ValueError(f"Unsupported vector compression {vector_compression}.")
+
+
+def ensure_vector_index(engine: Engine, db_settings: PGVectorSetting, distance_strategy: str, dimension: int) -> str:
+    """
+    Creates the approximate nearest neighbour index of the embedding table configured by the settings, if it
+    doesn't exist yet (the index of a distance strategy is shared by every collection).
+    Indexed vectors must have a fixed dimension: an embedding column without dimension is converted to
+    `vector(dimension)`, which requires every embedding of the table to have this dimension. With a
+    `vector_compression`, the index is built on an expression casting the embeddings to `halfvec(dimension)` or to
+    their binary quantization `bit(dimension)`, while the table keeps the full precision embeddings.
+
+    Parameters
+    ----------
+    engine : Engine
+        The (sync) engine of the database.
+    db_settings : PGVectorSetting
+        The settings of the index (`index_type`, `m`, `ef_construction`, `lists`, `vector_compression`).
+    distance_strategy : str
+        The distance strategy of the searches (`l2`, `cosine` or `inner`).
+    dimension : int
+        The dimension of the embeddings.
+
+    Returns
+    -------
+    str
+        The name of the index.
+    """
+    if db_settings.index_type is None:
+        raise ValueError("No index_type is configured in the PGVector settings.")
+    if distance_strategy not in _OPERATOR_CLASSES:
+        raise ValueError(
+            f"Unsupported distance strategy {distance_strategy}, expected one of {list(_OPERATOR_CLASSES)}."
+        )
+    expression, operator_class = _indexed_expression(db_settings.vector_compression, distance_strategy, dimension)
+    if db_settings.index_type == "hnsw":
+        parameters = f"m = {db_settings.m}, ef_construction = {db_settings.ef_construction}"
+    else:
+        parameters = f"lists = {db_settings.lists}"
+    index_name = f"ix_{EMBEDDING_TABLE}_{db_settings.index_type}_{operator_class}"
+
+    with engine.connect() as connection:
+        # The casts of a compressed index fix the dimension of the indexed expression
+        if not db_settings.vector_compression:
+            current_dimension = connection.execute(
+                text(
+                    "SELECT atttypmod FROM pg_attribute "
+                    "WHERE attrelid = CAST(:table AS regclass) AND attname = 'embedding'"
+                ),
+                {"table": EMBEDDING_TABLE},
+            ).scalar()
+            if current_dimension is not None and current_dimension < 0:
+                logger.info("Setting the dimension of the embeddings of %s to %s.", EMBEDDING_TABLE, dimension)
+                connection.execute(
+                    text(f"ALTER TABLE {EMBEDDING_TABLE} ALTER COLUMN embedding TYPE vector({dimension})")
+                )
+            elif current_dimension != dimension:
+                raise ValueError(
+                    f"The embeddings of {EMBEDDING_TABLE} have {current_dimension} dimensions, not {dimension}."
+                )
+        logger.info("Ensuring index %s exists.", index_name)
+        connection.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {EMBEDDING_TABLE} "
+                f"USING {db_settings.index_type} ({expression} {operator_class}) WITH ({parameters})"
+            )
+        )
+        connection.commit()
+    return index_name
@@ -0,0 +1,280 @@
+import json
+import time
+import hashlib
+import logging
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from langchain_core.documents import Document
+
+from tock_genai_core.models.database import BaseVectorDBSetting, RetrievalCacheSetting
+from tock_genai_core.services.langchain.factory.registry import factory_registry, settings_fingerprint
+
+
+logger = logging.getLogger(__name__)
+
+_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+_in_cached_search: ContextVar[bool] = ContextVar("in_cached_search", default=False)
+"""Set while a cached search runs, so that the searches it delegates to (e.g. by vector) aren't cached again."""
+
+
+def index_key(db_settings: BaseVectorDBSetting) -> str:
+    """Returns the key identifying the index of the settings, shared by every vector store of this index."""
+    return (
+        f"{db_settings.provider.value}|{db_settings.db_url}|{getattr(db_settings, 'db_name', '')}|{db_settings.index}"
+    )
+
+
+def get_generation(index: str) -> int:
+    """Returns the generation of an index, incremented by every write to the index."""
+    return _generations.get(index, 0)
+
+
+def bump_generation(index: str) -> int:
+    """
+    Increments the generation of an index, which invalidates its cached search results at once.
+
+    Parameters
+    ----------
+    index : str
+        The key of the index (see `index_key`).
+
+    Returns
+    -------
+    int
+        The new generation of the index.
+    """
+    with _generations_lock:
+        _generations[index] = _generations.get(index, 0) + 1
+        return _generations[index]
+
+
+class RetrievalCache:
+    """
+    In-process cache of search results, with LRU eviction and time-to-live expiration.
+
+    Attributes
+    ----------
+    max_size : int
+        Maximum number of cached search results, the least recently used ones are evicted first.
+    ttl : Optional[float]
+        Time in seconds after which cached search results expire.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str) -> Optional[List[Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, results = entry
+            if self.ttl is not None and time.time() - created_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def update(self, key: str, results: List[Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def get_retrieval_cache(settings: Optional[RetrievalCacheSetting]) -> Optional[RetrievalCache]:
+    """
+    Returns the retrieval result cache configured by the settings.
+    Caches are memoized in the factory registry, so that every vector store configured with the same cache settings
+    shares the same cache (the entries of each index are keyed by the index).
+
+    Parameters
+    ----------
+    settings : Optional[RetrievalCacheSetting]
+        The retrieval cache settings.
+
+    Returns
+    -------
+    Optional[RetrievalCache]
+        The retrieval cache, or None if no cache is configured.
+    """
+    if settings is None:
+        return None
+    return factory_registry.get_or_create(
+        f"retrieval_cache:{settings_fingerprint(settings)}",
+        lambda: RetrievalCache(max_size=settings.max_size, ttl=settings.ttl),
+        settings,
+    )
+
+
+def _normalize_query(query: str) -> str:
+    """Normalizes the Unicode form and the whitespaces of a query, which don't change its meaning."""
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"{type(value).__name__} isn't a cacheable search parameter.")
+
+
+def _copy(results: List[Any]) -> List[Any]:
+    """Copies search results, so that the callers modifying the returned documents don't alter the cache."""
+    return [
+        (result[0].model_copy(deep=True), result[1]) if isinstance(result, tuple) else result.model_copy(deep=True)
+        for result in results
+    ]
+
+
+class RetrievalCacheMixin:
+    """
+    Mixin for vector stores caching their similarity searches in a retrieval cache.
+    Searches are cached by index, normalized query (or query vector rounded to single precision), `k`, filters and
+    other search parameters. The cache keys contain the generation of the index, incremented by every write through
+    the vector store: the results cached before a write are never served again (and are evicted as the least
+    recently used ones).
+    """
+
+    retrieval_cache: Optional[RetrievalCache] = None
+    """The cache of the search results."""
+    retrieval_index: Optional[str] = None
+    """The key of the index of the vector store."""
+
+    def _retrieval_key(
+        self, method: str, query: Union[str, List[float]], k: int, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Returns the cache key of a search, or None if the search isn't cached."""
+        if self.retrieval_cache is None or _in_cached_search.get():
+            return None
+        try:
+            params = json.dumps(kwargs, sort_keys=True, default=_jsonable)
+        except TypeError:
+            logger.debug("Search with uncacheable parameters, the retrieval cache is bypassed.", exc_info=True)
+            return None
+        if isinstance(query, str):
+            query_key = _normalize_query(query)
+        else:
+            query_key = hashlib.sha256(array("f", query).tobytes()).hexdigest()
+        generation = get_generation(self.retrieval_index)
+        return hashlib.sha256(
+            f"{self.retrieval_index}\x00{generation}\x00{method}\x00{query_key}\x00{k}\x00{params}".encode("utf-8")
+        ).hexdigest()
+
+    def _cached_search(
+        self, method: str, search: Callable[..., List[Any]], query: Any, k: int, kwargs: Dict[str, Any]
+    ) -> List[Any]:
+        key = self._retrieval_key(method, query, k, kwargs)
+        if key is None:
+            return search(query, k=k, **kwargs)
+        cached = self.retrieval_cache.lookup(key)
+        if cached is not None:
+            return _copy(cached)
+        token = _in_cached_search.set(True)
+        try:
+            results = search(query, k=k, **kwargs)
+        finally:
+            _in_cached_search.reset(token)
+        self.retrieval_cache.update(key, _copy(results))
+        return results
+
+    async def _acached_search(
+        self, method: str, search: Callable[..., Awaitable[List[Any]]], query: Any, k: int, kwargs: Dict[str, Any]
+    ) -> List[Any]:
+        # Async searches share the entries of the sync searches
+        key = self._retrieval_key(method, query, k, kwargs)
+        if key is None:
+            return await search(query, k=k, **kwargs)
+        cached = self.retrieval_cache.lookup(key)
+        if cached is not None:
+            return _copy(cached)
+        token = _in_cached_search.set(True)
+        try:
+            results = await search(query, k=k, **kwargs)
+        finally:
+            _in_cached_search.reset(token)
+        self.retrieval_cache.update(key, _copy(results))
+        return results
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return self._cached_search("similarity_search", super().similarity_search, query, k, kwargs)
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self._cached_search(
+            "similarity_search_with_score", super().similarity_search_with_score, query, k, kwargs
+        )
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return self._cached_search(
+            "similarity_search_by_vector", super().similarity_search_by_vector, embedding, k, kwargs
+        )
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return await self._acached_search("similarity_search", super().asimilarity_search, query, k, kwargs)
+
+    async def asimilarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return await self._acached_search(
+            "similarity_search_with_score", super().asimilarity_search_with_score, query, k, kwargs
+        )
+
+    async def asimilarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return await self._acached_search(
+            "similarity_search_by_vector", super().asimilarity_search_by_vector, embedding, k, kwargs
+        )
+
+    def _invalidate(self) -> None:
+        if self.retrieval_index is not None:
+            bump_generation(self.retrieval_index)
+
+    def add_texts(self, *args: Any, **kwargs: Any) -> List[str]:
+        try:
+            return super().add_texts(*args, **kwargs)
+        finally:
+            self._invalidate()
+
+    def add_embeddings(self, *args: Any, **kwargs: Any) -> List[str]:
+        try:
+            return super().add_embeddings(*args, **kwargs)
+        finally:
+            self._invalidate()
+
+    def delete(self, *args: Any, **kwargs: Any) -> Optional[bool]:
+        try:
+            return super().delete(*args, **kwargs)
+        finally:
+            self._invalidate()
+
+    async def aadd_texts(self, *args: Any, **kwargs: Any) -> List[str]:
+        try:
+            return await super().aadd_texts(*args, **kwargs)
+        finally:
+            self._invalidate()
+
+    async def aadd_embeddings(self, *args: Any, **kwargs: Any) -> List[str]:
+        try:
+            return await super().aadd_embeddings(*args, **kwargs)
+        finally:
+            self._invalidate()
+
+    async def adelete(self, *args: Any, **kwargs: Any) -> Optional[bool]:
+        try:
+            return await super().adelete(*args, **kwargs)
+        finally:
+            self._invalidate()
@@ -1,14 +1,29 @@
+import sys
+import base64
+import asyncio
 import logging
+import threading
+from array import array
 from urllib.parse import urljoin
-from typing import Union, List, Optional
+from weakref import WeakKeyDictionary
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Union, List, Optional
 
 import requests
-from pydantic import BaseModel
-from langchain.schema.embeddings import Embeddings
+from pydantic import BaseModel, PrivateAttr
+from langchain_core.embeddings import Embeddings
 
 logger = logging.getLogger(__name__)
 
 
+def _decode_float32(encoded: str) -> List[float]:
+    """Decodes base64 encoded little-endian float32 values, whatever the byte order of the host."""
+    values = array("f", base64.b64decode(encoded))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
+
+
 class InferenceRequest(BaseModel):
     """
     A model representing a request for inference, containing text and pooling settings.
@@ -76,3 +91,118 @@ class BloomzEmbeddings(BaseModel, Embeddings):
     def embed_query(self, text: str) -> List[float]:
         """Compute query embeddings using a HuggingFace transformer model."""
         return self.embed_documents([text])[0]
+
+
+class VLLMEmbeddings(BaseModel, Embeddings):
+    """
+    Embedding model calling the OpenAI-compatible embedding API of a vLLM server.
+    Unlike the OpenAI embedding wrappers, texts are sent as is (the server tokenizes them, no tiktoken on the client).
+    They are sent in batches of `batch_size` texts, `max_concurrency` batches at a time, with long-lived clients
+    reusing their connections.
+
+    Attributes
+    ----------
+    model : str
+        The model name.
+    api_base : str
+        The base URL of the vLLM OpenAI-compatible API.
+    api_key : str
+        The API key (default: "EMPTY").
+    batch_size : int
+        Maximum number of texts sent in a single request.
+    max_concurrency : int
+        Maximum number of requests sent at the same time.
+    base64 : bool
+        Whether the embeddings are returned as base64 encoded floats, smaller and faster to decode than JSON lists.
+    timeout : Optional[float]
+        Maximum time in seconds of a request.
+    headers : Dict[str, str]
+        The headers sent with each request.
+
+    Methods
+    -------
+    embed_documents(texts: List[str]) -> List[List[float]]
+        Computes the embeddings of texts.
+
+    embed_query(text: str) -> List[float]
+        Computes the embedding of a query.
+    """
+
+    model: str
+    api_base: str
+    api_key: str = "EMPTY"
+    batch_size: int = 64
+    max_concurrency: int = 4
+    base64: bool = True
+    timeout: Optional[float] = None
+    headers: Dict[str, str] = {}
+
+    _client: Any = PrivateAttr(default=None)
+    # The async clients are bound to the event loop of their connections, one client is kept per event loop
+    _async_clients: Any = PrivateAttr(default_factory=WeakKeyDictionary)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _options(self) -> Dict[str, Any]:
+        return dict(base_url=self.api_base, api_key=self.api_key, timeout=self.timeout, default_headers=self.headers)
+
+    def model_post_init(self, __context: Any) -> None:
+        from openai import OpenAI
+
+        self._client = OpenAI(**self._options)
+
+    def _get_async_client(self) -> Any:
+        from openai import AsyncOpenAI
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed():
+                client = self._async_clients[loop] = AsyncOpenAI(**self._options)
+            return client
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    def _parse(self, response: Any) -> List[List[float]]:
+        data = sorted(response.data, key=lambda item: item.index)
+        if not self.base64:
+            return [item.embedding for item in data]
+        return [_decode_float32(item.embedding) for item in data]
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        response = self._client.embeddings.create(
+            model=self.model, input=batch, encoding_format="base64" if self.base64 else "float"
+        )
+        return self._parse(response)
+
+    async def _aembed_batch(self, batch: List[str], semaphore: asyncio.Semaphore) -> List[List[float]]:
+        async with semaphore:
+            response = await self._get_async_client().embeddings.create(
+                model=self.model, input=batch, encoding_format="base64" if self.base64 else "float"
+            )
+        return self._parse(response)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Computes the embeddings of texts."""
+        batches = self._batches(texts)
+        if len(batches) <= 1 or self.max_concurrency <= 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                results = list(executor.map(self._embed_batch, batches))
+        return [embedding for result in results for embedding in result]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Computes the embeddings of texts asynchronously."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._aembed_batch(batch, semaphore) for batch in self._batches(texts)))
+        return [embedding for result in results for embedding in result]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Computes the embedding of a query."""
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Computes the embedding of a query asynchronously."""
+        return (await self.aembed_documents([text]))[0]
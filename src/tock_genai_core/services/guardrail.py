@@ -1,9 +1,12 @@
 import random
+import asyncio
 import requests
 from urllib.parse import urljoin
 from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 
 from pydantic import BaseModel
+from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.output_parsers.transform import BaseCumulativeTransformOutputParser
 
 
@@ -125,3 +128,105 @@ class BloomzGuardrailOutputParser(BaseCumulativeTransformOutputParser[dict]):
             output_toxicity=bool(detected_toxicities),
             output_toxicity_reason=list(map(lambda mode: mode["label"], detected_toxicities)),
         ).model_dump()
+
+
+class CompositeGuardrailOutputParser(BaseCumulativeTransformOutputParser[dict]):
+    """
+    Parser running several guardrail output parsers concurrently on the same text.
+    The reasons returned by the guardrails are merged, and the verdict is returned as soon as one of them
+    flags the text as toxic. The guardrails still pending at that point are cancelled.
+
+    Attributes
+    ----------
+    parsers : List[BaseOutputParser]
+        The guardrail output parsers to run. Each of them must return a `GuardrailOutput` dump.
+
+    max_workers : Optional[int]
+        Maximum number of guardrails running at the same time. Defaults to the number of parsers.
+
+    timeout : Optional[float]
+        Maximum time in seconds to wait for the guardrails verdict. Defaults to `None` (no timeout).
+
+    diff : bool
+        A flag to indicate whether or not to compute differences between consecutive outputs. Defaults to `True`.
+
+    Methods
+    -------
+    parse(text: str) -> dict
+        Runs the guardrails in threads and returns the merged `GuardrailOutput` dump.
+
+    aparse(text: str) -> dict
+        Runs the guardrails as asyncio tasks and returns the merged `GuardrailOutput` dump.
+    """
+
+    parsers: List[BaseOutputParser]
+    """The guardrail output parsers to run."""
+    max_workers: Optional[int] = None
+    """Maximum number of guardrails running at the same time."""
+    timeout: Optional[float] = None
+    """Maximum time in seconds to wait for the guardrails verdict."""
+    diff: bool = True
+
+    @property
+    def _type(self) -> str:
+        """Return the output parser type for serialization."""
+        return "composite_guardrail"
+
+    def _diff(self, prev: Optional[dict], next: dict) -> dict:
+        """Calculate the difference between the previous and current output, if applicable."""
+        output = next.copy()
+        if prev:
+            output["content"] = next["content"][len(prev["content"]) :]
+        return output
+
+    @staticmethod
+    def _merge(result: dict, reasons: List[str]) -> bool:
+        """Add the reasons of a guardrail result to the merged reasons and return whether it flagged the text."""
+        for reason in result.get("output_toxicity_reason") or []:
+            if reason not in reasons:
+                reasons.append(reason)
+        return bool(result.get("output_toxicity"))
+
+    def parse(self, text: str) -> dict:
+        """Run the guardrails concurrently and stop at the first one flagging the text."""
+        reasons = []
+        toxicity = False
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers or len(self.parsers))
+        try:
+            futures = [executor.submit(parser.parse, text) for parser in self.parsers]
+            for future in as_completed(futures, timeout=self.timeout):
+                if self._merge(future.result(), reasons):
+                    toxicity = True
+                    break
+        except FutureTimeoutError as e:
+            raise RuntimeError("Composite guardrail didn't respond in time.") from e
+        finally:
+            # Cancel the guardrails that have not started yet, and don't wait for the running ones.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return GuardrailOutput(content=text, output_toxicity=toxicity, output_toxicity_reason=reasons).model_dump()
+
+    async def aparse(self, text: str) -> dict:
+        """Run the guardrails as asyncio tasks and stop at the first one flagging the text."""
+        reasons = []
+        toxicity = False
+        semaphore = asyncio.Semaphore(self.max_workers or len(self.parsers))
+
+        async def run(parser: BaseOutputParser) -> dict:
+            async with semaphore:
+                return await parser.aparse(text)
+
+        tasks = [asyncio.ensure_future(run(parser)) for parser in self.parsers]
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=self.timeout):
+                if self._merge(await next_done, reasons):
+                    toxicity = True
+                    break
+        except asyncio.TimeoutError as e:
+            raise RuntimeError("Composite guardrail didn't respond in time.") from e
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return GuardrailOutput(content=text, output_toxicity=toxicity, output_toxicity_reason=reasons).model_dump()
@@ -0,0 +1,399 @@
+import os
+import json
+import time
+import queue
+import hashlib
+import logging
+import threading
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from pydantic import BaseModel, Field
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from tock_genai_core.services.langchain.factory import get_em_factory
+from tock_genai_core.services.langchain.factory.factories import VectorDBFactory
+from tock_genai_core.services.rate_limit import estimate_tokens
+
+
+logger = logging.getLogger(__name__)
+
+Chunk = Tuple[str, str, Document]
+"""A chunk, as a (document id, chunk id, chunk) triple."""
+
+_END = object()
+"""Marks the end of the write queue."""
+
+CONTENT_HASH_FIELD = "content_hash"
+"""The metadata field holding the content hash of the chunks written by an incremental ingestion."""
+
+
+class StageStats(BaseModel):
+    """
+    The statistics of a stage of the ingestion pipeline.
+
+    Attributes
+    ----------
+    items : int
+        Number of items processed by the stage (documents for the chunking, chunks for the other stages).
+    busy_time : float
+        Time in seconds spent processing, summed over the workers of the stage.
+    """
+
+    items: int = 0
+    busy_time: float = 0.0
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Items processed per second of processing, by a single worker."""
+        return self.items / self.busy_time if self.busy_time else None
+
+
+class IngestionReport(BaseModel):
+    """
+    The report of an ingestion.
+
+    Attributes
+    ----------
+    documents : int
+        Number of documents read.
+    skipped : int
+        Number of documents already ingested by a previous run, and not ingested again.
+    chunks : int
+        Number of chunks written to the vector store.
+    unchanged : int
+        Number of chunks whose content hash didn't change since the previous run, and not written again.
+    deleted : int
+        Number of chunks no longer in the documents, deleted from the vector store.
+    duration : float
+        Time in seconds spent ingesting.
+    chunking : StageStats
+        Statistics of the chunking stage.
+    embedding : StageStats
+        Statistics of the embedding stage.
+    writing : StageStats
+        Statistics of the writing stage.
+    """
+
+    documents: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    duration: float = 0.0
+    chunking: StageStats = Field(default_factory=StageStats)
+    embedding: StageStats = Field(default_factory=StageStats)
+    writing: StageStats = Field(default_factory=StageStats)
+
+
+def _load_checkpoint(checkpoint_path: Optional[str]) -> Set[str]:
+    """Returns the ids of the documents ingested by previous runs."""
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, encoding="utf-8") as checkpoint:
+        return {line.rstrip("\n") for line in checkpoint if line.endswith("\n")}
+
+
+def _ends_with_partial_line(checkpoint_path: str) -> bool:
+    """Returns whether the checkpoint file ends with a line truncated by an interrupted run."""
+    if not os.path.exists(checkpoint_path) or os.path.getsize(checkpoint_path) == 0:
+        return False
+    with open(checkpoint_path, "rb") as checkpoint:
+        checkpoint.seek(-1, os.SEEK_END)
+        return checkpoint.read(1) != b"\n"
+
+
+def _document_id(position: int, document: Document) -> str:
+    """Returns the id of a document, or its position in the ingested documents if it has none."""
+    return str(document.id) if document.id is not None else str(position)
+
+
+def content_hash(chunk: Document) -> str:
+    """Returns the hash of the text and metadata of a chunk, which changes when the chunk must be written again."""
+    metadata = {key: value for key, value in chunk.metadata.items() if key != CONTENT_HASH_FIELD}
+    payload = json.dumps([chunk.page_content, metadata], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _content_chunk_ids(document_id: str, chunks: List[Document]) -> List[Tuple[str, Document]]:
+    """
+    Sets the content hash of the chunks of a document, and derives their ids from it (`<document id>:<hash prefix>`,
+    suffixed with the occurrence of the chunks repeated in the document), so that an unchanged chunk keeps its id
+    wherever it moves in the document.
+    """
+    occurrences: Dict[str, int] = {}
+    pieces = []
+    for chunk in chunks:
+        digest = chunk.metadata[CONTENT_HASH_FIELD] = content_hash(chunk)
+        occurrence = occurrences[digest] = occurrences.get(digest, 0) + 1
+        suffix = f"-{occurrence}" if occurrence > 1 else ""
+        pieces.append((f"{document_id}:{digest[:16]}{suffix}", chunk))
+    return pieces
+
+
+def _batched(items: Iterator[Chunk], size: int) -> Iterator[List[Chunk]]:
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+class _Progress:
+    """
+    Tracks the chunks of each document still to be written, and appends the documents whose chunks are all written
+    to the checkpoint file.
+    """
+
+    def __init__(self, checkpoint_path: Optional[str]):
+        self._remaining: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._checkpoint = None
+        if checkpoint_path:
+            truncated = _ends_with_partial_line(checkpoint_path)
+            self._checkpoint = open(checkpoint_path, "a", encoding="utf-8")
+            if truncated:
+                # Completes the last line of an interrupted run
+                self._checkpoint.write("\n")
+
+    def expect(self, document_id: str, chunks: int) -> None:
+        if not chunks:
+            # Nothing to write for an empty document
+            self._save([document_id])
+            return
+        with self._lock:
+            self._remaining[document_id] = self._remaining.get(document_id, 0) + chunks
+
+    def written(self, document_ids: Iterable[str]) -> None:
+        completed = []
+        with self._lock:
+            for document_id in document_ids:
+                self._remaining[document_id] -= 1
+                if not self._remaining[document_id]:
+                    del self._remaining[document_id]
+                    completed.append(document_id)
+        self._save(completed)
+
+    def _save(self, document_ids: List[str]) -> None:
+        if self._checkpoint is not None and document_ids:
+            self._checkpoint.write("".join(f"{document_id}\n" for document_id in document_ids))
+            self._checkpoint.flush()
+
+    def close(self) -> None:
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+
+
+def ingest_documents(
+    factory: VectorDBFactory,
+    documents: Iterable[Document],
+    checkpoint_path: Optional[str] = None,
+    chunk_size: int = 512,
+    chunk_overlap: int = 64,
+    embedding_batch_size: int = 64,
+    embedding_concurrency: int = 4,
+    write_batch_size: int = 500,
+    queue_size: int = 8,
+    length_function: Optional[Callable[[str], int]] = None,
+    incremental: bool = False,
+) -> IngestionReport:
+    """
+    Ingests documents in the vector store of a factory, streaming them through three stages:
+    - chunking: documents are split into chunks of at most `chunk_size` tokens;
+    - embedding: chunks are embedded in batches of `embedding_batch_size`, `embedding_concurrency` batches at a time;
+    - writing: embedded chunks are written to the vector store in batches of `write_batch_size`.
+    The stages are connected by bounded queues, so that a slow stage slows down the previous ones (backpressure)
+    instead of accumulating chunks in memory. Chunks have deterministic ids (`<document id>:<position>`), so
+    ingesting a document again overwrites its chunks.
+    With a `checkpoint_path`, the ids of the documents whose chunks are all written are appended to the checkpoint
+    file, and the documents already in the checkpoint are skipped: an interrupted job resumes where it stopped.
+    With `incremental`, the chunks are written with the hash of their content in their metadata, and identified by
+    it (`<document id>:<hash prefix>`) instead of their position. The hashes of the chunks already in the vector
+    store are read at once, and only the new or changed chunks are embedded and written, even when a change moves
+    the following chunks. The documents must then be the whole source: once they are all written, the chunks with a
+    content hash that the documents no longer produce (removed or changed documents) are deleted, as well as the
+    chunks of the ingested documents written by a previous run without `incremental` (by position).
+    The ingestion runs within the `bulk_load` of the factory (e.g. deferring the index builds).
+
+    Parameters
+    ----------
+    factory : VectorDBFactory
+        The factory of the vector store, whose embedding settings are used to embed the chunks.
+    documents : Iterable[Document]
+        The documents, read lazily. Documents are identified by their `id`, or by their position if they have none.
+    checkpoint_path : Optional[str]
+        Path of the checkpoint file (default: None, no checkpoint).
+    chunk_size : int
+        Maximum number of tokens of a chunk (default: 512).
+    chunk_overlap : int
+        Number of tokens shared by consecutive chunks (default: 64).
+    embedding_batch_size : int
+        Number of chunks embedded in a single call (default: 64).
+    embedding_concurrency : int
+        Maximum number of embedding calls at the same time (default: 4).
+    write_batch_size : int
+        Number of chunks written to the vector store in a single call (default: 500).
+    queue_size : int
+        Maximum number of batches waiting between two stages (default: 8).
+    length_function : Optional[Callable[[str], int]]
+        Counts the tokens of a text (default: None, tiktoken with the encoding of the embedding model). Use the
+        tokenizer of the embedding model for exact counts.
+    incremental : bool
+        Whether only the new or changed chunks are written, and the chunks no longer in the documents deleted
+        (default: False).
+
+    Returns
+    -------
+    IngestionReport
+        The report of the ingestion.
+    """
+    start = time.perf_counter()
+    report = IngestionReport()
+    stats_lock = threading.Lock()
+    done = _load_checkpoint(checkpoint_path)
+    progress = _Progress(checkpoint_path)
+    embeddings = get_em_factory(factory.em_settings).get_model()
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=length_function or (lambda text: estimate_tokens([text], factory.em_settings.model)),
+    )
+    write_queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    errors: List[BaseException] = []
+    # The content hashes of the chunks in the vector store (None for the chunks written by a run without
+    # `incremental`), the chunks still produced by the documents, and the documents chunked again
+    existing: Dict[str, Optional[str]] = (
+        factory.get_metadata_values(CONTENT_HASH_FIELD, include_missing=True) if incremental else {}
+    )
+    seen: Set[str] = set()
+    chunked: Set[str] = set()
+    existing_by_document: Dict[str, List[str]] = {}
+    if done:
+        for chunk_id in existing:
+            existing_by_document.setdefault(chunk_id.rpartition(":")[0], []).append(chunk_id)
+
+    def chunks() -> Iterator[Chunk]:
+        for position, document in enumerate(documents):
+            report.documents += 1
+            document_id = _document_id(position, document)
+            if document_id in done:
+                report.skipped += 1
+                # The chunks of the document were written by a previous run, and must not be deleted
+                seen.update(existing_by_document.get(document_id, []))
+                continue
+            chunk_start = time.perf_counter()
+            splits = splitter.split_documents([document])
+            pieces = [(f"{document_id}:{index}", piece) for index, piece in enumerate(splits)]
+            if incremental:
+                chunked.add(document_id)
+                pieces = _content_chunk_ids(document_id, splits)
+                seen.update(chunk_id for chunk_id, _ in pieces)
+                changed = [
+                    (chunk_id, piece)
+                    for chunk_id, piece in pieces
+                    if existing.get(chunk_id) != piece.metadata[CONTENT_HASH_FIELD]
+                ]
+                report.unchanged += len(pieces) - len(changed)
+                pieces = changed
+            report.chunking.items += 1
+            report.chunking.busy_time += time.perf_counter() - chunk_start
+            progress.expect(document_id, len(pieces))
+            for chunk_id, piece in pieces:
+                yield document_id, chunk_id, piece
+
+    def embed(batch: List[Chunk]) -> None:
+        embed_start = time.perf_counter()
+        vectors = embeddings.embed_documents([chunk.page_content for _, _, chunk in batch])
+        with stats_lock:
+            report.embedding.items += len(batch)
+            report.embedding.busy_time += time.perf_counter() - embed_start
+        # Blocks while the write queue is full
+        write_queue.put((batch, vectors))
+
+    def write(batch: List[Chunk], vectors: List[List[float]]) -> None:
+        write_start = time.perf_counter()
+        factory.write_embeddings(
+            texts=[chunk.page_content for _, _, chunk in batch],
+            embeddings=vectors,
+            metadatas=[chunk.metadata for _, _, chunk in batch],
+            ids=[chunk_id for _, chunk_id, _ in batch],
+        )
+        report.writing.items += len(batch)
+        report.writing.busy_time += time.perf_counter() - write_start
+        report.chunks += len(batch)
+        progress.written(document_id for document_id, _, _ in batch)
+
+    def writer() -> None:
+        batch: List[Chunk] = []
+        vectors: List[List[float]] = []
+        try:
+            while True:
+                item = write_queue.get()
+                if item is _END:
+                    break
+                batch.extend(item[0])
+                vectors.extend(item[1])
+                while len(batch) >= write_batch_size:
+                    write(batch[:write_batch_size], vectors[:write_batch_size])
+                    batch, vectors = batch[write_batch_size:], vectors[write_batch_size:]
+            if batch:
+                write(batch, vectors)
+        except BaseException as e:
+            errors.append(e)
+            # Keeps consuming the queue, so that the embedding workers don't block
+            while write_queue.get() is not _END:
+                pass
+
+    with factory.bulk_load():
+        writer_thread = threading.Thread(target=writer, name="ingestion-writer", daemon=True)
+        writer_thread.start()
+        pending: Set[Future] = set()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=embedding_concurrency, thread_name_prefix="ingestion-embedding"
+            ) as executor:
+                for batch in _batched(chunks(), embedding_batch_size):
+                    # Bounds the batches held in memory to the ones being embedded
+                    if len(pending) >= embedding_concurrency + queue_size:
+                        completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in completed:
+                            future.result()
+                    if errors:
+                        raise errors[0]
+                    pending.add(executor.submit(embed, batch))
+                for future in wait(pending).done:
+                    future.result()
+        finally:
+            write_queue.put(_END)
+            writer_thread.join()
+            progress.close()
+        if errors:
+            raise errors[0]
+        if incremental:
+            # The chunks without a content hash are only replaced for the documents chunked again
+            stale = [
+                chunk_id
+                for chunk_id, digest in existing.items()
+                if chunk_id not in seen and (digest is not None or chunk_id.rpartition(":")[0] in chunked)
+            ]
+            for start in range(0, len(stale), write_batch_size):
+                factory.delete_embeddings(stale[start : start + write_batch_size])
+            report.deleted = len(stale)
+
+    report.duration = time.perf_counter() - start
+    logger.info(
+        "Ingestion of %s documents (%s chunks) done in %.3fs (%s skipped, %s chunks unchanged, %s deleted), "
+        "throughput: chunking %s docs/s, embedding %s chunks/s, writing %s chunks/s.",
+        report.documents,
+        report.chunks,
+        report.duration,
+        report.skipped,
+        report.unchanged,
+        report.deleted,
+        report.chunking.throughput,
+        report.embedding.throughput,
+        report.writing.throughput,
+    )
+    return report
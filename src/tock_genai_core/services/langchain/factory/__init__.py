@@ -6,3 +6,4 @@ from .db_factory import get_vector_db_factory
 from .em_factory import get_em_factory
 from .guardrail_factory import get_guardrail_factory
 from .llm_factory import get_llm_factory
+from .registry import factory_registry
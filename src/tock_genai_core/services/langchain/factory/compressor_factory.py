@@ -1,7 +1,5 @@
 from tock_genai_core.services.langchain.factory.factories import CompressorFactory
-from tock_genai_core.services.langchain.factory.contextual_compressor import (
-    BloomzCompressorFactory,
-)
+from tock_genai_core.services.langchain.factory import contextual_compressor as compressor_factories
 from tock_genai_core.models.contextual_compressor import (
     BaseCompressorSetting,
     ContextualCompressorProvider,
@@ -23,4 +21,4 @@ def get_compressor_factory(settings: BaseCompressorSetting) -> CompressorFactory
         An instance of the corresponding compressor factory for the specified provider.
     """
     if settings.provider == ContextualCompressorProvider.BloomZ:
-        return BloomzCompressorFactory(settings=settings)
+        return compressor_factories.BloomzCompressorFactory(settings=settings)
@@ -1,4 +1,12 @@
 # -*- coding: utf-8 -*-
 """Initialisation de module(s)."""
 
-from .bloomz_compressor_factory import BloomzCompressorFactory
+from tock_genai_core.utils.lazy_import import lazy_getattr
+
+# The factories (and their provider SDKs) are only imported when first used.
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "BloomzCompressorFactory": ".bloomz_compressor_factory",
+    },
+)
@@ -1,10 +1,12 @@
-from langchain.retrievers.document_compressors.base import BaseDocumentCompressor
+from langchain_core.documents import BaseDocumentCompressor
 
 from tock_genai_core.services.compressor import BloomzRerank
 from tock_genai_core.models.contextual_compressor import BloomZCompressorSetting
 from tock_genai_core.services.langchain.factory.factories import (
     CompressorFactory,
 )
+from tock_genai_core.services.admission import admission_controlled
+from tock_genai_core.services.langchain.factory.registry import memoized
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
 
@@ -22,14 +24,18 @@ class BloomzCompressorFactory(CompressorFactory):
 
     settings: BloomZCompressorSetting
 
+    @memoized
     def get_compressor(self) -> BaseDocumentCompressor:
         """
         Returns a `BloomzRerank` compressor instance configured with the provided settings.
         """
-        return BloomzRerank(
-            min_score=self.settings.min_score,
-            endpoint=self.settings.endpoint,
-            max_documents=self.settings.max_documents,
-            label=self.settings.label,
-            api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else None,
+        return admission_controlled(
+            BloomzRerank(
+                min_score=self.settings.min_score,
+                endpoint=self.settings.endpoint,
+                max_documents=self.settings.max_documents,
+                label=self.settings.label,
+                api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else None,
+            ),
+            self.settings,
         )
@@ -1,5 +1,15 @@
 # -*- coding: utf-8 -*-
 """Initialisation de module(s)."""
 
-from .opensearch_factory import OpenSearchFactory
-from .pgvector_factory import PGVectorFactory
+from tock_genai_core.utils.lazy_import import lazy_getattr
+
+# The factories (and their provider SDKs) are only imported when first used.
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "OpenSearchFactory": ".opensearch_factory",
+        "PGVectorFactory": ".pgvector_factory",
+        "FanOutFactory": ".fan_out_factory",
+        "LocalFactory": ".local_factory",
+    },
+)
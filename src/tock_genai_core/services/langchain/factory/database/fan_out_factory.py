@@ -0,0 +1,44 @@
+from langchain_core.vectorstores import VectorStore
+
+from tock_genai_core.models.database import FanOutSetting
+from tock_genai_core.models.embedding import EMSetting
+from tock_genai_core.services.langchain.factory.factories import VectorDBFactory
+from tock_genai_core.services.langchain.factory.registry import memoized
+from tock_genai_core.services.langchain.factory.em_factory import get_em_factory
+from tock_genai_core.services.database.fan_out import FanOutVectorStore
+
+
+class FanOutFactory(VectorDBFactory):
+    """
+    Factory class for creating fan-out vector stores.
+    This class is responsible for instantiating a `FanOutVectorStore` object, building one vector store per source
+    defined in the `FanOutSetting` class, with the embedding model defined in the `EMSetting` class.
+
+    Attributes
+    ----------
+    db_settings : FanOutSetting
+        The settings used to configure the sources of the fan-out vector store.
+
+    em_settings : EMSetting
+        The settings used to configure the embedding model shared by the sources.
+    """
+
+    db_settings: FanOutSetting
+    em_settings: EMSetting
+
+    @memoized
+    def get_vector_store(self) -> VectorStore:
+        """
+        Returns a FanOutVectorStore instance searching the vector stores of the configured sources.
+        """
+        # Imported here to avoid a circular import with the vector store factory dispatcher.
+        from tock_genai_core.services.langchain.factory.db_factory import get_vector_db_factory
+
+        return FanOutVectorStore(
+            stores=[
+                get_vector_db_factory(settings, self.em_settings).get_vector_store()
+                for settings in self.db_settings.sources
+            ],
+            embedding=get_em_factory(settings=self.em_settings).get_model(),
+            timeout=self.db_settings.timeout,
+        )
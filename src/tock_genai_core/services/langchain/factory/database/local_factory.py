@@ -0,0 +1,127 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.vectorstores import VectorStore
+
+from tock_genai_core.models.database import LocalSetting
+from tock_genai_core.models.embedding import EMSetting
+from tock_genai_core.services.langchain.factory.factories import VectorDBFactory
+from tock_genai_core.services.langchain.factory.registry import settings_fingerprint
+from tock_genai_core.services.langchain.factory.em_factory import get_em_factory
+from tock_genai_core.services.database.local import LocalVectorStore
+
+# The local vector stores hold their vectors, so they are kept for the life of the process instead of being memoized
+# in the factory registry, whose least recently used instances are evicted.
+_stores: Dict[str, LocalVectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+class LocalFactory(VectorDBFactory):
+    """
+    Factory class for creating local vector stores.
+    This class is responsible for instantiating a `LocalVectorStore` object, loaded from the snapshot of the
+    `LocalSetting` class if it exists, with the embedding model defined in the `EMSetting` class.
+
+    Attributes
+    ----------
+    db_settings : LocalSetting
+        The settings used to configure the local vector store and its snapshot.
+
+    em_settings : EMSetting
+        The settings used to configure the embedding model for the local vector store.
+    """
+
+    db_settings: LocalSetting
+    em_settings: EMSetting
+
+    @property
+    def _store_key(self) -> str:
+        return f"{settings_fingerprint(self.db_settings)}:{settings_fingerprint(self.em_settings)}"
+
+    @property
+    def _snapshot_name(self) -> str:
+        return self.db_settings.index or "vectors"
+
+    def get_vector_store(self) -> VectorStore:
+        """
+        Returns the LocalVectorStore instance of the settings, shared by the factories of the same settings.
+        """
+        with _stores_lock:
+            if self._store_key not in _stores:
+                _stores[self._store_key] = self._build_vector_store()
+            return _stores[self._store_key]
+
+    def reload(self) -> None:
+        """
+        Reloads the vector store from the snapshot of the settings (e.g. in the read-only workers, after an ingestion).
+        """
+        vector_store = self._build_vector_store()
+        with _stores_lock:
+            _stores[self._store_key] = vector_store
+
+    def _build_vector_store(self) -> LocalVectorStore:
+        """Loads the vector store from the snapshot of the settings if it exists, or creates an empty one."""
+        params = dict(
+            embedding=get_em_factory(settings=self.em_settings).get_model(),
+            hnsw_threshold=self.db_settings.hnsw_threshold,
+            m=self.db_settings.m,
+            ef_construction=self.db_settings.ef_construction,
+            ef_search=self.db_settings.ef_search,
+            read_only=self.db_settings.read_only,
+        )
+        path = self.db_settings.path
+        if path and os.path.exists(os.path.join(path, f"{self._snapshot_name}.json")):
+            return LocalVectorStore.load(path, name=self._snapshot_name, **params)
+        if self.db_settings.read_only:
+            raise FileNotFoundError(f"No snapshot {self._snapshot_name} of the local vector store in {path}.")
+        return LocalVectorStore(metric=self.em_settings.space_type or "cosine", **params)
+
+    def write_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Writes texts with their precomputed embeddings to the vector store (existing ids are overwritten).
+        """
+        self.get_vector_store().add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids)
+
+    def delete_embeddings(self, ids: List[str]) -> None:
+        """
+        Deletes texts and their embeddings from the vector store by id.
+        """
+        self.get_vector_store().delete(ids)
+
+    def get_metadata_values(self, field: str, include_missing: bool = False) -> Dict[str, Any]:
+        """
+        Reads the values of a metadata field of all the texts of the vector store, by id (None for the texts without
+        the field, if `include_missing` is set).
+        """
+        return self.get_vector_store().metadata_values(field, include_missing=include_missing)
+
+    def ensure_index(self, dimension: Optional[int] = None) -> None:
+        """
+        Builds the HNSW graph of the vector store, if it holds `hnsw_threshold` vectors.
+        """
+        self.get_vector_store().build_index()
+
+    def snapshot(self) -> None:
+        """
+        Saves the vector store to the snapshot of the settings, if `path` is set.
+        """
+        if self.db_settings.path:
+            self.get_vector_store().snapshot(self.db_settings.path, name=self._snapshot_name)
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """
+        Builds the HNSW graph and saves the snapshot after a successful load, so that the read-only workers can load
+        the loaded vectors.
+        """
+        yield
+        self.ensure_index()
+        self.snapshot()
@@ -1,11 +1,116 @@
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import PrivateAttr
+
+from langchain_core.runnables.config import run_in_executor
 from langchain_core.vectorstores import VectorStore
 from langchain_community.vectorstores.opensearch_vector_search import OpenSearchVectorSearch
 
 from tock_genai_core.models.database import OpenSearchSetting
 from tock_genai_core.models.embedding import EMSetting
 from tock_genai_core.services.langchain.factory.factories import VectorDBFactory
+from tock_genai_core.services.langchain.factory.registry import memoized
 from tock_genai_core.services.langchain.factory.em_factory import get_em_factory
-from tock_genai_core.services.security.security_service import fetch_secret_key_value
+from tock_genai_core.services.database.metadata_filter import is_metadata_filter, to_opensearch_filter
+from tock_genai_core.services.database.retrieval_cache import (
+    RetrievalCacheMixin,
+    bump_generation,
+    get_retrieval_cache,
+    index_key,
+)
+from tock_genai_core.services.database.opensearch import (
+    bulk_index_settings,
+    ensure_index,
+    fetch_metadata_values,
+    get_async_db_client,
+    get_db_client,
+    parallel_bulk_delete,
+    parallel_bulk_embeddings,
+    quantize_to_bytes,
+    relevance_score_fn,
+)
+
+
+class ManagedOpenSearchVectorSearch(RetrievalCacheMixin, OpenSearchVectorSearch):
+    """
+    OpenSearchVectorSearch vector store also accepting lists of MetadataFilter as search `filter`, compiled into a
+    `bool` query (an efficient k-NN filter with the Lucene and Faiss engines), and caching its searches in the
+    retrieval cache of the settings. With a `byte_scale`, the embeddings are quantized to byte vectors when written
+    and searched. Relevance scores are on the scale of the other vector stores, whatever the engine.
+    """
+
+    byte_scale: Optional[float] = None
+    """Factor applied to the embeddings before rounding them to bytes, for an index of byte vectors."""
+    space_type: str = "l2"
+    """The space type of the index, which defines the scoring formula of the k-NN scores."""
+    client_settings: Optional[OpenSearchSetting] = None
+    """The settings of the clients, whose async client is the one of the running event loop."""
+
+    @property
+    def async_client(self) -> Any:
+        # An async client is bound to an event loop, the client of the running loop is used
+        if self.client_settings is None:
+            return self._async_client
+        return get_async_db_client(self.client_settings)
+
+    @async_client.setter
+    def async_client(self, client: Any) -> None:
+        self._async_client = client
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return relevance_score_fn(self.space_type, self.engine, self.byte_scale)
+
+    def _raw_similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, score_threshold: Optional[float] = 0.0, **kwargs: Any
+    ) -> List[dict]:
+        if is_metadata_filter(kwargs.get("filter")):
+            kwargs["filter"] = to_opensearch_filter(kwargs["filter"])
+        if self.byte_scale is not None:
+            embedding = quantize_to_bytes(embedding, self.byte_scale)
+        return super()._raw_similarity_search_with_score_by_vector(embedding, k, score_threshold, **kwargs)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        bulk_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        if self.byte_scale is None:
+            return super().add_texts(texts, metadatas=metadatas, ids=ids, bulk_size=bulk_size, **kwargs)
+        texts = list(texts)
+        text_embeddings = list(zip(texts, self.embedding_function.embed_documents(texts)))
+        return self.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids, bulk_size=bulk_size, **kwargs)
+
+    async def aadd_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        bulk_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        if self.byte_scale is None:
+            return await super().aadd_texts(texts, metadatas=metadatas, ids=ids, bulk_size=bulk_size, **kwargs)
+        return await run_in_executor(
+            None, self.add_texts, texts, metadatas=metadatas, ids=ids, bulk_size=bulk_size, **kwargs
+        )
+
+    def add_embeddings(
+        self,
+        text_embeddings: Iterable[Tuple[str, List[float]]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        bulk_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        if self.byte_scale is not None:
+            text_embeddings = [
+                (text, quantize_to_bytes(embedding, self.byte_scale)) for text, embedding in text_embeddings
+            ]
+        return super().add_embeddings(text_embeddings, metadatas=metadatas, ids=ids, bulk_size=bulk_size, **kwargs)
 
 
 class OpenSearchFactory(VectorDBFactory):
@@ -26,20 +131,132 @@ class OpenSearchFactory(VectorDBFactory):
     db_settings: OpenSearchSetting
     em_settings: EMSetting
 
+    _bulk_load: Optional[ExitStack] = PrivateAttr(default=None)
+    _index_ready: bool = PrivateAttr(default=False)
+
+    @memoized
     def get_vector_store(self) -> VectorStore:
         """
         Returns an OpenSearch vector store instance configured with the provided settings.
         """
-        return OpenSearchVectorSearch(
+        vector_store = ManagedOpenSearchVectorSearch(
             index_name=self.db_settings.index,
             opensearch_url=self.db_settings.db_url,
-            http_auth=(
-                fetch_secret_key_value(self.db_settings.username),
-                fetch_secret_key_value(self.db_settings.password),
-            ),
             use_ssl=self.db_settings.use_ssl,
             verify_certs=self.db_settings.verify_certs,
             embedding_function=get_em_factory(settings=self.em_settings).get_model(),
             ssl_assert_hostname=False,
             ssl_show_warn=False,
+            engine=self.db_settings.engine,
         )
+        # The vector stores of a same cluster share their clients and connection pools
+        vector_store.client = get_db_client(self.db_settings)
+        vector_store.client_settings = self.db_settings
+        vector_store.retrieval_cache = get_retrieval_cache(self.db_settings.retrieval_cache)
+        vector_store.retrieval_index = index_key(self.db_settings)
+        vector_store.space_type = self.em_settings.space_type or "l2"
+        if self.db_settings.vector_compression == "byte":
+            vector_store.byte_scale = self.db_settings.byte_scale
+        return vector_store
+
+    def write_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Writes texts with their precomputed embeddings to the index (existing ids are overwritten), with concurrent
+        bulk requests if `bulk_load` is enabled. The index is created on the first write if it doesn't exist.
+        """
+        vector_store = self.get_vector_store()
+        if not self._index_ready:
+            self.ensure_index(len(embeddings[0]))
+            if self._bulk_load is not None:
+                self._bulk_load.enter_context(
+                    bulk_index_settings(
+                        vector_store.client, self.db_settings.index, self.db_settings.force_merge_segments
+                    )
+                )
+            self._index_ready = True
+        if not self.db_settings.bulk_load:
+            # The vector store quantizes the embeddings of a byte vector index
+            vector_store.add_embeddings(
+                text_embeddings=list(zip(texts, embeddings)), metadatas=metadatas, ids=ids, bulk_size=len(texts)
+            )
+            return
+        if vector_store.byte_scale is not None:
+            embeddings = [quantize_to_bytes(embedding, vector_store.byte_scale) for embedding in embeddings]
+        parallel_bulk_embeddings(
+            vector_store.client,
+            self.db_settings.index,
+            texts=texts,
+            embeddings=embeddings,
+            metadatas=metadatas,
+            ids=ids,
+            chunk_size=self.db_settings.bulk_chunk_size,
+            thread_count=self.db_settings.bulk_thread_count,
+        )
+        bump_generation(index_key(self.db_settings))
+
+    def delete_embeddings(self, ids: List[str]) -> None:
+        """
+        Deletes texts and their embeddings from the index by id, with concurrent bulk requests. The index is refreshed
+        unless a bulk load is running (it's refreshed at the end of the load).
+        """
+        client = get_db_client(self.db_settings)
+        parallel_bulk_delete(
+            client,
+            self.db_settings.index,
+            ids,
+            chunk_size=self.db_settings.bulk_chunk_size,
+            thread_count=self.db_settings.bulk_thread_count,
+        )
+        if self._bulk_load is None:
+            client.indices.refresh(index=self.db_settings.index)
+        bump_generation(index_key(self.db_settings))
+
+    def get_metadata_values(self, field: str, include_missing: bool = False) -> Dict[str, Any]:
+        """
+        Reads the values of a metadata field of all the texts of the index, by id (None for the texts without the
+        field, if `include_missing` is set).
+        """
+        return fetch_metadata_values(
+            get_db_client(self.db_settings), self.db_settings.index, field, include_missing=include_missing
+        )
+
+    def ensure_index(self, dimension: Optional[int] = None) -> None:
+        """
+        Creates the k-NN index with the engine, the HNSW parameters and the vector compression of the settings, if it
+        doesn't exist yet, and updates its `ef_search` otherwise.
+        """
+        ensure_index(
+            get_db_client(self.db_settings),
+            self.db_settings.index,
+            dimension or self._embedding_dimension(),
+            engine=self.db_settings.engine,
+            space_type=self.em_settings.space_type or "l2",
+            m=self.db_settings.m,
+            ef_construction=self.db_settings.ef_construction,
+            ef_search=self.db_settings.ef_search,
+            vector_compression=self.db_settings.vector_compression,
+        )
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """
+        Disables the refresh and the replicas of the index from the first write of the load to its end (and
+        force-merges the index after a successful load), if `bulk_load` is enabled.
+        """
+        if not self.db_settings.bulk_load:
+            yield
+            return
+        with ExitStack() as stack:
+            self._bulk_load, self._index_ready = stack, False
+            try:
+                yield
+            finally:
+                self._bulk_load, self._index_ready = None, False
+        # The documents only become searchable once the refresh is restored
+        bump_generation(index_key(self.db_settings))
@@ -1,12 +1,104 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from pydantic import PrivateAttr
+from sqlalchemy import Select, asc, select
 from langchain_postgres.vectorstores import PGVector
 
 from tock_genai_core.models.database import PGVectorSetting
 from tock_genai_core.models.embedding import EMSetting
 from tock_genai_core.services.langchain.factory.factories import VectorDBFactory
+from tock_genai_core.services.langchain.factory.registry import memoized
 from tock_genai_core.services.langchain.factory.em_factory import get_em_factory
+from tock_genai_core.services.database.pgvector import (
+    compressed_distance,
+    copy_embeddings,
+    deferred_indexes,
+    delete_embeddings,
+    ensure_collection,
+    ensure_vector_index,
+    fetch_metadata_values,
+    get_engine,
+    restore_deferred_indexes,
+)
+from tock_genai_core.services.database.metadata_filter import is_metadata_filter, to_pgvector_filter
+from tock_genai_core.services.database.retrieval_cache import (
+    RetrievalCacheMixin,
+    bump_generation,
+    get_retrieval_cache,
+    index_key,
+)
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
 
+class ManagedPGVector(RetrievalCacheMixin, PGVector):
+    """
+    PGVector vector store also accepting lists of MetadataFilter as search filters, compiled into predicates served
+    by the GIN index of the metadata column, caching its searches in the retrieval cache of the settings, and
+    searching a compressed vector index (`halfvec` or `bit`) with a re-ranking on the full precision embeddings.
+    """
+
+    vector_compression: Optional[str] = None
+    """The compression of the vector index, whose candidates are re-ranked on the full precision embeddings."""
+    rerank_factor: int = 4
+    """Number of candidates per result read from the compressed index."""
+
+    def _create_filter_clause(self, filters: Any) -> Any:
+        if is_metadata_filter(filters):
+            return to_pgvector_filter(filters, self.EmbeddingStore.cmetadata)
+        return super()._create_filter_clause(filters)
+
+    def _rerank_query(self, collection: Any, embedding: List[float], k: int, filter: Optional[Any]) -> Select:
+        """
+        Returns the query reading `k * rerank_factor` candidates from the compressed index, and keeping the `k`
+        nearest ones on the full precision embeddings.
+        """
+        filter_by = [self.EmbeddingStore.collection_id == collection.uuid]
+        if filter:
+            filter_clause = self._create_filter_clause(filter)
+            if filter_clause is not None:
+                filter_by.append(filter_clause)
+        candidates = (
+            select(self.EmbeddingStore.id)
+            .filter(*filter_by)
+            .order_by(
+                compressed_distance(
+                    self.EmbeddingStore.embedding, embedding, self.vector_compression, self._distance_strategy
+                )
+            )
+            .limit(k * self.rerank_factor)
+        )
+        return (
+            select(self.EmbeddingStore, self.distance_strategy(embedding).label("distance"))
+            .filter(self.EmbeddingStore.id.in_(candidates.scalar_subquery()))
+            .order_by(asc("distance"))
+            .limit(k)
+        )
+
+    # PGVector runs every search (similarity, MMR) through its private query methods
+    def _PGVector__query_collection(
+        self, embedding: List[float], k: int = 4, filter: Optional[Any] = None
+    ) -> Sequence[Any]:
+        if not self.vector_compression:
+            return super()._PGVector__query_collection(embedding, k, filter)
+        with self._make_sync_session() as session:
+            collection = self.get_collection(session)
+            if not collection:
+                raise ValueError("Collection not found")
+            return session.execute(self._rerank_query(collection, embedding, k, filter)).all()
+
+    async def _PGVector__aquery_collection(
+        self, session: Any, embedding: List[float], k: int = 4, filter: Optional[Any] = None
+    ) -> Sequence[Any]:
+        if not self.vector_compression:
+            return await super()._PGVector__aquery_collection(session, embedding, k, filter)
+        # The search methods open the session they pass, a second one would hold another pooled connection
+        collection = await self.aget_collection(session)
+        if not collection:
+            raise ValueError("Collection not found")
+        return (await session.execute(self._rerank_query(collection, embedding, k, filter))).all()
+
+
 class PGVectorFactory(VectorDBFactory):
     """
     Factory class for creating PGVector vector stores.
@@ -25,19 +117,116 @@ class PGVectorFactory(VectorDBFactory):
     db_settings: PGVectorSetting
     em_settings: EMSetting
 
+    _collection_ready: bool = PrivateAttr(default=False)
+
+    @memoized
     def get_vector_store(self) -> PGVector:
         """
         Returns a PGVector vector store instance configured with the provided settings.
+        The vector stores of a same database share their engine and its connection pool.
         """
-        return PGVector(
+        vector_store = ManagedPGVector(
             collection_name=self.db_settings.index,
             distance_strategy=self.em_settings.space_type,
             use_jsonb=True,
-            connection=self._get_connection_string(),
+            connection=get_engine(self._get_connection_string(), self.db_settings),
             embeddings=get_em_factory(settings=self.em_settings).get_model(),
             collection_metadata={"namespace": self.db_settings.namespace},
+            async_mode=self.db_settings.async_mode,
+        )
+        vector_store.retrieval_cache = get_retrieval_cache(self.db_settings.retrieval_cache)
+        vector_store.retrieval_index = index_key(self.db_settings)
+        vector_store.vector_compression = self.db_settings.vector_compression
+        vector_store.rerank_factor = self.db_settings.rerank_factor
+        return vector_store
+
+    def write_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Writes texts with their precomputed embeddings to the collection (existing ids are updated), with `COPY`
+        if `bulk_load` is enabled.
+        """
+        vector_store = self.get_vector_store()
+        if not self.db_settings.bulk_load:
+            vector_store.add_embeddings(texts=texts, embeddings=embeddings, metadatas=metadatas, ids=ids)
+            return
+        if self.db_settings.async_mode and not self._collection_ready:
+            # The async vector store doesn't create its collection, which COPY requires
+            ensure_collection(
+                self._get_sync_engine(),
+                self.db_settings.index,
+                vector_store.embeddings,
+                collection_metadata={"namespace": self.db_settings.namespace},
+            )
+            self._collection_ready = True
+        copy_embeddings(
+            self._get_sync_engine(),
+            collection_name=self.db_settings.index,
+            texts=texts,
+            embeddings=embeddings,
+            metadatas=metadatas,
+            ids=ids,
+            batch_size=self.db_settings.bulk_batch_size,
+            commit_size=self.db_settings.bulk_commit_size,
+        )
+        bump_generation(index_key(self.db_settings))
+
+    def delete_embeddings(self, ids: List[str]) -> None:
+        """
+        Deletes texts and their embeddings from the collection by id.
+        """
+        delete_embeddings(self._get_sync_engine(), self.db_settings.index, ids)
+        bump_generation(index_key(self.db_settings))
+
+    def get_metadata_values(self, field: str, include_missing: bool = False) -> Dict[str, Any]:
+        """
+        Reads the values of a metadata field of all the texts of the collection, by id (None for the texts without
+        the field, if `include_missing` is set).
+        """
+        return fetch_metadata_values(
+            self._get_sync_engine(), self.db_settings.index, field, include_missing=include_missing
         )
 
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """
+        Defers the builds of the secondary indexes of the embedding table to the end of the load, if
+        `defer_index_builds` is enabled (otherwise, builds the indexes dropped by an interrupted load), and creates
+        the vector index configured by `index_type` after the load.
+        """
+        if self.db_settings.defer_index_builds:
+            with deferred_indexes(self._get_sync_engine()):
+                yield
+        else:
+            # The indexes dropped by an interrupted load with deferred index builds
+            restore_deferred_indexes(self._get_sync_engine())
+            yield
+        if self.db_settings.index_type is not None:
+            self.ensure_index()
+
+    def ensure_index(self, dimension: Optional[int] = None) -> None:
+        """
+        Creates the HNSW or IVFFlat index of the embedding table configured by `index_type`, if it doesn't exist yet
+        (built after the bulk loads, as an IVFFlat index is trained on the existing embeddings).
+        """
+        if self.db_settings.index_type is None:
+            return
+        ensure_vector_index(
+            self._get_sync_engine(),
+            self.db_settings,
+            distance_strategy=self.em_settings.space_type or "l2",
+            dimension=dimension or self._embedding_dimension(),
+        )
+
+    def _get_sync_engine(self):
+        """Returns the sync engine of the database, used by the bulk loads even in async mode."""
+        return get_engine(self._get_connection_string(), self.db_settings.model_copy(update={"async_mode": False}))
+
     def _get_connection_string(self) -> str:
         """
         Constructs the PostgreSQL connection string using the provided database settings.
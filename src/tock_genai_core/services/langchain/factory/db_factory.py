@@ -2,7 +2,7 @@ from tock_genai_core.models.database import DBSetting
 from tock_genai_core.models.embedding import BaseEMSetting
 from tock_genai_core.models.database import VectorDBProvider
 from tock_genai_core.services.langchain.factory.factories import VectorDBFactory
-from tock_genai_core.services.langchain.factory.database import OpenSearchFactory, PGVectorFactory
+from tock_genai_core.services.langchain.factory import database as db_factories
 
 
 def get_vector_db_factory(db_settings: DBSetting, em_settings: BaseEMSetting) -> VectorDBFactory:
@@ -20,12 +20,22 @@ def get_vector_db_factory(db_settings: DBSetting, em_settings: BaseEMSetting) ->
     VectorDBFactory
     """
     if db_settings.provider == VectorDBProvider.OpenSearch:
-        return OpenSearchFactory(
+        return db_factories.OpenSearchFactory(
             db_settings=db_settings,
             em_settings=em_settings,
         )
     if db_settings.provider == VectorDBProvider.PGVector:
-        return PGVectorFactory(
+        return db_factories.PGVectorFactory(
+            db_settings=db_settings,
+            em_settings=em_settings,
+        )
+    if db_settings.provider == VectorDBProvider.FanOut:
+        return db_factories.FanOutFactory(
+            db_settings=db_settings,
+            em_settings=em_settings,
+        )
+    if db_settings.provider == VectorDBProvider.Local:
+        return db_factories.LocalFactory(
             db_settings=db_settings,
             em_settings=em_settings,
         )
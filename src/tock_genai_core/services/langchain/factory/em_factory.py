@@ -1,6 +1,6 @@
 from tock_genai_core.models.embedding import BaseEMSetting, EMProvider
 from tock_genai_core.services.langchain.factory.factories import EMFactory
-from tock_genai_core.services.langchain.factory.embedding import BloomzFactory, AzureOpenAIEMFactory, VLLMEMFactory
+from tock_genai_core.services.langchain.factory import embedding as em_factories
 
 
 def get_em_factory(settings: BaseEMSetting) -> EMFactory:
@@ -18,8 +18,8 @@ def get_em_factory(settings: BaseEMSetting) -> EMFactory:
         An instance of the corresponding embedding factory for the specified provider.
     """
     if settings.provider == EMProvider.BloomZ:
-        return BloomzFactory(settings=settings)
+        return em_factories.BloomzFactory(settings=settings)
     if settings.provider == EMProvider.AzureOpenAI:
-        return AzureOpenAIEMFactory(settings=settings)
+        return em_factories.AzureOpenAIEMFactory(settings=settings)
     if settings.provider == EMProvider.Vllm:
-        return VLLMEMFactory(settings=settings)
+        return em_factories.VLLMEMFactory(settings=settings)
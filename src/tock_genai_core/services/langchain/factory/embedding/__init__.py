@@ -1,6 +1,14 @@
 # -*- coding: utf-8 -*-
 """Initialisation de module(s)."""
 
-from .bloomz_factory import BloomzFactory
-from .azure_openai_factory import AzureOpenAIEMFactory
-from .vllm_factory import VLLMEMFactory
+from tock_genai_core.utils.lazy_import import lazy_getattr
+
+# The factories (and their provider SDKs) are only imported when first used.
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "BloomzFactory": ".bloomz_factory",
+        "AzureOpenAIEMFactory": ".azure_openai_factory",
+        "VLLMEMFactory": ".vllm_factory",
+    },
+)
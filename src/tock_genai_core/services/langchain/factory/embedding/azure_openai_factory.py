@@ -1,8 +1,11 @@
-from langchain.embeddings.base import Embeddings
+from langchain_core.embeddings import Embeddings
 from langchain_openai import AzureOpenAIEmbeddings
 
 from tock_genai_core.models.embedding import AzureOpenAIEMSetting
 from tock_genai_core.services.langchain.factory.factories import EMFactory
+from tock_genai_core.services.admission import admission_controlled
+from tock_genai_core.services.langchain.factory.registry import memoized
+from tock_genai_core.services.rate_limit import RateLimitedEmbeddings, get_rate_limiter
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
 
@@ -20,11 +23,12 @@ class AzureOpenAIEMFactory(EMFactory):
 
     settings: AzureOpenAIEMSetting
 
+    @memoized
     def get_model(self) -> Embeddings:
         """
         Returns an AzureOpenAIEmbeddings model instance configured with the provided settings.
         """
-        return AzureOpenAIEmbeddings(
+        embeddings = AzureOpenAIEmbeddings(
             model=self.settings.model,
             azure_endpoint=self.settings.api_base,
             azure_deployment=self.settings.deployment,
@@ -32,3 +36,12 @@ class AzureOpenAIEMFactory(EMFactory):
             api_version=self.settings.api_version,
             chunk_size=16,
         )
+        rate_limiter = get_rate_limiter(self.settings)
+        if rate_limiter is not None:
+            embeddings = RateLimitedEmbeddings(
+                embeddings=embeddings,
+                rate_limiter=rate_limiter,
+                model=self.settings.model,
+                chunk_size=embeddings.chunk_size,
+            )
+        return admission_controlled(embeddings, self.settings)
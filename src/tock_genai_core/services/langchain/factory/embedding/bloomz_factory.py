@@ -1,8 +1,10 @@
-from langchain.embeddings.base import Embeddings
+from langchain_core.embeddings import Embeddings
 
 from tock_genai_core.models.embedding import BloomZEMSetting
 from tock_genai_core.services.embedding import BloomzEmbeddings
 from tock_genai_core.services.langchain.factory.factories import EMFactory
+from tock_genai_core.services.admission import admission_controlled
+from tock_genai_core.services.langchain.factory.registry import memoized
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
 
@@ -20,13 +22,17 @@ class BloomzFactory(EMFactory):
 
     settings: BloomZEMSetting
 
+    @memoized
     def get_model(self) -> Embeddings:
         """
         Returns a BloomzEmbeddings model instance configured with the provided settings.
         """
-        return BloomzEmbeddings(
-            model=self.settings.model,
-            pooling=self.settings.pooling,
-            api_base=self.settings.api_base,
-            api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else None,
+        return admission_controlled(
+            BloomzEmbeddings(
+                model=self.settings.model,
+                pooling=self.settings.pooling,
+                api_base=self.settings.api_base,
+                api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else None,
+            ),
+            self.settings,
         )
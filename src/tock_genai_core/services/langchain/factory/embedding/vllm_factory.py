@@ -1,7 +1,9 @@
-from langchain_openai import AzureOpenAIEmbeddings
-from langchain.embeddings.base import Embeddings
+from langchain_core.embeddings import Embeddings
 
+from tock_genai_core.services.embedding import VLLMEmbeddings
 from tock_genai_core.services.langchain.factory.factories import EMFactory
+from tock_genai_core.services.admission import admission_controlled
+from tock_genai_core.services.langchain.factory.registry import memoized
 from tock_genai_core.models.embedding.vllm.vllm_em_setting import VLLMEMSetting
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
@@ -9,9 +11,17 @@ from tock_genai_core.services.security.security_service import fetch_secret_key_
 class VLLMEMFactory(EMFactory):
     settings: VLLMEMSetting
 
+    @memoized
     def get_model(self) -> Embeddings:
-        return AzureOpenAIEmbeddings(
-            model=self.settings.model,
-            azure_endpoint=self.settings.api_base,
-            openai_api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else "EMPTY",
+        return admission_controlled(
+            VLLMEmbeddings(
+                model=self.settings.model,
+                api_base=self.settings.api_base,
+                api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else "EMPTY",
+                batch_size=self.settings.batch_size,
+                max_concurrency=self.settings.max_concurrency,
+                base64=self.settings.base64,
+                timeout=self.settings.timeout,
+            ),
+            self.settings,
         )
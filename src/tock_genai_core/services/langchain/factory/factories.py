@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 
 from pydantic import BaseModel
 from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.vectorstores import VectorStore
-from langchain.base_language import BaseLanguageModel
-from langchain.embeddings.base import Embeddings
-from langchain.retrievers.document_compressors.base import BaseDocumentCompressor
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.embeddings import Embeddings
+from langchain_core.documents import BaseDocumentCompressor
 
 from tock_genai_core.models.embedding import BaseEMSetting
 from tock_genai_core.models.llm.setting import BaseLLMSetting
@@ -30,6 +32,22 @@ class VectorDBFactory(ABC, BaseModel):
     -------
     get_vector_store() -> VectorStore
         Abstract method to be implemented by subclasses to return an instance of a vector store.
+
+    write_embeddings(texts: List[str], embeddings: List[List[float]], metadatas: List[dict], ids: List[str]) -> None
+        Writes texts with their precomputed embeddings to the vector store (used by the ingestion pipeline).
+
+    delete_embeddings(ids: List[str]) -> None
+        Deletes texts and their embeddings from the vector store by id (used by the incremental ingestion).
+
+    get_metadata_values(field: str, include_missing: bool) -> Dict[str, Any]
+        Reads the values of a metadata field of all the texts of the vector store, by id (e.g. their content hashes),
+        with None for the texts without the field if `include_missing` is set.
+
+    bulk_load() -> Iterator[None]
+        Context manager preparing the vector store for a bulk load, and restoring it afterwards.
+
+    ensure_index(dimension: Optional[int]) -> None
+        Creates the vector index configured by the settings, if it doesn't exist yet.
     """
 
     db_settings: BaseVectorDBSetting
@@ -39,6 +57,32 @@ class VectorDBFactory(ABC, BaseModel):
     def get_vector_store(self) -> VectorStore:
         pass
 
+    def write_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> None:
+        raise NotImplementedError(f"{type(self).__name__} doesn't support writing precomputed embeddings.")
+
+    def delete_embeddings(self, ids: List[str]) -> None:
+        raise NotImplementedError(f"{type(self).__name__} doesn't support deleting embeddings.")
+
+    def get_metadata_values(self, field: str, include_missing: bool = False) -> Dict[str, Any]:
+        raise NotImplementedError(f"{type(self).__name__} doesn't support reading metadata values.")
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        yield
+
+    def ensure_index(self, dimension: Optional[int] = None) -> None:
+        raise NotImplementedError(f"{type(self).__name__} doesn't support creating its vector index.")
+
+    def _embedding_dimension(self) -> int:
+        """Returns the dimension of the embeddings, by embedding a probe text."""
+        return len(self.get_vector_store().embeddings.embed_query("dimension"))
+
 
 class LLMFactory(ABC, BaseModel):
     """
@@ -1,4 +1,13 @@
 # -*- coding: utf-8 -*-
 """Initialisation de module(s)."""
 
-from .bloomz_guardrail_factory import BloomzGuardrailFactory
+from tock_genai_core.utils.lazy_import import lazy_getattr
+
+# The factories (and their provider SDKs) are only imported when first used.
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "BloomzGuardrailFactory": ".bloomz_guardrail_factory",
+        "CompositeGuardrailFactory": ".composite_guardrail_factory",
+    },
+)
@@ -4,6 +4,8 @@ from tock_genai_core.models.guardrail import BloomZGuardrailSetting
 from tock_genai_core.services.langchain.factory.factories import (
     GuardrailFactory,
 )
+from tock_genai_core.services.admission import admission_controlled
+from tock_genai_core.services.langchain.factory.registry import memoized
 from tock_genai_core.services.guardrail import BloomzGuardrailOutputParser
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
@@ -22,12 +24,16 @@ class BloomzGuardrailFactory(GuardrailFactory):
 
     settings: BloomZGuardrailSetting
 
+    @memoized
     def get_parser(self) -> BaseOutputParser:
         """
         Returns a BloomzGuardrailOutputParser instance configured with the provided settings.
         """
-        return BloomzGuardrailOutputParser(
-            max_score=self.settings.max_score,
-            endpoint=self.settings.api_base,
-            api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else None,
+        return admission_controlled(
+            BloomzGuardrailOutputParser(
+                max_score=self.settings.max_score,
+                endpoint=self.settings.api_base,
+                api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else None,
+            ),
+            self.settings,
         )
@@ -0,0 +1,41 @@
+from langchain_core.output_parsers import BaseOutputParser
+
+from tock_genai_core.models.guardrail import CompositeGuardrailSetting
+from tock_genai_core.services.langchain.factory.factories import (
+    GuardrailFactory,
+)
+from tock_genai_core.services.admission import admission_controlled
+from tock_genai_core.services.langchain.factory.registry import memoized
+from tock_genai_core.services.guardrail import CompositeGuardrailOutputParser
+
+
+class CompositeGuardrailFactory(GuardrailFactory):
+    """
+    Factory class for creating CompositeGuardrailOutputParser instances.
+    This class is responsible for instantiating a `CompositeGuardrailOutputParser` object, building one parser
+    per guardrail defined in the `CompositeGuardrailSetting` class.
+
+    Attributes
+    ----------
+    settings : CompositeGuardrailSetting
+        The settings used to configure the CompositeGuardrailOutputParser.
+    """
+
+    settings: CompositeGuardrailSetting
+
+    @memoized
+    def get_parser(self) -> BaseOutputParser:
+        """
+        Returns a CompositeGuardrailOutputParser instance wrapping the parsers of the configured guardrails.
+        """
+        # Imported here to avoid a circular import with the guardrail factory dispatcher.
+        from tock_genai_core.services.langchain.factory.guardrail_factory import get_guardrail_factory
+
+        return admission_controlled(
+            CompositeGuardrailOutputParser(
+                parsers=[get_guardrail_factory(settings).get_parser() for settings in self.settings.guardrails],
+                max_workers=self.settings.max_workers,
+                timeout=self.settings.timeout,
+            ),
+            self.settings,
+        )
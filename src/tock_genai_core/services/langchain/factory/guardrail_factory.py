@@ -1,8 +1,6 @@
 from tock_genai_core.services.langchain.factory.factories import GuardrailFactory
 from tock_genai_core.models.guardrail import BaseGuardrailSetting, GuardrailProvider
-from tock_genai_core.services.langchain.factory.guardrail import (
-    BloomzGuardrailFactory,
-)
+from tock_genai_core.services.langchain.factory import guardrail as guardrail_factories
 
 
 def get_guardrail_factory(settings: BaseGuardrailSetting) -> GuardrailFactory:
@@ -20,4 +18,6 @@ def get_guardrail_factory(settings: BaseGuardrailSetting) -> GuardrailFactory:
         An instance of the corresponding guardrail factory for the specified provider.
     """
     if settings.provider == GuardrailProvider.BloomZ:
-        return BloomzGuardrailFactory(settings=settings)
+        return guardrail_factories.BloomzGuardrailFactory(settings=settings)
+    if settings.provider == GuardrailProvider.Composite:
+        return guardrail_factories.CompositeGuardrailFactory(settings=settings)
@@ -1,6 +1,15 @@
 # -*- coding: utf-8 -*-
 """Initialisation de module(s)."""
 
-from .tgi_factory import TGIFactory
-from .azure_openai_factory import AzureOpenAILLMFactory
-from .vllm_factory import VllmFactory
+from tock_genai_core.utils.lazy_import import lazy_getattr
+
+# The factories (and their provider SDKs) are only imported when first used.
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "TGIFactory": ".tgi_factory",
+        "AzureOpenAILLMFactory": ".azure_openai_factory",
+        "VllmFactory": ".vllm_factory",
+        "RouterFactory": ".router_factory",
+    },
+)
@@ -1,11 +1,20 @@
-from langchain.base_language import BaseLanguageModel
+from langchain_core.language_models import BaseLanguageModel
 from langchain_openai.chat_models import AzureChatOpenAI
 
 from tock_genai_core.models.llm import AzureOpenAILLMSetting
 from tock_genai_core.services.langchain.factory.factories import LLMFactory
+from tock_genai_core.services.langchain.factory.registry import memoized
+from tock_genai_core.services.admission import AdmissionControlMixin, get_admission_controller
+from tock_genai_core.services.llm_cache import CachedStreamMixin, get_llm_cache
+from tock_genai_core.services.llm_metrics import get_streaming_callbacks
+from tock_genai_core.services.rate_limit import RateLimitMixin, get_rate_limiter
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
 
+class ManagedAzureChatOpenAI(AdmissionControlMixin, RateLimitMixin, CachedStreamMixin, AzureChatOpenAI):
+    """AzureChatOpenAI model with admission control and rate limiting, also caching its streamed calls."""
+
+
 class AzureOpenAILLMFactory(LLMFactory):
     """
     Factory class for creating OpenAI language models.
@@ -20,15 +29,21 @@ class AzureOpenAILLMFactory(LLMFactory):
 
     settings: AzureOpenAILLMSetting
 
+    @memoized
     def get_model(self) -> BaseLanguageModel:
         """
         Returns an AzureChatOpenAI model instance configured with the provided settings.
         """
-        return AzureChatOpenAI(
+        return ManagedAzureChatOpenAI(
             model=self.settings.model,
             deployment_name=self.settings.deployment,
             azure_endpoint=self.settings.api_base,
             api_key=fetch_secret_key_value(self.settings.api_key),
             api_version=self.settings.api_version,
             temperature=self.settings.temperature,
+            streaming=self.settings.streaming,
+            cache=get_llm_cache(self.settings.cache, self.settings.semantic_cache),
+            admission_controller=get_admission_controller(self.settings.admission, self.settings),
+            rate_limiter=get_rate_limiter(self.settings),
+            callbacks=get_streaming_callbacks(self.settings),
         )
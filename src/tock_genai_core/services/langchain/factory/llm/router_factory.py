@@ -0,0 +1,49 @@
+from langchain_core.language_models import BaseLanguageModel
+
+from tock_genai_core.models.llm import RouterLLMSetting
+from tock_genai_core.services.langchain.factory.factories import LLMFactory
+from tock_genai_core.services.langchain.factory.registry import memoized
+from tock_genai_core.services.llm_router import RouterLLM
+from tock_genai_core.services.admission import AdmissionControlMixin, get_admission_controller
+from tock_genai_core.services.llm_cache import CachedStreamMixin, get_llm_cache
+from tock_genai_core.services.llm_metrics import get_streaming_callbacks
+
+
+class ManagedRouterLLM(AdmissionControlMixin, CachedStreamMixin, RouterLLM):
+    """RouterLLM model with admission control, also caching its streamed calls."""
+
+
+class RouterFactory(LLMFactory):
+    """
+    Factory class for creating LLM routers.
+    This class is responsible for instantiating a `RouterLLM` model, building one model per replica and fallback
+    defined in the `RouterLLMSetting` class.
+
+    Attributes
+    ----------
+    settings : RouterLLMSetting
+        The settings used to configure the `RouterLLM` model.
+    """
+
+    settings: RouterLLMSetting
+
+    @memoized
+    def get_model(self) -> BaseLanguageModel:
+        """
+        Returns a RouterLLM model instance routing the calls among the configured replicas.
+        The router is memoized, so that the replicas health is shared by every caller using the same settings.
+        """
+        # Imported here to avoid a circular import with the LLM factory dispatcher.
+        from tock_genai_core.services.langchain.factory.llm_factory import get_llm_factory
+
+        return ManagedRouterLLM(
+            replicas=[get_llm_factory(settings).get_model() for settings in self.settings.replicas],
+            fallbacks=[get_llm_factory(settings).get_model() for settings in self.settings.fallbacks],
+            strategy=self.settings.strategy,
+            max_failures=self.settings.max_failures,
+            ejection_duration=self.settings.ejection_duration,
+            streaming=self.settings.streaming,
+            cache=get_llm_cache(self.settings.cache, self.settings.semantic_cache),
+            admission_controller=get_admission_controller(self.settings.admission, self.settings),
+            callbacks=get_streaming_callbacks(self.settings),
+        )
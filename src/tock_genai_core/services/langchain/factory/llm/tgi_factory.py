@@ -1,32 +1,48 @@
-from langchain.base_language import BaseLanguageModel
-from langchain_community.llms.huggingface_text_gen_inference import HuggingFaceTextGenInference
-
+from langchain_core.language_models import BaseLanguageModel
 from tock_genai_core.services.langchain.factory.factories import LLMFactory
+from tock_genai_core.services.langchain.factory.registry import memoized
 from tock_genai_core.models.llm import HuggingFaceTextGenInferenceLLMSetting
+from tock_genai_core.services.admission import AdmissionControlMixin, get_admission_controller
+from tock_genai_core.services.llm_cache import CachedStreamMixin, get_llm_cache
+from tock_genai_core.services.llm_metrics import get_streaming_callbacks
+from tock_genai_core.services.tgi import TextGenerationInferenceLLM
+
+
+class ManagedTextGenerationInferenceLLM(AdmissionControlMixin, CachedStreamMixin, TextGenerationInferenceLLM):
+    """TextGenerationInferenceLLM model with admission control, also caching its streamed calls."""
+
+    concurrent_batches = True
 
 
 class TGIFactory(LLMFactory):
     """
     Factory class for creating Hugging Face Text Generation Inference (TGI) language models.
-    This class is responsible for instantiating a `HuggingFaceTextGenInference` model using the settings
+    This class is responsible for instantiating a `TextGenerationInferenceLLM` model using the settings
     defined in the `HuggingFaceTextGenInferenceLLMSetting` class.
 
     Attributes
     ----------
     settings : HuggingFaceTextGenInferenceLLMSetting
-        The settings used to configure the `HuggingFaceTextGenInference` model.
+        The settings used to configure the `TextGenerationInferenceLLM` model.
     """
 
     settings: HuggingFaceTextGenInferenceLLMSetting
 
+    @memoized
     def get_model(self) -> BaseLanguageModel:
         """
-        Returns a HuggingFaceTextGenInference model instance configured with the provided settings.
+        Returns a TextGenerationInferenceLLM model instance configured with the provided settings.
         """
-        return HuggingFaceTextGenInference(
+        return ManagedTextGenerationInferenceLLM(
             inference_server_url=self.settings.api_base,
             temperature=self.settings.temperature,
             repetition_penalty=self.settings.repetition_penalty,
             max_new_tokens=self.settings.max_new_tokens,
             streaming=self.settings.streaming,
+            timeout=self.settings.timeout,
+            connect_timeout=self.settings.connect_timeout,
+            max_connections=self.settings.max_connections,
+            cache=get_llm_cache(self.settings.cache, self.settings.semantic_cache),
+            admission_controller=get_admission_controller(self.settings.admission, self.settings),
+            callbacks=get_streaming_callbacks(self.settings),
         )
@@ -1,12 +1,20 @@
-from langchain.base_language import BaseLanguageModel
+from langchain_core.language_models import BaseLanguageModel
 
 from langchain_community.llms.vllm import VLLMOpenAI
 
 from tock_genai_core.models.llm import VllmSetting
 from tock_genai_core.services.langchain.factory.factories import LLMFactory
+from tock_genai_core.services.langchain.factory.registry import memoized
+from tock_genai_core.services.admission import AdmissionControlMixin, get_admission_controller
+from tock_genai_core.services.llm_cache import CachedStreamMixin, get_llm_cache
+from tock_genai_core.services.llm_metrics import get_streaming_callbacks
 from tock_genai_core.services.security.security_service import fetch_secret_key_value
 
 
+class ManagedVLLMOpenAI(AdmissionControlMixin, CachedStreamMixin, VLLMOpenAI):
+    """VLLMOpenAI model with admission control, also caching its streamed calls."""
+
+
 class VllmFactory(LLMFactory):
     """
     Factory class for creating VLLM (Variable Language Model) language models.
@@ -21,11 +29,12 @@ class VllmFactory(LLMFactory):
 
     settings: VllmSetting
 
+    @memoized
     def get_model(self) -> BaseLanguageModel:
         """
         Returns a VLLMOpenAI model instance configured with the provided settings.
         """
-        return VLLMOpenAI(
+        return ManagedVLLMOpenAI(
             model_name=self.settings.model,
             openai_api_key=fetch_secret_key_value(self.settings.api_key) if self.settings.api_key else "EMPTY",
             openai_api_base=self.settings.api_base,
@@ -37,4 +46,8 @@ class VllmFactory(LLMFactory):
                 if self.settings.api_key
                 else {}
             ),
+            streaming=self.settings.streaming,
+            cache=get_llm_cache(self.settings.cache, self.settings.semantic_cache),
+            admission_controller=get_admission_controller(self.settings.admission, self.settings),
+            callbacks=get_streaming_callbacks(self.settings),
         )
@@ -1,10 +1,6 @@
 from tock_genai_core.models.llm import BaseLLMSetting, LLMProvider
 from tock_genai_core.services.langchain.factory.factories import LLMFactory
-from tock_genai_core.services.langchain.factory.llm import (
-    AzureOpenAILLMFactory,
-    TGIFactory,
-    VllmFactory,
-)
+from tock_genai_core.services.langchain.factory import llm as llm_factories
 
 
 def get_llm_factory(settings: BaseLLMSetting) -> LLMFactory:
@@ -22,8 +18,10 @@ def get_llm_factory(settings: BaseLLMSetting) -> LLMFactory:
         An instance of the corresponding LLM factory for the specified provider.
     """
     if settings.provider == LLMProvider.TGI:
-        return TGIFactory(settings=settings)
+        return llm_factories.TGIFactory(settings=settings)
     if settings.provider == LLMProvider.AzureOpenAI:
-        return AzureOpenAILLMFactory(settings=settings)
+        return llm_factories.AzureOpenAILLMFactory(settings=settings)
     if settings.provider == LLMProvider.Vllm:
-        return VllmFactory(settings=settings)
+        return llm_factories.VllmFactory(settings=settings)
+    if settings.provider == LLMProvider.Router:
+        return llm_factories.RouterFactory(settings=settings)
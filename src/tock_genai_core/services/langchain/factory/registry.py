@@ -0,0 +1,176 @@
+import os
+import hashlib
+import logging
+import threading
+from functools import wraps
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def settings_fingerprint(settings: BaseModel) -> str:
+    """
+    Computes a stable fingerprint of a settings instance.
+
+    Parameters
+    ----------
+    settings : BaseModel
+        The settings to fingerprint.
+
+    Returns
+    -------
+    str
+        The SHA-256 digest of the settings class and of its JSON dump.
+    """
+    payload = f"{type(settings).__module__}.{type(settings).__qualname__}:{settings.model_dump_json()}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FactoryRegistry:
+    """
+    Process-wide registry of the models, stores and parsers built by the factories.
+    Built instances are memoized by a fingerprint of the settings used to build them, so that repeated requests
+    with identical settings reuse warm clients (connection pools, resolved secrets, checked schemas...).
+    The least recently used instances are evicted once `max_size` is reached.
+
+    Attributes
+    ----------
+    max_size : int
+        Maximum number of memoized instances. A size of 0 disables the memoization.
+
+    Methods
+    -------
+    get_or_create(key: str, builder: Callable[[], T], *settings: BaseModel) -> T
+        Returns the instance memoized under `key`, building it with `builder` if needed.
+    invalidate(*settings: BaseModel) -> int
+        Removes the instances built from any of the given settings.
+    clear() -> None
+        Removes all the memoized instances.
+    """
+
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Any, FrozenSet[str]]]" = OrderedDict()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _lookup(self, key: str):
+        """Returns the memoized entry for `key` (and marks it as recently used), or None. Requires `_lock`."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get_or_create(self, key: str, builder: Callable[[], T], *settings: BaseModel) -> T:
+        """
+        Returns the instance memoized under `key`, building it with `builder` if needed.
+        Concurrent calls for the same key build the instance only once, while different keys are built in parallel.
+
+        Parameters
+        ----------
+        key : str
+            The memoization key.
+        builder : Callable[[], T]
+            The function building the instance.
+        *settings : BaseModel
+            The settings used to build the instance, used by `invalidate`.
+
+        Returns
+        -------
+        T
+            The memoized instance.
+        """
+        if self.max_size <= 0:
+            return builder()
+
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry[0]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    return entry[0]
+
+            instance = builder()
+
+            with self._lock:
+                self._entries[key] = (instance, frozenset(settings_fingerprint(s) for s in settings))
+                self._build_locks.pop(key, None)
+                while len(self._entries) > self.max_size:
+                    evicted_key, _ = self._entries.popitem(last=False)
+                    logger.debug("Evicting %s from the factory registry.", evicted_key)
+
+        return instance
+
+    def invalidate(self, *settings: BaseModel) -> int:
+        """
+        Removes the instances built from any of the given settings (e.g. after a secret rotation).
+
+        Parameters
+        ----------
+        *settings : BaseModel
+            The settings whose instances must be rebuilt on next use.
+
+        Returns
+        -------
+        int
+            The number of removed instances.
+        """
+        fingerprints = {settings_fingerprint(s) for s in settings}
+        with self._lock:
+            keys = [key for key, (_, used) in self._entries.items() if used & fingerprints]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Removes all the memoized instances."""
+        with self._lock:
+            self._entries.clear()
+
+
+factory_registry = FactoryRegistry(max_size=int(os.getenv("TOCK_GENAI_CORE_FACTORY_REGISTRY_SIZE", "128")))
+
+
+def memoized(method: Callable[[BaseModel], T]) -> Callable[[BaseModel], T]:
+    """
+    Decorator memoizing the build method of a factory in the `factory_registry`.
+    The memoization key is made of the factory class, the method name and the fingerprints of the factory settings.
+
+    Parameters
+    ----------
+    method : Callable[[BaseModel], T]
+        The factory method building a model, a store or a parser.
+
+    Returns
+    -------
+    Callable[[BaseModel], T]
+        The memoized method.
+    """
+
+    @wraps(method)
+    def wrapper(self: BaseModel) -> T:
+        settings = [getattr(self, name) for name in type(self).model_fields]
+        key = ":".join(
+            [f"{type(self).__module__}.{type(self).__qualname__}.{method.__name__}"]
+            + [settings_fingerprint(s) for s in settings]
+        )
+        return factory_registry.get_or_create(key, lambda: method(self), *settings)
+
+    return wrapper
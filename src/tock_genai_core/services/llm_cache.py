@@ -0,0 +1,315 @@
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, AIMessageChunk, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+from langchain_core.language_models import BaseChatModel
+
+from tock_genai_core.models.cache import CacheBackend, LLMCacheSetting, SemanticCacheSetting
+from tock_genai_core.services.langchain.factory.registry import factory_registry, settings_fingerprint
+
+
+logger = logging.getLogger(__name__)
+
+REPLAY_PATTERN = re.compile(r"\S+\s*|\s+")
+"""Pattern splitting a cached response into the chunks replayed to the streamed calls."""
+
+
+def _serialize(generations: RETURN_VAL_TYPE) -> str:
+    """Serializes cached generations to JSON."""
+    return json.dumps(
+        [
+            (
+                {"message": message_to_dict(generation.message), "generation_info": generation.generation_info}
+                if isinstance(generation, ChatGeneration)
+                else {"text": generation.text, "generation_info": generation.generation_info}
+            )
+            for generation in generations
+        ]
+    )
+
+
+def _deserialize(value: str) -> RETURN_VAL_TYPE:
+    """Deserializes cached generations from JSON."""
+    return [
+        (
+            ChatGeneration(message=messages_from_dict([item["message"]])[0], generation_info=item["generation_info"])
+            if "message" in item
+            else Generation(text=item["text"], generation_info=item["generation_info"])
+        )
+        for item in json.loads(value)
+    ]
+
+
+def _cache_key(prompt: str, llm_string: str) -> str:
+    """Returns the storage key of a prompt sent to an LLM."""
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class InMemoryLLMCache(BaseCache):
+    """
+    In-process LLM response cache, with LRU eviction and time-to-live expiration.
+
+    Attributes
+    ----------
+    max_size : int
+        Maximum number of cached responses, the least recently used ones are evicted first.
+    ttl : Optional[float]
+        Time in seconds after which a cached response expires.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, RETURN_VAL_TYPE]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = _cache_key(prompt, llm_string)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, generations = entry
+            if self.ttl is not None and time.time() - created_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = _cache_key(prompt, llm_string)
+        with self._lock:
+            self._entries[key] = (time.time(), return_val)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    LLM response cache persisted in a SQLite database file, with LRU eviction and time-to-live expiration.
+    The cache can be shared by the processes of a host through the database file.
+
+    Attributes
+    ----------
+    path : str
+        Path of the SQLite database file.
+    max_size : int
+        Maximum number of cached responses, the least recently used ones are evicted first.
+    ttl : Optional[float]
+        Time in seconds after which a cached response expires.
+    """
+
+    def __init__(self, path: str, max_size: int = 1024, ttl: Optional[float] = None):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, generations TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed_at ON llm_cache (accessed_at)")
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = _cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT generations, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        try:
+            return _deserialize(row[0])
+        except Exception:
+            logger.warning("Unable to deserialize a cached LLM response, ignoring it.", exc_info=True)
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = _cache_key(prompt, llm_string)
+        now = time.time()
+        generations = _serialize(return_val)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, generations, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, generations, now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM llm_cache")
+
+
+class TieredLLMCache(BaseCache):
+    """
+    LLM response cache looking up several caches in order (e.g. the exact-match cache, then the semantic cache).
+    Responses are stored in all of them.
+
+    Attributes
+    ----------
+    caches : List[BaseCache]
+        The caches, in lookup order.
+    """
+
+    def __init__(self, caches: List[BaseCache]):
+        self.caches = caches
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        for cache in self.caches:
+            generations = cache.lookup(prompt, llm_string)
+            if generations:
+                return generations
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        for cache in self.caches:
+            cache.update(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        for cache in self.caches:
+            cache.clear(**kwargs)
+
+
+def get_llm_cache(
+    settings: Optional[LLMCacheSetting], semantic_settings: Optional[SemanticCacheSetting] = None
+) -> Optional[BaseCache]:
+    """
+    Returns the LLM response cache configured by the settings.
+    Caches are memoized in the factory registry, so that every model configured with the same cache settings
+    shares the same cache.
+
+    Parameters
+    ----------
+    settings : Optional[LLMCacheSetting]
+        The exact-match cache settings.
+    semantic_settings : Optional[SemanticCacheSetting]
+        The semantic cache settings, the semantic cache is looked up after the exact-match cache.
+
+    Returns
+    -------
+    Optional[BaseCache]
+        The LLM response cache, or None if no cache is configured.
+    """
+    # Imported here to avoid a circular import, the semantic cache relies on the serialization of this module
+    from tock_genai_core.services.semantic_cache import get_semantic_cache
+
+    def build() -> BaseCache:
+        if settings.backend == CacheBackend.SQLite:
+            return SQLiteLLMCache(path=settings.path, max_size=settings.max_size, ttl=settings.ttl)
+        return InMemoryLLMCache(max_size=settings.max_size, ttl=settings.ttl)
+
+    caches = [
+        cache
+        for cache in (
+            (
+                factory_registry.get_or_create(f"llm_cache:{settings_fingerprint(settings)}", build, settings)
+                if settings
+                else None
+            ),
+            get_semantic_cache(semantic_settings),
+        )
+        if cache is not None
+    ]
+    if not caches:
+        return None
+    return caches[0] if len(caches) == 1 else TieredLLMCache(caches)
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Returns the text of a streamed chunk, whether it comes from a chat model or a text completion model."""
+    if isinstance(chunk, str):
+        return chunk
+    return chunk.content if isinstance(chunk.content, str) else ""
+
+
+class CachedStreamMixin:
+    """
+    Mixin for LLMs and chat models caching streamed calls in their `cache`.
+    LangChain only caches the `invoke`/`generate` calls. With this mixin, the response of a streamed call is cached
+    (with the same key as the non streamed calls), and a cached response is replayed as a stream of chunks.
+    """
+
+    def _stream_cache_key(self, input: Any, stop: Optional[List[str]], **kwargs: Any) -> Tuple[str, str]:
+        """Returns the prompt and LLM string used by LangChain to cache the same call when it is not streamed."""
+        prompt_value = self._convert_input(input)
+        if isinstance(self, BaseChatModel):
+            return dumps(prompt_value.to_messages()), self._get_llm_string(stop=stop, **kwargs)
+        params = self.dict()
+        params["stop"] = stop
+        return prompt_value.to_string(), str(sorted(params.items()))
+
+    def _replay(self, generations: RETURN_VAL_TYPE) -> Iterator[Any]:
+        for piece in REPLAY_PATTERN.findall(generations[0].text):
+            yield AIMessageChunk(content=piece) if isinstance(self, BaseChatModel) else piece
+
+    def _generations(self, text: str) -> RETURN_VAL_TYPE:
+        if isinstance(self, BaseChatModel):
+            return [ChatGeneration(message=AIMessage(content=text))]
+        return [Generation(text=text)]
+
+    def stream(self, input: Any, config: Any = None, *, stop: Optional[List[str]] = None, **kwargs: Any) -> Iterator:
+        cache = self.cache if isinstance(self.cache, BaseCache) else None
+        if cache is None:
+            yield from super().stream(input, config, stop=stop, **kwargs)
+            return
+
+        prompt, llm_string = self._stream_cache_key(input, stop, **kwargs)
+        cached = cache.lookup(prompt, llm_string)
+        if cached:
+            yield from self._replay(cached)
+            return
+
+        text = []
+        for chunk in super().stream(input, config, stop=stop, **kwargs):
+            text.append(_chunk_text(chunk))
+            yield chunk
+        cache.update(prompt, llm_string, self._generations("".join(text)))
+
+    async def astream(
+        self, input: Any, config: Any = None, *, stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> AsyncIterator:
+        cache = self.cache if isinstance(self.cache, BaseCache) else None
+        if cache is None:
+            async for chunk in super().astream(input, config, stop=stop, **kwargs):
+                yield chunk
+            return
+
+        prompt, llm_string = self._stream_cache_key(input, stop, **kwargs)
+        cached = await cache.alookup(prompt, llm_string)
+        if cached:
+            for chunk in self._replay(cached):
+                yield chunk
+            return
+
+        text = []
+        async for chunk in super().astream(input, config, stop=stop, **kwargs):
+            text.append(_chunk_text(chunk))
+            yield chunk
+        await cache.aupdate(prompt, llm_string, self._generations("".join(text)))
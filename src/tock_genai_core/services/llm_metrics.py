@@ -0,0 +1,175 @@
+import time
+import logging
+import threading
+from uuid import UUID
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+from tock_genai_core.models.llm.setting import BaseLLMSetting
+
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingStats:
+    """
+    Aggregated streaming statistics of an LLM.
+
+    Attributes
+    ----------
+    calls : int
+        Number of streamed calls that produced at least one token.
+    tokens : int
+        Number of streamed tokens.
+    last_ttft : Optional[float]
+        Time to first token of the last streamed call, in seconds.
+    last_tokens_per_second : Optional[float]
+        Generation throughput of the last streamed call, after its first token.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.tokens = 0
+        self.last_ttft: Optional[float] = None
+        self.last_tokens_per_second: Optional[float] = None
+        self._total_ttft = 0.0
+        self._decode_tokens = 0
+        self._decode_time = 0.0
+
+    @property
+    def mean_ttft(self) -> Optional[float]:
+        """Mean time to first token in seconds."""
+        return self._total_ttft / self.calls if self.calls else None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Mean generation throughput, after the first token of each call."""
+        return self._decode_tokens / self._decode_time if self._decode_time else None
+
+    def record(self, ttft: float, tokens: int, decode_time: float) -> None:
+        self.calls += 1
+        self.tokens += tokens
+        self._total_ttft += ttft
+        self.last_ttft = ttft
+        if tokens > 1 and decode_time > 0:
+            self._decode_tokens += tokens - 1
+            self._decode_time += decode_time
+            self.last_tokens_per_second = (tokens - 1) / decode_time
+        else:
+            self.last_tokens_per_second = None
+
+
+class StreamingMetrics:
+    """
+    Process-wide streaming statistics of the LLMs, by label (provider and model).
+
+    Methods
+    -------
+    get(label: str) -> Optional[StreamingStats]
+        Returns the statistics of an LLM.
+    snapshot() -> Dict[str, StreamingStats]
+        Returns the statistics of every LLM.
+    clear() -> None
+        Removes all the statistics.
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, StreamingStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, ttft: float, tokens: int, decode_time: float) -> None:
+        with self._lock:
+            self._stats.setdefault(label, StreamingStats()).record(ttft, tokens, decode_time)
+
+    def get(self, label: str) -> Optional[StreamingStats]:
+        with self._lock:
+            return self._stats.get(label)
+
+    def snapshot(self) -> Dict[str, StreamingStats]:
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+streaming_metrics = StreamingMetrics()
+
+
+class StreamingMetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Callback handler recording the time to first token and the tokens per second of the streamed LLM calls
+    in `streaming_metrics`. Each streamed chunk is counted as a token.
+
+    Attributes
+    ----------
+    label : str
+        The label under which the statistics are recorded (e.g. the provider and the model).
+    """
+
+    run_inline = True
+    """Timings are taken in the thread of the call, even for async calls."""
+
+    def __init__(self, label: str, metrics: StreamingMetrics = streaming_metrics):
+        self.label = label
+        self.metrics = metrics
+        # Start time, first token time and token count of the calls in progress
+        self._runs: Dict[UUID, List] = {}
+        self._lock = threading.Lock()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._runs[run_id] = [time.perf_counter(), None, 0]
+
+    def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self.on_llm_start(serialized, [], run_id=run_id, **kwargs)
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None or not token:
+                return
+            if run[1] is None:
+                run[1] = now
+            run[2] += 1
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        end = time.perf_counter()
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None or run[1] is None:
+            # Not streamed
+            return
+        start, first_token, tokens = run
+        self.metrics.record(self.label, first_token - start, tokens, end - first_token)
+        logger.debug("Streamed %s tokens from %s, time to first token: %.3fs.", tokens, self.label, first_token - start)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+
+def get_streaming_callbacks(settings: BaseLLMSetting) -> List[BaseCallbackHandler]:
+    """
+    Returns the callbacks recording the streaming statistics of an LLM.
+    The statistics are recorded for the calls of LLMs with `streaming` enabled, and for the `stream` calls.
+
+    Parameters
+    ----------
+    settings : BaseLLMSetting
+        The LLM settings.
+
+    Returns
+    -------
+    List[BaseCallbackHandler]
+        The callbacks to give to the LLM.
+    """
+    label = f"{settings.provider.value}:{settings.model}" if settings.model else settings.provider.value
+    return [StreamingMetricsCallbackHandler(label)]
@@ -0,0 +1,315 @@
+import time
+import asyncio
+import logging
+import threading
+from itertools import count
+from typing import Any, AsyncIterator, Iterator, List, Literal, Optional
+
+from pydantic import PrivateAttr
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.language_models.chat_models import BaseChatModel, agenerate_from_stream, generate_from_stream
+from langchain_core.callbacks import (
+    AsyncCallbackManager,
+    AsyncCallbackManagerForLLMRun,
+    CallbackManager,
+    CallbackManagerForLLMRun,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _to_message(output: Any) -> AIMessage:
+    """Returns the output of an LLM as an AI message, whether the LLM is a chat model or a text completion model."""
+    if isinstance(output, AIMessage):
+        return output
+    if isinstance(output, BaseMessage):
+        return AIMessage(content=output.content)
+    return AIMessage(content=str(output))
+
+
+def _to_chunk(output: Any) -> ChatGenerationChunk:
+    """Returns a streamed output of an LLM as a chat chunk, whether the LLM is a chat model or not."""
+    if isinstance(output, AIMessageChunk):
+        return ChatGenerationChunk(message=output)
+    if isinstance(output, BaseMessage):
+        return ChatGenerationChunk(message=AIMessageChunk(content=output.content))
+    return ChatGenerationChunk(message=AIMessageChunk(content=str(output)))
+
+
+async def _aiter(items: List[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _child_config(run_manager: Any) -> Optional[dict]:
+    """Returns the config of a replica call, whose callbacks are the children of the router run."""
+    if run_manager is None:
+        return None
+    # The LLM run managers have no `get_child`, the child manager is built as the chain run managers do
+    manager_class = AsyncCallbackManager if isinstance(run_manager, AsyncCallbackManagerForLLMRun) else CallbackManager
+    callbacks = manager_class(handlers=[], parent_run_id=run_manager.run_id)
+    callbacks.set_handlers(run_manager.inheritable_handlers)
+    callbacks.add_tags(run_manager.inheritable_tags)
+    callbacks.add_metadata(run_manager.inheritable_metadata)
+    return {"callbacks": callbacks}
+
+
+class ReplicaHealth:
+    """
+    Health and load statistics of an LLM replica, shared by all the calls routed through the router.
+
+    Attributes
+    ----------
+    outstanding : int
+        Number of calls in progress on the replica.
+    latency : Optional[float]
+        Exponentially weighted moving average of the replica call durations, in seconds.
+    consecutive_failures : int
+        Number of consecutive failed calls.
+    ejected_until : float
+        Monotonic time until which the replica is ejected.
+    """
+
+    LATENCY_SMOOTHING = 0.3
+    """Weight of the last call duration in the latency moving average."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.outstanding = 0
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self._lock = threading.Lock()
+
+    def is_ejected(self) -> bool:
+        return time.monotonic() < self.ejected_until
+
+    def start(self) -> float:
+        with self._lock:
+            self.outstanding += 1
+        return time.monotonic()
+
+    def release(self) -> None:
+        with self._lock:
+            self.outstanding -= 1
+
+    def succeed(self, start: float) -> None:
+        duration = time.monotonic() - start
+        with self._lock:
+            self.outstanding -= 1
+            self.consecutive_failures = 0
+            if self.latency is None:
+                self.latency = duration
+            else:
+                self.latency += self.LATENCY_SMOOTHING * (duration - self.latency)
+
+    def fail(self, max_failures: int, ejection_duration: float) -> None:
+        with self._lock:
+            self.outstanding -= 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= max_failures:
+                self.ejected_until = time.monotonic() + ejection_duration
+                # After the ejection, a single failure ejects the replica again
+                self.consecutive_failures = max_failures - 1
+                logger.warning("LLM replica %s ejected for %ss.", self.name, ejection_duration)
+
+
+class RouterLLM(BaseChatModel):
+    """
+    Chat model routing each call to one of several LLM replicas.
+    The replica is chosen among the healthy ones, depending on its outstanding calls or on its observed latency.
+    A replica failing `max_failures` times in a row is ejected for `ejection_duration` seconds. When a call fails, it
+    is retried on the next replica, then on the fallbacks. Ejected LLMs are only used as a last resort.
+    The messages are passed as is to the replicas, so that the chat replicas keep their roles (the text completion
+    replicas receive them as a single prompt), and the AI message of a chat replica is returned with its metadata.
+
+    Attributes
+    ----------
+    replicas : List[BaseLanguageModel]
+        The LLM replicas among which the calls are balanced.
+    fallbacks : List[BaseLanguageModel]
+        The LLMs used, in order, when no replica is available.
+    strategy : Literal["least_outstanding", "least_latency"]
+        The replica selection strategy.
+    max_failures : int
+        Number of consecutive failures after which an LLM is ejected.
+    ejection_duration : float
+        Time in seconds during which an ejected LLM doesn't receive calls.
+    streaming : bool
+        Whether the calls are streamed from the replicas, even when they are not streamed to the caller.
+    """
+
+    replicas: List[BaseLanguageModel]
+    """The LLM replicas among which the calls are balanced."""
+    fallbacks: List[BaseLanguageModel] = []
+    """The LLMs used, in order, when no replica is available."""
+    strategy: Literal["least_outstanding", "least_latency"] = "least_outstanding"
+    """The replica selection strategy."""
+    max_failures: int = 3
+    """Number of consecutive failures after which an LLM is ejected."""
+    ejection_duration: float = 30.0
+    """Time in seconds during which an ejected LLM doesn't receive calls."""
+    streaming: bool = False
+    """Whether the calls are streamed from the replicas, even when they are not streamed to the caller."""
+
+    _replicas_health: List[ReplicaHealth] = PrivateAttr(default_factory=list)
+    _fallbacks_health: List[ReplicaHealth] = PrivateAttr(default_factory=list)
+    _round_robin: Any = PrivateAttr(default_factory=count)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._replicas_health = [ReplicaHealth(f"replica-{i}") for i in range(len(self.replicas))]
+        self._fallbacks_health = [ReplicaHealth(f"fallback-{i}") for i in range(len(self.fallbacks))]
+
+    @property
+    def _llm_type(self) -> str:
+        return "router"
+
+    @property
+    def health(self) -> List[ReplicaHealth]:
+        """The health statistics of the replicas, then of the fallbacks."""
+        return self._replicas_health + self._fallbacks_health
+
+    def _candidates(self) -> List[tuple]:
+        """Returns the (LLM, health) pairs in the order in which they must be tried."""
+        offset = next(self._round_robin)
+        replicas = list(zip(self.replicas, self._replicas_health))
+
+        def score(indexed):
+            i, (_, health) = indexed
+            latency = health.latency or 0.0
+            # The rotating offset spreads the calls among equally loaded replicas
+            tie_breaker = (i - offset) % len(replicas)
+            if self.strategy == "least_latency":
+                return latency, health.outstanding, tie_breaker
+            return health.outstanding, latency, tie_breaker
+
+        replicas = [replica for _, replica in sorted(enumerate(replicas), key=score)]
+        fallbacks = list(zip(self.fallbacks, self._fallbacks_health))
+
+        ordered = replicas + fallbacks
+        return [c for c in ordered if not c[1].is_ejected()] + [c for c in ordered if c[1].is_ejected()]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.streaming:
+            chunks = []
+            for chunk in self._stream(messages, stop, run_manager, **kwargs):
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                chunks.append(chunk)
+            return generate_from_stream(iter(chunks))
+
+        error = None
+        for llm, health in self._candidates():
+            start = health.start()
+            try:
+                output = llm.invoke(messages, _child_config(run_manager), stop=stop, **kwargs)
+            except Exception as e:
+                health.fail(self.max_failures, self.ejection_duration)
+                logger.warning("LLM %s failed, trying the next one: %s", health.name, e)
+                error = e
+                continue
+            health.succeed(start)
+            return ChatResult(generations=[ChatGeneration(message=_to_message(output))])
+        raise error
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.streaming:
+            chunks = []
+            async for chunk in self._astream(messages, stop, run_manager, **kwargs):
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                chunks.append(chunk)
+            return await agenerate_from_stream(_aiter(chunks))
+
+        error = None
+        for llm, health in self._candidates():
+            start = health.start()
+            try:
+                output = await llm.ainvoke(messages, _child_config(run_manager), stop=stop, **kwargs)
+            except asyncio.CancelledError:
+                health.release()
+                raise
+            except Exception as e:
+                health.fail(self.max_failures, self.ejection_duration)
+                logger.warning("LLM %s failed, trying the next one: %s", health.name, e)
+                error = e
+                continue
+            health.succeed(start)
+            return ChatResult(generations=[ChatGeneration(message=_to_message(output))])
+        raise error
+
+    # The tokens of the streamed chunks are reported to the callbacks by `stream`/`astream`
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        error = None
+        for llm, health in self._candidates():
+            start = health.start()
+            streamed = False
+            try:
+                for output in llm.stream(messages, _child_config(run_manager), stop=stop, **kwargs):
+                    streamed = True
+                    yield _to_chunk(output)
+            except GeneratorExit:
+                # The caller stopped consuming the stream
+                health.release()
+                raise
+            except Exception as e:
+                health.fail(self.max_failures, self.ejection_duration)
+                # The call can only be moved to another LLM if nothing was streamed yet
+                if streamed:
+                    raise
+                logger.warning("LLM %s failed, trying the next one: %s", health.name, e)
+                error = e
+                continue
+            health.succeed(start)
+            return
+        raise error
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        error = None
+        for llm, health in self._candidates():
+            start = health.start()
+            streamed = False
+            try:
+                async for output in llm.astream(messages, _child_config(run_manager), stop=stop, **kwargs):
+                    streamed = True
+                    yield _to_chunk(output)
+            except (GeneratorExit, asyncio.CancelledError):
+                health.release()
+                raise
+            except Exception as e:
+                health.fail(self.max_failures, self.ejection_duration)
+                if streamed:
+                    raise
+                logger.warning("LLM %s failed, trying the next one: %s", health.name, e)
+                error = e
+                continue
+            health.succeed(start)
+            return
+        raise error
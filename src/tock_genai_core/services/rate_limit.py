@@ -0,0 +1,302 @@
+import math
+import time
+import asyncio
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+from pydantic import BaseModel, ConfigDict, Field
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+
+logger = logging.getLogger(__name__)
+
+QUOTA_USAGE = 0.95
+"""Share of the deployment quota used by the limiters, to stay just under the quota."""
+
+BURST_WINDOW = 10.0
+"""Azure OpenAI evaluates the quotas over windows of 10 seconds, so at most this many seconds of quota are burst."""
+
+CHARS_PER_TOKEN = 4
+"""Tokens are estimated from the number of characters when no tiktoken encoding is available."""
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: Optional[str]) -> Any:
+    """Returns the tiktoken encoding of a model, or None if it cannot be loaded (e.g. offline)."""
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("No tiktoken encoding available, tokens are estimated from the text length: %s", e)
+        return None
+
+
+def estimate_tokens(texts: Sequence[str], model: Optional[str] = None) -> int:
+    """
+    Estimates the number of tokens of texts, with tiktoken.
+
+    Parameters
+    ----------
+    texts : Sequence[str]
+        The texts.
+    model : Optional[str]
+        The model whose encoding is used (default: None, the `cl100k_base` encoding).
+
+    Returns
+    -------
+    int
+        The estimated number of tokens.
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return sum(math.ceil(len(text) / CHARS_PER_TOKEN) for text in texts)
+    return sum(len(encoding.encode(text, disallowed_special=())) for text in texts)
+
+
+def estimate_message_tokens(messages: Sequence[BaseMessage], model: Optional[str] = None) -> int:
+    """Estimates the number of prompt tokens of chat messages (with the per message overhead of the chat format)."""
+    contents = [message.content if isinstance(message.content, str) else str(message.content) for message in messages]
+    return estimate_tokens(contents, model) + 4 * len(messages) + 3
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate` units per second, up to `capacity` units.
+    Units are reserved ahead of time: a reservation may drive the bucket into debt, and the caller waits until the
+    debt is paid back. Calls are thus paced in reservation order, whatever the threads or event loops they run on.
+
+    Attributes
+    ----------
+    rate : float
+        The refill rate, in units per second.
+    capacity : float
+        The maximum number of units in the bucket (the allowed burst).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._level = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Reserves units and returns the time in seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._level -= amount
+            return max(0.0, -self._level / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """Gives back reserved units (or reserves more if negative), e.g. when the actual usage is known."""
+        with self._lock:
+            self._level = min(self.capacity, self._level + amount)
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter of a deployment, pacing the requests to stay under its tokens and requests per minute
+    quotas.
+
+    Attributes
+    ----------
+    tpm_limit : Optional[int]
+        The tokens per minute quota.
+    rpm_limit : Optional[int]
+        The requests per minute quota.
+    """
+
+    def __init__(self, tpm_limit: Optional[int] = None, rpm_limit: Optional[int] = None):
+        self.tpm_limit = tpm_limit
+        self.rpm_limit = rpm_limit
+        self._tokens = self._bucket(tpm_limit)
+        self._requests = self._bucket(rpm_limit)
+
+    @staticmethod
+    def _bucket(limit: Optional[int]) -> Optional[TokenBucket]:
+        if not limit:
+            return None
+        rate = limit * QUOTA_USAGE / 60
+        return TokenBucket(rate=rate, capacity=max(1.0, rate * BURST_WINDOW))
+
+    def _reserve(self, tokens: int, requests: int) -> float:
+        delays = [0.0]
+        if self._tokens is not None:
+            delays.append(self._tokens.reserve(tokens))
+        if self._requests is not None:
+            delays.append(self._requests.reserve(requests))
+        return max(delays)
+
+    def acquire(self, tokens: int, requests: int = 1) -> None:
+        """Waits until the requests can be sent without exceeding the quotas."""
+        delay = self._reserve(tokens, requests)
+        if delay:
+            logger.debug("Rate limited, waiting %.3fs.", delay)
+            time.sleep(delay)
+
+    async def aacquire(self, tokens: int, requests: int = 1) -> None:
+        """Waits asynchronously until the requests can be sent without exceeding the quotas."""
+        delay = self._reserve(tokens, requests)
+        if delay:
+            logger.debug("Rate limited, waiting %.3fs.", delay)
+            await asyncio.sleep(delay)
+
+    def record(self, tokens: int) -> None:
+        """Charges tokens used by a request beyond what was reserved (e.g. the generated tokens)."""
+        if self._tokens is not None and tokens:
+            self._tokens.refund(-tokens)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(settings: BaseModel) -> Optional[RateLimiter]:
+    """
+    Returns the rate limiter of the deployment configured by Azure OpenAI settings.
+    Limiters are shared by every model using the same deployment, as the quotas apply to the deployment.
+
+    Parameters
+    ----------
+    settings : BaseModel
+        The Azure OpenAI LLM or embedding settings.
+
+    Returns
+    -------
+    Optional[RateLimiter]
+        The rate limiter, or None if the settings don't define any quota.
+    """
+    if not settings.tpm_limit and not settings.rpm_limit:
+        return None
+
+    key = f"{settings.api_base}|{settings.deployment}|{settings.tpm_limit}|{settings.rpm_limit}"
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(tpm_limit=settings.tpm_limit, rpm_limit=settings.rpm_limit)
+        return _limiters[key]
+
+
+def _completion_tokens(result: ChatResult) -> int:
+    """Returns the number of generated tokens reported by the provider, if any."""
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    return usage.get("completion_tokens") or 0
+
+
+class RateLimitMixin(BaseModel):
+    """
+    Mixin for chat models pacing their calls with a rate limiter.
+    The prompt tokens (plus `max_tokens`, counted by Azure OpenAI when set) are reserved before each call. When
+    `max_tokens` isn't set, the generated tokens are charged once known.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    rate_limiter: Optional[RateLimiter] = Field(default=None, exclude=True)
+    """The rate limiter of the calls."""
+
+    def _reserved_tokens(self, messages: List[BaseMessage]) -> int:
+        return estimate_message_tokens(messages, self.model_name) + (self.max_tokens or 0)
+
+    def _generate(self, messages: List[BaseMessage], *args: Any, **kwargs: Any) -> ChatResult:
+        # Streaming models generate through `_stream`, which is rate limited
+        if self.rate_limiter is None or self.streaming:
+            return super()._generate(messages, *args, **kwargs)
+        self.rate_limiter.acquire(self._reserved_tokens(messages))
+        result = super()._generate(messages, *args, **kwargs)
+        if not self.max_tokens:
+            self.rate_limiter.record(_completion_tokens(result))
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], *args: Any, **kwargs: Any) -> ChatResult:
+        if self.rate_limiter is None or self.streaming:
+            return await super()._agenerate(messages, *args, **kwargs)
+        await self.rate_limiter.aacquire(self._reserved_tokens(messages))
+        result = await super()._agenerate(messages, *args, **kwargs)
+        if not self.max_tokens:
+            self.rate_limiter.record(_completion_tokens(result))
+        return result
+
+    def _stream(self, messages: List[BaseMessage], *args: Any, **kwargs: Any) -> Iterator[Any]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self._reserved_tokens(messages))
+        generated = 0
+        for chunk in super()._stream(messages, *args, **kwargs):
+            generated += 1
+            yield chunk
+        if self.rate_limiter is not None and not self.max_tokens:
+            self.rate_limiter.record(generated)
+
+    async def _astream(self, messages: List[BaseMessage], *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(self._reserved_tokens(messages))
+        generated = 0
+        async for chunk in super()._astream(messages, *args, **kwargs):
+            generated += 1
+            yield chunk
+        if self.rate_limiter is not None and not self.max_tokens:
+            self.rate_limiter.record(generated)
+
+
+class RateLimitedEmbeddings(Embeddings):
+    """
+    Embedding model pacing its calls with a rate limiter.
+
+    Attributes
+    ----------
+    embeddings : Embeddings
+        The embedding model.
+    rate_limiter : RateLimiter
+        The rate limiter of the calls.
+    model : Optional[str]
+        The model whose encoding is used to estimate the tokens.
+    chunk_size : int
+        Maximum number of texts sent by the embedding model in a single request.
+    """
+
+    def __init__(self, embeddings: Embeddings, rate_limiter: RateLimiter, model: Optional[str], chunk_size: int):
+        self.embeddings = embeddings
+        self.rate_limiter = rate_limiter
+        self.model = model
+        self.chunk_size = chunk_size
+
+    def _cost(self, texts: List[str]) -> tuple:
+        return estimate_tokens(texts, self.model), max(1, math.ceil(len(texts) / self.chunk_size))
+
+    def _slices(self, texts: List[str]) -> Iterator[List[str]]:
+        # Each slice is a single request of the embedding model
+        for start in range(0, len(texts), self.chunk_size):
+            yield texts[start : start + self.chunk_size]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embeds the texts request by request, each request waiting for its own share of the quotas."""
+        vectors: List[List[float]] = []
+        for texts_slice in self._slices(texts):
+            self.rate_limiter.acquire(*self._cost(texts_slice))
+            vectors.extend(self.embeddings.embed_documents(texts_slice))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        self.rate_limiter.acquire(*self._cost([text]))
+        return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embeds the texts request by request, each request waiting for its own share of the quotas."""
+        vectors: List[List[float]] = []
+        for texts_slice in self._slices(texts):
+            await self.rate_limiter.aacquire(*self._cost(texts_slice))
+            vectors.extend(await self.embeddings.aembed_documents(texts_slice))
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await self.rate_limiter.aacquire(*self._cost([text]))
+        return await self.embeddings.aembed_query(text)
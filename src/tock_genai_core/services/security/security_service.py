@@ -6,8 +6,6 @@ from tock_genai_core.models.security.security_type import SecretKey
 from tock_genai_core.models.security.raw_secret_key import RawSecretKey
 from tock_genai_core.models.security.aws_secret_key import AwsSecretKey
 from tock_genai_core.models.security.kube_secret_key import KubernetesSecretKey
-from tock_genai_core.utils.aws.aws_secrets_manager_client import AWSSecretsManagerClient
-from tock_genai_core.utils.gcp.gcp_secret_manager_client import GCPSecretManagerClient
 
 
 def get_nested_value(data_dict, keys_str):
@@ -56,9 +54,14 @@ def fetch_secret_key_value(secret_key: SecretKey) -> Optional[Union[str, Dict[st
     if isinstance(secret_key, RawSecretKey):
         return secret_key.secret
     elif isinstance(secret_key, AwsSecretKey):
+        # The cloud SDKs are heavy to import, they are only loaded when a secret of their type is fetched
+        from tock_genai_core.utils.aws.aws_secrets_manager_client import AWSSecretsManagerClient
+
         return AWSSecretsManagerClient().get_secret(secret_key.secret_name)
     elif isinstance(secret_key, KubernetesSecretKey):
         raise NotImplementedError()
     elif isinstance(secret_key, GcpSecretKey):
+        from tock_genai_core.utils.gcp.gcp_secret_manager_client import GCPSecretManagerClient
+
         project_id = os.getenv("GCP_PROJECT_ID")  # Will be None if not set
         return GCPSecretManagerClient(project_id=project_id).get_secret(secret_key.secret_name)
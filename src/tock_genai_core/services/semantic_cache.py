@@ -0,0 +1,271 @@
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from tock_genai_core.models.cache import SemanticCacheSetting
+from tock_genai_core.models.database import MetadataFilter
+from tock_genai_core.services.langchain.factory import factory_registry, get_em_factory, get_vector_db_factory
+from tock_genai_core.services.langchain.factory.registry import settings_fingerprint
+from tock_genai_core.services.llm_cache import _deserialize, _serialize
+
+
+logger = logging.getLogger(__name__)
+
+
+def _prompt_text(prompt: str) -> str:
+    """
+    Returns the text to embed for a cached prompt.
+    Chat model prompts are cached by LangChain as serialized messages: only the contents of the messages are kept.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    contents = [message.get("kwargs", {}).get("content") for message in messages if isinstance(message, dict)]
+    return "\n".join(content for content in contents if isinstance(content, str)) or prompt
+
+
+def _llm_hash(llm_string: str) -> str:
+    """Returns a short digest of the LLM string, so that answers are never shared between models or parameters."""
+    return hashlib.sha256(llm_string.encode("utf-8")).hexdigest()
+
+
+class SemanticCacheMetrics:
+    """
+    Hit rate and latency statistics of a semantic cache.
+
+    Attributes
+    ----------
+    lookups : int
+        Number of lookups.
+    hits : int
+        Number of lookups that returned a cached answer.
+    latency_saved : float
+        Estimated time in seconds saved by the hits (the duration of the LLM calls that produced the returned
+        answers, minus the duration of the lookups).
+    """
+
+    def __init__(self):
+        self.lookups = 0
+        self.hits = 0
+        self.latency_saved = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of lookups that returned a cached answer."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def record(self, hit: bool, saved: float = 0.0) -> None:
+        with self._lock:
+            self.lookups += 1
+            if hit:
+                self.hits += 1
+                self.latency_saved += max(saved, 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.lookups = 0
+            self.hits = 0
+            self.latency_saved = 0.0
+
+
+class InMemorySemanticIndex:
+    """
+    In-process index of the cached answers, searched by cosine similarity.
+    The oldest answers are evicted first once `max_size` is reached.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(self, vector: List[float], scope: Dict[str, str]) -> List[Tuple[Dict[str, Any], float]]:
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        with self._lock:
+            candidates = [
+                (embedding, metadata)
+                for embedding, metadata in self._entries.values()
+                if all(metadata.get(key) == value for key, value in scope.items())
+            ]
+        if not candidates:
+            return []
+        scores = np.stack([embedding for embedding, _ in candidates]) @ query
+        return [(candidates[i][1], float(scores[i])) for i in np.argsort(-scores)]
+
+    def add(self, vector: List[float], metadata: Dict[str, Any]) -> None:
+        embedding = np.asarray(vector, dtype=np.float32)
+        embedding /= np.linalg.norm(embedding) or 1.0
+        with self._lock:
+            self._entries[uuid.uuid4().hex] = (embedding, metadata)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SemanticLLMCache(BaseCache):
+    """
+    LLM answer cache returning the answer of a previous prompt similar enough to the new one.
+    Prompts are embedded with `embeddings`, and the cached answers are stored either in a vector store or in a local
+    in-process index. Answers are scoped by namespace and by LLM (model and generation parameters).
+
+    Attributes
+    ----------
+    embeddings : Embeddings
+        The embedding model used to embed the prompts.
+    vector_store : Optional[VectorStore]
+        The vector store of the cached answers, a local in-process index is used if None.
+    namespace : str
+        The namespace of the cached answers.
+    similarity_threshold : float
+        Minimum similarity for a cached answer to be returned.
+    ttl : Optional[float]
+        Time in seconds after which a cached answer expires.
+    max_size : int
+        Maximum number of answers kept in the local index.
+    metrics : SemanticCacheMetrics
+        The hit rate and latency statistics of the cache.
+    """
+
+    SEARCH_K = 4
+    """Number of neighbours fetched from the vector store for each lookup."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        vector_store: Optional[VectorStore] = None,
+        namespace: str = "default",
+        similarity_threshold: float = 0.95,
+        ttl: Optional[float] = None,
+        max_size: int = 1024,
+    ):
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.namespace = namespace
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.metrics = SemanticCacheMetrics()
+        self._index = InMemorySemanticIndex(max_size=max_size) if vector_store is None else None
+        # Prompts that missed, with their embedding and the start of the lookup, used when the answer is cached
+        self._misses: "OrderedDict[Tuple[str, str], Tuple[Optional[List[float]], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _search(self, prompt: str, llm_string: str) -> Tuple[List[Tuple[Dict[str, Any], float]], List[float]]:
+        scope = {"namespace": self.namespace, "llm": _llm_hash(llm_string)}
+        if self._index is not None:
+            vector = self.embeddings.embed_query(_prompt_text(prompt))
+            return self._index.search(vector, scope), vector
+        # Searches the answers of the scope only, filtered by the vector store
+        documents = self.vector_store.similarity_search_with_relevance_scores(
+            _prompt_text(prompt),
+            k=self.SEARCH_K,
+            filter=[MetadataFilter(field=key, value=value) for key, value in scope.items()],
+        )
+        return [
+            (document.metadata, score)
+            for document, score in documents
+            if all(document.metadata.get(key) == value for key, value in scope.items())
+        ], None
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        start = time.monotonic()
+        try:
+            matches, vector = self._search(prompt, llm_string)
+        except Exception:
+            logger.warning("Semantic cache lookup failed, ignoring the cache.", exc_info=True)
+            self.metrics.record(hit=False)
+            return None
+
+        now = time.time()
+        for metadata, score in matches:
+            if score < self.similarity_threshold:
+                break
+            if self.ttl is not None and now - metadata["created_at"] > self.ttl:
+                continue
+            self.metrics.record(hit=True, saved=metadata.get("latency", 0.0) - (time.monotonic() - start))
+            return _deserialize(metadata["generations"])
+
+        self.metrics.record(hit=False)
+        with self._lock:
+            self._misses[(prompt, llm_string)] = (vector, start)
+            while len(self._misses) > 1024:
+                self._misses.popitem(last=False)
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        with self._lock:
+            vector, start = self._misses.pop((prompt, llm_string), (None, None))
+        metadata = {
+            "namespace": self.namespace,
+            "llm": _llm_hash(llm_string),
+            "generations": _serialize(return_val),
+            "created_at": time.time(),
+            "latency": time.monotonic() - start if start is not None else 0.0,
+        }
+        try:
+            if self._index is not None:
+                self._index.add(vector or self.embeddings.embed_query(_prompt_text(prompt)), metadata)
+            else:
+                self.vector_store.add_texts([_prompt_text(prompt)], metadatas=[metadata])
+        except Exception:
+            logger.warning("Unable to store an answer in the semantic cache.", exc_info=True)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Clears the local index (answers stored in a vector store must be removed from the store itself)."""
+        if self._index is not None:
+            self._index.clear()
+        with self._lock:
+            self._misses.clear()
+
+
+def get_semantic_cache(settings: Optional[SemanticCacheSetting]) -> Optional[SemanticLLMCache]:
+    """
+    Returns the semantic LLM answer cache configured by the settings.
+    Caches are memoized in the factory registry, so that every model configured with the same cache settings
+    shares the same cache.
+
+    Parameters
+    ----------
+    settings : Optional[SemanticCacheSetting]
+        The semantic cache settings.
+
+    Returns
+    -------
+    Optional[SemanticLLMCache]
+        The semantic LLM answer cache, or None if the settings are None.
+    """
+    if settings is None:
+        return None
+
+    def build() -> SemanticLLMCache:
+        return SemanticLLMCache(
+            embeddings=get_em_factory(settings.em_settings).get_model(),
+            vector_store=(
+                get_vector_db_factory(settings.db_settings, settings.em_settings).get_vector_store()
+                if settings.db_settings
+                else None
+            ),
+            namespace=settings.namespace,
+            similarity_threshold=settings.similarity_threshold,
+            ttl=settings.ttl,
+            max_size=settings.max_size,
+        )
+
+    return factory_registry.get_or_create(f"semantic_cache:{settings_fingerprint(settings)}", build, settings)
@@ -0,0 +1,284 @@
+import json
+import asyncio
+import logging
+import threading
+from weakref import WeakKeyDictionary
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import aiohttp
+import requests
+from pydantic import PrivateAttr
+from text_generation.errors import parse_error
+from text_generation.types import Parameters, Request, StreamResponse
+from langchain_core.outputs import Generation, GenerationChunk, LLMResult
+from langchain_core.language_models.llms import LLM
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+
+
+logger = logging.getLogger(__name__)
+
+
+def _trim(text: str, stop_sequences: List[str]) -> str:
+    """Removes the stop sequence ending the generated text, and what follows it."""
+    for stop_sequence in stop_sequences:
+        if stop_sequence in text:
+            text = text[: text.index(stop_sequence)]
+    return text
+
+
+def _error(status: int, body: str) -> Exception:
+    """Parses the error of a response, whose body isn't JSON when it comes from a proxy (e.g. a 502 page)."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict) or "error" not in payload:
+        payload = {"error": body}
+    return parse_error(status, payload)
+
+
+class TextGenerationInferenceLLM(LLM):
+    """
+    LLM calling a Hugging Face Text Generation Inference (TGI) server.
+    The HTTP connections are kept alive and reused across calls: a `requests` session serves the sync calls, and an
+    `aiohttp` session (one per event loop) serves the async calls. The request and response payloads are those of
+    the `text-generation` client. Async batches (`agenerate`, `abatch`) are sent concurrently, so that TGI
+    continuous batching processes them together.
+
+    Attributes
+    ----------
+    inference_server_url : str
+        The TGI server URL.
+    max_new_tokens : int
+        Maximum number of generated tokens.
+    temperature : Optional[float]
+        The sampling temperature, greedy decoding is used if 0 or None.
+    repetition_penalty : Optional[float]
+        The repetition penalty, 1.0 means no penalty.
+    top_k : Optional[int]
+        The number of highest probability tokens kept for top-k filtering.
+    top_p : Optional[float]
+        The cumulative probability of the tokens kept for nucleus sampling.
+    stop_sequences : List[str]
+        The sequences stopping the generation.
+    streaming : bool
+        Whether the calls are streamed from the server.
+    timeout : float
+        Maximum time in seconds of a call.
+    connect_timeout : Optional[float]
+        Maximum time in seconds to open a connection.
+    max_connections : int
+        Maximum number of connections kept open to the server.
+    headers : Dict[str, str]
+        The headers sent with each request.
+    model_kwargs : Dict[str, Any]
+        Additional generation parameters.
+    """
+
+    inference_server_url: str
+    """The TGI server URL."""
+    max_new_tokens: int = 256
+    """Maximum number of generated tokens."""
+    temperature: Optional[float] = None
+    """The sampling temperature, greedy decoding is used if 0 or None."""
+    repetition_penalty: Optional[float] = None
+    """The repetition penalty, 1.0 means no penalty."""
+    top_k: Optional[int] = None
+    """The number of highest probability tokens kept for top-k filtering."""
+    top_p: Optional[float] = None
+    """The cumulative probability of the tokens kept for nucleus sampling."""
+    stop_sequences: List[str] = []
+    """The sequences stopping the generation."""
+    streaming: bool = False
+    """Whether the calls are streamed from the server."""
+    timeout: float = 120.0
+    """Maximum time in seconds of a call."""
+    connect_timeout: Optional[float] = None
+    """Maximum time in seconds to open a connection."""
+    max_connections: int = 100
+    """Maximum number of connections kept open to the server."""
+    headers: Dict[str, str] = {}
+    """The headers sent with each request."""
+    model_kwargs: Dict[str, Any] = {}
+    """Additional generation parameters."""
+
+    _session: Optional[requests.Session] = PrivateAttr(default=None)
+    _async_sessions: Any = PrivateAttr(default_factory=WeakKeyDictionary)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "text_generation_inference"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"inference_server_url": self.inference_server_url, **self._default_params}
+
+    @property
+    def _default_params(self) -> Dict[str, Any]:
+        return {
+            "max_new_tokens": self.max_new_tokens,
+            "temperature": self.temperature,
+            "repetition_penalty": self.repetition_penalty,
+            "top_k": self.top_k,
+            "top_p": self.top_p,
+            **self.model_kwargs,
+        }
+
+    def _request(self, prompt: str, stop: Optional[List[str]], stream: bool, **kwargs: Any) -> Dict[str, Any]:
+        params = {**self._default_params, **kwargs}
+        params["stop"] = self.stop_sequences + (stop or [])
+        if not params.get("temperature"):
+            # TGI only accepts strictly positive temperatures, greedy decoding is used instead
+            params["temperature"] = None
+        else:
+            params.setdefault("do_sample", True)
+        return Request(inputs=prompt, stream=stream, parameters=Parameters(**params)).model_dump()
+
+    def _get_session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_connections)
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+                self._session.headers.update(self.headers)
+            return self._session
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._async_sessions.get(loop)
+            if session is None or session.closed:
+                session = aiohttp.ClientSession(
+                    headers=self.headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout),
+                    connector=aiohttp.TCPConnector(limit=self.max_connections),
+                )
+                self._async_sessions[loop] = session
+            return session
+
+    @property
+    def _timeouts(self) -> Any:
+        return (self.connect_timeout, self.timeout) if self.connect_timeout else self.timeout
+
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        if self.streaming:
+            return "".join(chunk.text for chunk in self._stream(prompt, stop, run_manager, **kwargs))
+
+        request = self._request(prompt, stop, stream=False, **kwargs)
+        resp = self._get_session().post(self.inference_server_url, json=request, timeout=self._timeouts)
+        if resp.status_code != 200:
+            raise _error(resp.status_code, resp.text)
+        payload = resp.json()
+        return _trim(payload[0]["generated_text"], request["parameters"]["stop"])
+
+    async def _acall(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        if self.streaming:
+            return "".join([chunk.text async for chunk in self._astream(prompt, stop, run_manager, **kwargs)])
+
+        request = self._request(prompt, stop, stream=False, **kwargs)
+        async with self._get_async_session().post(self.inference_server_url, json=request) as resp:
+            if resp.status != 200:
+                raise _error(resp.status, await resp.text())
+            payload = await resp.json()
+        return _trim(payload[0]["generated_text"], request["parameters"]["stop"])
+
+    async def _agenerate(
+        self,
+        prompts: List[str],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> LLMResult:
+        texts = await asyncio.gather(*(self._acall(prompt, stop, run_manager, **kwargs) for prompt in prompts))
+        return LLMResult(generations=[[Generation(text=text)] for text in texts])
+
+    @staticmethod
+    def _chunk(line: bytes, status: int, stop_sequences: List[str]) -> Optional[tuple]:
+        """Parses a server-sent event into (text, stopped), or returns None if the line isn't an event."""
+        payload = line.decode("utf-8").strip()
+        if not payload.startswith("data:"):
+            return None
+        data = json.loads(payload[len("data:") :])
+        if "error" in data:
+            raise parse_error(status, data)
+        token = StreamResponse(**data).token
+        if token.special:
+            return "", False
+        for stop_sequence in stop_sequences:
+            if stop_sequence in token.text:
+                return token.text[: token.text.index(stop_sequence)], True
+        return token.text, False
+
+    def _stream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[GenerationChunk]:
+        request = self._request(prompt, stop, stream=True, **kwargs)
+        with self._get_session().post(
+            self.inference_server_url, json=request, timeout=self._timeouts, stream=True
+        ) as resp:
+            if resp.status_code != 200:
+                raise _error(resp.status_code, resp.text)
+            for line in resp.iter_lines():
+                parsed = self._chunk(line, resp.status_code, request["parameters"]["stop"])
+                if parsed is None:
+                    continue
+                text, stopped = parsed
+                if text:
+                    chunk = GenerationChunk(text=text)
+                    if run_manager:
+                        run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                    yield chunk
+                if stopped:
+                    return
+
+    async def _astream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[GenerationChunk]:
+        request = self._request(prompt, stop, stream=True, **kwargs)
+        async with self._get_async_session().post(self.inference_server_url, json=request) as resp:
+            if resp.status != 200:
+                raise _error(resp.status, await resp.text())
+            async for line in resp.content:
+                parsed = self._chunk(line, resp.status, request["parameters"]["stop"])
+                if parsed is None:
+                    continue
+                text, stopped = parsed
+                if text:
+                    chunk = GenerationChunk(text=text)
+                    if run_manager:
+                        await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                    yield chunk
+                if stopped:
+                    return
+
+    async def aclose(self) -> None:
+        """Closes the connections of the current event loop (and the sync connections)."""
+        with self._lock:
+            session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        if session is not None:
+            await session.close()
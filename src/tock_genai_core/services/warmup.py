@@ -0,0 +1,212 @@
+import time
+import logging
+from typing import Any, Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+
+from pydantic import BaseModel
+from langchain_core.documents import Document
+
+from tock_genai_core.models.llm import LLMProvider
+from tock_genai_core.models.warmup import WarmupSetting
+from tock_genai_core.services.langchain.factory import (
+    get_compressor_factory,
+    get_em_factory,
+    get_guardrail_factory,
+    get_llm_factory,
+    get_vector_db_factory,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PROBE_TEXT = "ping"
+"""Text sent to the providers by the probes."""
+
+# Generation parameters limiting the LLM probes to a single token.
+LLM_PROBE_KWARGS = {
+    LLMProvider.TGI: {"max_new_tokens": 1},
+    LLMProvider.AzureOpenAI: {"max_tokens": 1},
+    LLMProvider.Vllm: {"max_tokens": 1},
+}
+
+
+class WarmupResult(BaseModel):
+    """
+    The warmup result of a single provider.
+
+    Attributes
+    ----------
+    component : str
+        The kind of component warmed up (`llm`, `em`, `vector_db`, `compressor` or `guardrail`).
+    provider : str
+        The provider of the component.
+    build_duration : Optional[float]
+        Time in seconds spent resolving the secrets and building the client, if it was built.
+    probe_duration : Optional[float]
+        Time in seconds spent on the probe call, if it was sent.
+    success : bool
+        Whether the component was built (and probed) successfully.
+    error : Optional[str]
+        The error raised while warming up the component, if any.
+    """
+
+    component: str
+    provider: str
+    build_duration: Optional[float] = None
+    probe_duration: Optional[float] = None
+    success: bool = False
+    error: Optional[str] = None
+
+
+class WarmupReport(BaseModel):
+    """
+    The timing report of a warmup.
+
+    Attributes
+    ----------
+    results : List[WarmupResult]
+        The warmup result of each provider.
+    duration : float
+        Total time in seconds spent warming up.
+
+    Methods
+    -------
+    ready() -> bool
+        Returns whether every provider was warmed up successfully.
+    """
+
+    results: List[WarmupResult]
+    duration: float
+
+    @property
+    def ready(self) -> bool:
+        """Returns whether every provider was warmed up successfully."""
+        return all(result.success for result in self.results)
+
+
+class _WarmupTask:
+    """A provider to warm up: how to build its client and how to probe it."""
+
+    def __init__(self, component: str, provider: str, build: Callable[[], Any], probe: Callable[[Any], Any]):
+        self.result = WarmupResult(component=component, provider=provider)
+        self.build = build
+        self.probe = probe
+
+    def run(self, probe: bool) -> WarmupResult:
+        try:
+            start = time.perf_counter()
+            instance = self.build()
+            self.result.build_duration = time.perf_counter() - start
+
+            if probe:
+                start = time.perf_counter()
+                self.probe(instance)
+                self.result.probe_duration = time.perf_counter() - start
+
+            self.result.success = True
+        except Exception as e:
+            logger.warning("Warmup of %s %s failed: %s", self.result.component, self.result.provider, e)
+            self.result.error = repr(e)
+        return self.result
+
+
+def _get_tasks(settings: WarmupSetting) -> List[_WarmupTask]:
+    """Lists the warmup tasks of every provider of the settings bundle."""
+    tasks = []
+    for llm_settings in settings.llm:
+        probe_kwargs = LLM_PROBE_KWARGS.get(llm_settings.provider, {})
+        tasks.append(
+            _WarmupTask(
+                "llm",
+                llm_settings.provider.value,
+                get_llm_factory(llm_settings).get_model,
+                lambda model, kwargs=probe_kwargs: model.invoke(PROBE_TEXT, **kwargs),
+            )
+        )
+    for em_settings in settings.em:
+        tasks.append(
+            _WarmupTask(
+                "em",
+                em_settings.provider.value,
+                get_em_factory(em_settings).get_model,
+                lambda model: model.embed_query(PROBE_TEXT),
+            )
+        )
+    for vector_db in settings.vector_db:
+        tasks.append(
+            _WarmupTask(
+                "vector_db",
+                vector_db.db_settings.provider.value,
+                get_vector_db_factory(vector_db.db_settings, vector_db.em_settings).get_vector_store,
+                lambda store: store.similarity_search(PROBE_TEXT, k=1),
+            )
+        )
+    for compressor_settings in settings.compressor:
+        tasks.append(
+            _WarmupTask(
+                "compressor",
+                compressor_settings.provider.value,
+                get_compressor_factory(compressor_settings).get_compressor,
+                lambda compressor: compressor.compress_documents([Document(page_content=PROBE_TEXT)], PROBE_TEXT),
+            )
+        )
+    for guardrail_settings in settings.guardrail:
+        tasks.append(
+            _WarmupTask(
+                "guardrail",
+                guardrail_settings.provider.value,
+                get_guardrail_factory(guardrail_settings).get_parser,
+                lambda parser: parser.parse(PROBE_TEXT),
+            )
+        )
+    return tasks
+
+
+def warmup(
+    settings: WarmupSetting,
+    probe: bool = True,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> WarmupReport:
+    """
+    Warms up the configured providers concurrently.
+    For each provider, the secrets are resolved and the client is built through the factories (so that it is memoized
+    in the factory registry), then a cheap probe is sent to open the connections.
+
+    Parameters
+    ----------
+    settings : WarmupSetting
+        The bundle of providers to warm up.
+    probe : bool
+        Whether to send a probe to each provider once its client is built (default: True).
+    max_workers : Optional[int]
+        Maximum number of providers warmed up at the same time (default: None, all of them).
+    timeout : Optional[float]
+        Maximum time in seconds to wait for the warmup. Providers not warmed up in time are reported as failed.
+
+    Returns
+    -------
+    WarmupReport
+        The timing report of the warmup. `report.ready` is True only if every provider was warmed up successfully.
+    """
+    start = time.perf_counter()
+    tasks = _get_tasks(settings)
+    if not tasks:
+        return WarmupReport(results=[], duration=0.0)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(tasks), thread_name_prefix="warmup")
+    try:
+        futures = [executor.submit(task.run, probe) for task in tasks]
+        for _ in as_completed(futures, timeout=timeout):
+            pass
+    except FutureTimeoutError:
+        for future, task in zip(futures, tasks):
+            if not future.done():
+                task.result.error = "Warmup timed out."
+        logger.warning("Warmup timed out after %s seconds.", timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    report = WarmupReport(results=[task.result.model_copy() for task in tasks], duration=time.perf_counter() - start)
+    logger.info("Warmup of %s providers done in %.3fs (ready: %s).", len(report.results), report.duration, report.ready)
+    return report
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy imports
+
+Helpers to defer the import of provider modules (and of their heavy SDKs) until they are actually used.
+
+Authors:
+    * Baptiste Le Goff: baptiste.le-goff@arkea.com
+    * Killian Mahé: killian.mahe@partnre.com
+    * Luigi Bokalli: luigi.bokalli@partnre.com
+    * Noé Chabanon: noe.chabanon@partnre.com
+"""
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict
+
+
+def lazy_getattr(module_name: str, attributes: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Builds a module level `__getattr__` (PEP 562) importing the given attributes on first access.
+
+    Parameters
+    ----------
+    module_name : str
+        The name of the module defining the `__getattr__`, used to resolve relative module paths.
+    attributes : Dict[str, str]
+        The lazily imported attributes, mapped to the (relative or absolute) path of the module defining them.
+
+    Returns
+    -------
+    Callable[[str], Any]
+        The `__getattr__` function of the module.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(import_module(attributes[name], module_name), name)
+        # Cache the attribute on the module, so that next accesses don't go through __getattr__
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    return __getattr__
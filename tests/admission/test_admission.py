@@ -0,0 +1,158 @@
+import time
+import asyncio
+import threading
+
+from typing import Any, Iterator
+
+import pytest
+from langchain_core.outputs import GenerationChunk
+from langchain_core.language_models.llms import LLM
+
+from tock_genai_core.models.admission import AdmissionSetting, Priority
+from tock_genai_core.models.embedding import BloomZEMSetting, EMProvider
+from tock_genai_core.services.langchain.factory import get_em_factory
+from tock_genai_core.services.admission import (
+    AdmissionControlMixin,
+    AdmissionControlledEmbeddings,
+    AdmissionController,
+    AdmissionRejectedError,
+    admission_priority,
+    get_admission_controller,
+)
+
+
+class FakeLLM(LLM):
+    """Fake streaming LLM."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _call(self, prompt: str, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> str:
+        return "hello"
+
+    def _stream(self, prompt: str, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> Iterator:
+        yield GenerationChunk(text="hello")
+
+
+class ManagedFakeLLM(AdmissionControlMixin, FakeLLM):
+    """Fake streaming LLM with admission control."""
+
+
+def test_admission_controller__should_admit_by_priority():
+    """Test for AdmissionController handing released slots over by priority class"""
+    controller = AdmissionController("test", max_in_flight=1)
+    admitted = []
+
+    def call(priority):
+        with admission_priority(priority), controller.slot():
+            admitted.append(priority)
+
+    with controller.slot():
+        threads = [
+            threading.Thread(target=call, args=(priority,)) for priority in (Priority.Batch, Priority.Interactive)
+        ]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        assert controller.queue_size == 2
+    for thread in threads:
+        thread.join()
+
+    assert admitted == [Priority.Interactive, Priority.Batch]
+    assert controller.metrics() == {
+        "in_flight": 0,
+        "queue_size": 0,
+        "admitted": 3,
+        "queued": 2,
+        "rejected": 0,
+        "timed_out": 0,
+    }
+
+
+def test_admission_controller__should_reject_calls():
+    """Test for AdmissionController rejecting calls when the queue is full or after the queue timeout"""
+    controller = AdmissionController("test", max_in_flight=1, max_queue=0, queue_timeout=0.05)
+
+    async def wait():
+        await controller.aacquire()
+
+    with controller.slot():
+        with pytest.raises(AdmissionRejectedError):
+            controller.acquire()
+        controller.max_queue = 1
+        with pytest.raises(AdmissionRejectedError):
+            asyncio.run(wait())
+
+    assert controller.rejected == 1
+    assert controller.timed_out == 1
+    assert controller.in_flight == 0
+
+
+def test_admission_control_mixin__should_limit_llm_calls():
+    """Test for AdmissionControlMixin sending sync, async and streamed calls through the controller"""
+    controller = AdmissionController("test", max_in_flight=1)
+    llm = ManagedFakeLLM(admission_controller=controller)
+
+    llm.invoke("prompt")
+    asyncio.run(llm.ainvoke("prompt"))
+    list(llm.stream("prompt"))
+
+    assert controller.admitted == 3
+    assert controller.in_flight == 0
+
+
+def test_admission_control_mixin__should_not_share_the_slot_of_an_open_stream():
+    """Test for AdmissionControlMixin counting the calls made while a stream of the same context is open"""
+    controller = AdmissionController("test", max_in_flight=1, queue_timeout=0.05)
+    llm = ManagedFakeLLM(admission_controller=controller)
+
+    async def astream():
+        async for _ in llm.astream("prompt"):
+            with pytest.raises(AdmissionRejectedError):
+                await llm.ainvoke("prompt")
+
+    for _ in llm.stream("prompt"):
+        with pytest.raises(AdmissionRejectedError):
+            llm.invoke("prompt")
+        with pytest.raises(AdmissionRejectedError):
+            list(llm.stream("prompt"))
+    asyncio.run(astream())
+
+    assert controller.timed_out == 3
+    assert controller.in_flight == 0
+
+
+def test_get_admission_controller__should_share_a_named_controller():
+    """Test for get_admission_controller sharing a named controller, and rejecting conflicting limits"""
+    settings = [
+        BloomZEMSetting(
+            provider=EMProvider.BloomZ,
+            api_base=f"http://{host}.com",
+            pooling="mean",
+            admission=AdmissionSetting(name="shared", max_in_flight=max_in_flight),
+        )
+        for host, max_in_flight in [("first", 2), ("second", 2), ("third", 3)]
+    ]
+
+    assert get_admission_controller(settings[0].admission, settings[0]) is get_admission_controller(
+        settings[1].admission, settings[1]
+    )
+    with pytest.raises(ValueError):
+        get_admission_controller(settings[2].admission, settings[2])
+
+
+def test_get_model__should_configure_admission():
+    """Test for the admission control configuration in the factories"""
+    settings = BloomZEMSetting(
+        provider=EMProvider.BloomZ,
+        api_base="http://api.com",
+        pooling="mean",
+        admission=AdmissionSetting(name="bloomz", max_in_flight=4),
+    )
+
+    model = get_em_factory(settings).get_model()
+
+    assert isinstance(model, AdmissionControlledEmbeddings)
+    assert model.admission_controller.name == "bloomz"
+    assert model.admission_controller.max_in_flight == 4
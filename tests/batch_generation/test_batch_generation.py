@@ -0,0 +1,45 @@
+import json
+
+from tock_genai_core.models.llm import LLMProvider, VllmSetting
+from tock_genai_core.services.batch_generation import generate_batch
+from tock_genai_core.services.langchain.factory.llm.vllm_factory import ManagedVLLMOpenAI
+
+
+def test_generate_batch__should_resume_from_checkpoint(tmp_path, monkeypatch):
+    """Test for generate_batch grouping the prompts by prefix, checkpointing and resuming"""
+    calls = []
+    failing = {"Summarize B: 2"}
+
+    def invoke(self, prompt, **kwargs):
+        calls.append(prompt)
+        if prompt in failing:
+            raise RuntimeError("Server unavailable.")
+        return prompt.upper()
+
+    monkeypatch.setattr(ManagedVLLMOpenAI, "invoke", invoke)
+    settings = VllmSetting(provider=LLMProvider.Vllm, model="model", api_base="http://api.com")
+    prompts = ["Summarize B: 1", "Summarize A: 1", "Summarize B: 2", "Summarize A: 2"]
+    output_path = str(tmp_path / "output.jsonl")
+
+    report = generate_batch(settings, prompts, output_path, max_concurrency=1)
+
+    assert calls == ["Summarize A: 1", "Summarize A: 2", "Summarize B: 1", "Summarize B: 2"]
+    assert (report.total, report.skipped, report.succeeded, report.failed) == (4, 0, 3, 1)
+
+    # Simulates an interruption in the middle of a line
+    with open(output_path, "a", encoding="utf-8") as output:
+        output.write('{"id": "3", "out')
+    failing.clear()
+    calls.clear()
+    report = generate_batch(settings, prompts, output_path, max_concurrency=2)
+
+    assert calls == ["Summarize B: 2"]
+    assert (report.total, report.skipped, report.succeeded, report.failed) == (4, 3, 1, 0)
+    with open(output_path, encoding="utf-8") as output:
+        records = [json.loads(line) for line in output if line.strip().endswith("}")]
+    assert {record["id"]: record.get("output") for record in records if "output" in record} == {
+        "0": "SUMMARIZE B: 1",
+        "1": "SUMMARIZE A: 1",
+        "2": "SUMMARIZE B: 2",
+        "3": "SUMMARIZE A: 2",
+    }
@@ -0,0 +1,140 @@
+import time
+import asyncio
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from tock_genai_core.models.database import FanOutSetting, OpenSearchSetting, PGVectorSetting, VectorDBProvider
+from tock_genai_core.models.embedding import BloomZEMSetting, EMProvider
+from tock_genai_core.models.security.raw_secret_key import RawSecretKey
+from tock_genai_core.services.langchain.factory import get_vector_db_factory
+from tock_genai_core.services.database.fan_out import FanOutVectorStore
+from tock_genai_core.services.database.opensearch import relevance_score_fn
+
+EMBEDDING = DeterministicFakeEmbedding(size=8)
+
+
+class Source(InMemoryVectorStore):
+    """In-memory source, with cosine relevance scores and an optional delay."""
+
+    def __init__(self, texts, delay=0.0, scale=1.0):
+        super().__init__(embedding=EMBEDDING)
+        self.delay = delay
+        self.scale = scale
+        self.add_texts(texts)
+
+    def _select_relevance_score_fn(self):
+        return lambda score: self.scale * (score + 1) / 2
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, **kwargs):
+        time.sleep(self.delay)
+        return super().similarity_search_with_score_by_vector(embedding, k=k, **kwargs)
+
+
+def test_fan_out__should_merge_the_sources_by_relevance():
+    """Test for FanOutVectorStore merging the results of its sources into a global top-k by relevance score"""
+    store = FanOutVectorStore(
+        stores=[Source(["apple", "banana"]), Source(["cherry", "apple"], scale=0.5)], embedding=EMBEDDING
+    )
+
+    results = store.similarity_search_with_relevance_scores("apple", k=3)
+
+    assert [document.page_content for document, _ in results][:1] == ["apple"]
+    assert len(results) == 3 and results[0][1] == pytest.approx(1.0)
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+    assert asyncio.run(store.asimilarity_search("apple", k=3)) == [document for document, _ in results]
+
+
+def test_fan_out__should_leave_out_slow_and_failing_sources():
+    """Test for FanOutVectorStore answering with the sources that answered in time"""
+    failing = Source(["banana"])
+    failing.similarity_search_with_score_by_vector = None
+    store = FanOutVectorStore(
+        stores=[Source(["apple"]), Source(["apple pie"], delay=2), failing], embedding=EMBEDDING, timeout=0.5
+    )
+
+    async def asearch():
+        start = time.perf_counter()
+        return await store.asimilarity_search("apple", k=3), time.perf_counter() - start
+
+    start = time.perf_counter()
+    sync_results = store.similarity_search("apple", k=3)
+    sync_duration = time.perf_counter() - start
+    async_results, async_duration = asyncio.run(asearch())
+
+    assert sync_duration < 1.5 and async_duration < 1.5
+    assert [document.page_content for document in sync_results] == ["apple"]
+    assert [document.page_content for document in async_results] == ["apple"]
+    with pytest.raises(RuntimeError):
+        FanOutVectorStore(stores=[failing], embedding=EMBEDDING).similarity_search("apple")
+
+
+def test_fan_out_factory__should_build_the_sources():
+    """Test for FanOutFactory building the vector store of each source with the shared embedding settings"""
+    em_settings = BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://bloomz", pooling="")
+    db_settings = FanOutSetting(
+        sources=[
+            OpenSearchSetting(
+                provider=VectorDBProvider.OpenSearch,
+                db_url="http://localhost",
+                index="faq",
+                use_ssl=False,
+                verify_certs=False,
+                username=RawSecretKey(value="user"),
+                password=RawSecretKey(value="password"),
+            ),
+            PGVectorSetting(
+                provider=VectorDBProvider.PGVector,
+                db_url="localhost",
+                namespace="namespace",
+                index="guides",
+                async_mode=True,
+            ),
+        ],
+        timeout=2,
+    )
+
+    store = get_vector_db_factory(db_settings, em_settings).get_vector_store()
+
+    assert isinstance(store, FanOutVectorStore) and store.timeout == 2
+    assert [type(source).__name__ for source in store.stores] == ["ManagedOpenSearchVectorSearch", "ManagedPGVector"]
+    assert store.stores[1].collection_name == "guides"
+
+
+def test_fan_out__should_merge_opensearch_and_pgvector_on_the_same_scale():
+    """Test for FanOutVectorStore merging OpenSearch k-NN scores and PGVector distances as comparable relevances"""
+    em_settings = BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://bloomz", pooling="", space_type="cosine")
+    opensearch_settings = OpenSearchSetting(
+        provider=VectorDBProvider.OpenSearch,
+        db_url="http://localhost",
+        index="faq",
+        use_ssl=False,
+        verify_certs=False,
+        username=RawSecretKey(value="user"),
+        password=RawSecretKey(value="password"),
+    )
+    pgvector_settings = PGVectorSetting(
+        provider=VectorDBProvider.PGVector, db_url="localhost", namespace="namespace", index="guides", async_mode=True
+    )
+    opensearch = get_vector_db_factory(opensearch_settings, em_settings).get_vector_store()
+    pgvector = get_vector_db_factory(pgvector_settings, em_settings).get_vector_store()
+    # nmslib scores 1 / (1 + d) and PGVector returns d, with d the cosine distance
+    opensearch.similarity_search_with_score_by_vector = lambda embedding, k=4, **kwargs: [
+        (Document(page_content="faq 0.9"), 1 / (1 + 0.1)),
+        (Document(page_content="faq 0.5"), 1 / (1 + 0.5)),
+    ]
+    pgvector.similarity_search_with_score_by_vector = lambda embedding, k=4, **kwargs: [
+        (Document(page_content="guide 0.7"), 0.3),
+        (Document(page_content="guide 0.2"), 0.8),
+    ]
+    store = FanOutVectorStore(stores=[opensearch, pgvector], embedding=EMBEDDING)
+
+    results = store.similarity_search_with_score_by_vector([0.0] * 8, k=4)
+
+    assert [document.page_content for document, _ in results] == ["faq 0.9", "guide 0.7", "faq 0.5", "guide 0.2"]
+    assert [score for _, score in results] == pytest.approx([0.9, 0.7, 0.5, 0.2])
+    assert relevance_score_fn("cosine", "lucene")((2 - 0.1) / 2) == pytest.approx(0.9)
+    assert relevance_score_fn("l2", "faiss")(1 / (1 + 0.5)) == pytest.approx(0.5)
+    assert relevance_score_fn("inner", "nmslib")(1.8) == pytest.approx(0.8)
@@ -0,0 +1,161 @@
+import json
+import os
+import asyncio
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from tock_genai_core.models.database import LocalSetting, MetadataFilter, VectorDBProvider
+from tock_genai_core.models.embedding import BloomZEMSetting, EMProvider
+from tock_genai_core.services.langchain.factory import get_vector_db_factory
+from tock_genai_core.services.database.local import LocalVectorStore
+
+EMBEDDING = DeterministicFakeEmbedding(size=16)
+
+
+def random_vectors(count, dimension=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dimension)).astype(np.float32)
+
+
+@pytest.mark.parametrize("metric", ["cosine", "l2", "inner"])
+def test_local_vector_store__should_search_exactly(metric):
+    """Test for LocalVectorStore returning the nearest vectors by brute force, nearest first"""
+    vectors = random_vectors(200)
+    store = LocalVectorStore(embedding=EMBEDDING, metric=metric)
+    store.add_embeddings([str(i) for i in range(200)], vectors.tolist(), ids=[str(i) for i in range(200)])
+    query = random_vectors(1, seed=1)[0]
+
+    results = store.similarity_search_with_score_by_vector(query.tolist(), k=5)
+
+    if metric == "cosine":
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = 1 - normalized @ (query / np.linalg.norm(query))
+    elif metric == "l2":
+        expected = np.linalg.norm(vectors - query, axis=1)
+    else:
+        expected = -(vectors @ query)
+    assert [document.id for document, _ in results] == [str(i) for i in np.argsort(expected)[:5]]
+    assert [score for _, score in results] == pytest.approx(np.sort(expected)[:5], abs=1e-4)
+
+
+def test_local_vector_store__should_filter_overwrite_and_delete():
+    """Test for LocalVectorStore filtering by metadata, overwriting existing ids and keeping its matrix contiguous"""
+    store = LocalVectorStore.from_texts(
+        ["apple", "banana", "cherry"],
+        EMBEDDING,
+        metadatas=[{"source": "faq"}, {"source": "guide"}, {"source": "faq"}],
+        ids=["a", "b", "c"],
+    )
+    faq = [MetadataFilter(field="source", value="faq")]
+
+    assert {document.id for document in store.similarity_search("banana", k=3, filter=faq)} == {"a", "c"}
+    assert store.similarity_search("cherry", k=3, filter=faq)[0].id == "c"
+    assert store.similarity_search("cherry", k=1, filter=lambda document: document.id != "c")[0].id != "c"
+
+    store.add_texts(["blueberry"], metadatas=[{"source": "faq"}], ids=["b"])
+    store.delete(["a"])
+
+    assert len(store) == 2
+    assert {document.id: document.page_content for document in store.get_by_ids(["a", "b", "c"])} == {
+        "b": "blueberry",
+        "c": "cherry",
+    }
+    assert store.similarity_search("blueberry", k=1)[0].page_content == "blueberry"
+    assert asyncio.run(store.asimilarity_search_with_relevance_scores("cherry", k=1))[0][1] == pytest.approx(1.0)
+
+
+def test_local_vector_store__should_load_a_memory_mapped_snapshot(tmp_path):
+    """Test for LocalVectorStore loading a snapshot as a read-only memory-mapped matrix"""
+    store = LocalVectorStore.from_texts(["apple", "banana"], EMBEDDING, metadatas=[{"n": 1}, {"n": 2}])
+    store.snapshot(str(tmp_path), name="faq")
+
+    loaded = LocalVectorStore.load(str(tmp_path), EMBEDDING, name="faq", read_only=True)
+
+    assert isinstance(loaded._matrix, np.memmap)
+    assert sorted(os.listdir(tmp_path)) == sorted(["faq.json", f"faq.{loaded_version(tmp_path, 'faq')}.npy"])
+    assert loaded.similarity_search_with_score("banana", k=2) == store.similarity_search_with_score("banana", k=2)
+    with pytest.raises(ValueError):
+        loaded.add_texts(["cherry"])
+
+
+def loaded_version(path, name):
+    with open(os.path.join(path, f"{name}.json"), encoding="utf-8") as file:
+        return json.load(file)["version"]
+
+
+def test_local_vector_store__should_load_the_matrix_of_the_snapshot_documents(tmp_path):
+    """Test for LocalVectorStore loading a snapshot with its own matrix, while newer snapshots are saved"""
+    store = LocalVectorStore.from_texts(["apple"], EMBEDDING)
+    store.snapshot(str(tmp_path))
+    first = loaded_version(tmp_path, "vectors")
+    # A worker reads the documents of the first snapshot before the next ones are saved
+    with open(os.path.join(tmp_path, "vectors.json"), encoding="utf-8") as file:
+        documents = file.read()
+
+    versions = [first]
+    for text in ["banana", "cherry"]:
+        store.add_texts([text])
+        store.snapshot(str(tmp_path))
+        versions.append(loaded_version(tmp_path, "vectors"))
+    loaded = LocalVectorStore.load(str(tmp_path), EMBEDDING, read_only=True)
+
+    assert len(set(versions)) == 3
+    # The files of the current and previous versions are kept, the older ones are deleted
+    assert sorted(os.listdir(tmp_path)) == sorted(["vectors.json"] + [f"vectors.{v}.npy" for v in versions[1:]])
+    assert [document.page_content for document in loaded.similarity_search("cherry", k=3)][0] == "cherry"
+
+    with open(os.path.join(tmp_path, "vectors.json"), "w", encoding="utf-8") as file:
+        file.write(documents)
+    with pytest.raises(FileNotFoundError):
+        LocalVectorStore.load(str(tmp_path), EMBEDDING)
+
+
+def test_local_vector_store__should_search_the_hnsw_graph(tmp_path):
+    """Test for LocalVectorStore searching an HNSW graph from hnsw_threshold vectors, and persisting it"""
+    pytest.importorskip("hnswlib")
+    vectors = random_vectors(1000)
+    ids = [str(i) for i in range(1000)]
+    store = LocalVectorStore(embedding=EMBEDDING, hnsw_threshold=500, ef_search=100)
+    metadatas = [{"even": i % 2 == 0} for i in range(1000)]
+    query = random_vectors(1, seed=1)[0].tolist()
+    store.add_embeddings(ids[:600], vectors[:600].tolist(), metadatas=metadatas[:600], ids=ids[:600])
+    store.similarity_search_by_vector(query)
+    # The vectors appended after the first search are added to the existing graph
+    store.add_embeddings(ids[600:], vectors[600:].tolist(), metadatas=metadatas[600:], ids=ids[600:])
+
+    exact = {str(row) for row, _ in store._exact_search(store._prepare([query])[0], 10, None)}
+    approximate = {document.id for document in store.similarity_search_by_vector(query, k=10)}
+    filtered = store.similarity_search_by_vector(query, k=10, filter=lambda document: document.metadata["even"])
+
+    assert store._hnsw is not None and store._hnsw_size == 1000
+    assert len(exact & approximate) >= 8
+    assert len(filtered) == 10 and all(document.metadata["even"] for document in filtered)
+
+    store.snapshot(str(tmp_path))
+    loaded = LocalVectorStore.load(str(tmp_path), EMBEDDING, hnsw_threshold=500, read_only=True)
+
+    assert loaded._hnsw is not None
+    assert {document.id for document in loaded.similarity_search_by_vector(query, k=10)} == approximate
+
+
+def test_local_factory__should_save_and_share_the_snapshot(tmp_path):
+    """Test for LocalFactory saving a snapshot after a bulk load, loaded by the read-only workers"""
+    em_settings = BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://bloomz", pooling="")
+    db_settings = LocalSetting(provider=VectorDBProvider.Local, index="faq", path=str(tmp_path))
+    factory = get_vector_db_factory(db_settings, em_settings)
+    vectors = random_vectors(3).tolist()
+
+    with factory.bulk_load():
+        factory.write_embeddings(["apple", "banana", "cherry"], vectors, ids=["a", "b", "c"])
+
+    assert get_vector_db_factory(db_settings, em_settings).get_vector_store() is factory.get_vector_store()
+    assert factory.get_vector_store().metric == "l2"
+
+    worker = get_vector_db_factory(db_settings.model_copy(update={"read_only": True}), em_settings)
+    results = worker.get_vector_store().similarity_search_by_vector(vectors[1], k=1)
+
+    assert isinstance(worker.get_vector_store()._matrix, np.memmap)
+    assert results[0].page_content == "banana"
+    with pytest.raises(ValueError):
+        LocalSetting(provider=VectorDBProvider.Local, read_only=True)
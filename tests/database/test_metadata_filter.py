@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+
+from tock_genai_core.models.database import MetadataFilter, OpenSearchSetting, VectorDBProvider
+from tock_genai_core.models.embedding import BloomZEMSetting, EMProvider
+from tock_genai_core.models.security.raw_secret_key import RawSecretKey
+from tock_genai_core.services.langchain.factory import get_vector_db_factory
+from tock_genai_core.services.database.metadata_filter import (
+    to_metadata_predicate,
+    to_opensearch_filter,
+    to_pgvector_filter,
+)
+
+FILTERS = [
+    MetadataFilter(field="namespace", value="app"),
+    MetadataFilter(field="source", value={"$in": ["faq", "guide"]}),
+    MetadataFilter(field="year", value={"$gte": 2020, "$lt": 2025}),
+    MetadataFilter(field="draft", value={"$exists": False}),
+]
+
+
+def test_to_opensearch_filter__should_compile_a_bool_query():
+    """Test for to_opensearch_filter compiling metadata filters into an efficient k-NN filter"""
+    assert to_opensearch_filter(FILTERS) == {
+        "bool": {
+            "filter": [
+                {"term": {"metadata.namespace.keyword": "app"}},
+                {"terms": {"metadata.source.keyword": ["faq", "guide"]}},
+                {"range": {"metadata.year": {"gte": 2020}}},
+                {"range": {"metadata.year": {"lt": 2025}}},
+            ],
+            "must_not": [{"exists": {"field": "metadata.draft"}}],
+        }
+    }
+
+
+def test_to_pgvector_filter__should_compile_indexable_predicates():
+    """Test for to_pgvector_filter compiling metadata filters into GIN-indexable JSONB predicates"""
+    predicate = to_pgvector_filter(FILTERS, column("cmetadata", JSONB)).compile(dialect=postgresql.dialect())
+    sql = str(predicate)
+
+    assert sql.count("cmetadata @> CAST(") == 3
+    assert sql.count("cmetadata @@ CAST(") == 2
+    assert "NOT (cmetadata @? CAST(" in sql
+    assert "jsonb_path_match" not in sql
+    assert {"namespace": "app"} in predicate.params.values()
+    assert "$.year >= 2020" in predicate.params.values()
+
+
+def test_to_metadata_predicate__should_evaluate_the_filters():
+    """Test for to_metadata_predicate evaluating metadata filters with the semantics of the compiled queries"""
+    predicate = to_metadata_predicate(FILTERS)
+
+    assert predicate({"namespace": "app", "source": "faq", "year": 2021})
+    assert not predicate({"namespace": "app", "source": "blog", "year": 2021})
+    assert not predicate({"namespace": "app", "source": "faq", "year": 2025})
+    assert not predicate({"namespace": "app", "source": "faq", "year": "2021"})
+    assert not predicate({"namespace": "app", "source": "faq", "year": 2021, "draft": True})
+    assert to_metadata_predicate([MetadataFilter(field="source", value={"$nin": ["faq"]})])({})
+
+
+@pytest.mark.parametrize(
+    "metadata_filter",
+    [
+        MetadataFilter(field="source; DROP TABLE", value="faq"),
+        MetadataFilter(field="source", value={"$regex": "f.*"}),
+        MetadataFilter(field="source", value={"$in": "faq"}),
+    ],
+)
+def test_metadata_filter__should_reject_invalid_filters(metadata_filter):
+    """Test for the filter compilers rejecting invalid fields and operators"""
+    with pytest.raises(ValueError):
+        to_opensearch_filter([metadata_filter])
+
+
+def test_opensearch_vector_store__should_accept_metadata_filters():
+    """Test for the OpenSearch vector stores of the factory compiling MetadataFilter search filters"""
+    em_settings = BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://bloomz", pooling="")
+    db_settings = OpenSearchSetting(
+        provider=VectorDBProvider.OpenSearch,
+        db_url="http://localhost",
+        index="index",
+        use_ssl=False,
+        verify_certs=False,
+        username=RawSecretKey(value="user"),
+        password=RawSecretKey(value="password"),
+    )
+    vector_store = get_vector_db_factory(db_settings, em_settings).get_vector_store()
+    vector_store.client = MagicMock()
+    vector_store.client.search.return_value = {"hits": {"hits": []}}
+
+    vector_store._raw_similarity_search_with_score_by_vector([1.0], k=2, filter=FILTERS[:1])
+
+    body = vector_store.client.search.call_args.kwargs["body"]
+    assert "{'term': {'metadata.namespace.keyword': 'app'}}" in str(body)
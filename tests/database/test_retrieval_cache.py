@@ -0,0 +1,130 @@
+import asyncio
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from tock_genai_core.models.database import MetadataFilter, PGVectorSetting, RetrievalCacheSetting, VectorDBProvider
+from tock_genai_core.models.embedding import BloomZEMSetting, EMProvider
+from tock_genai_core.services.langchain.factory import get_vector_db_factory
+from tock_genai_core.services.langchain.factory.database import pgvector_factory
+from tock_genai_core.services.database.retrieval_cache import (
+    RetrievalCache,
+    RetrievalCacheMixin,
+    get_generation,
+    index_key,
+)
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    """Fake embedding model counting the embedded queries."""
+
+    queries: int = 0
+
+    def embed_query(self, text):
+        self.queries += 1
+        return super().embed_query(text)
+
+
+class CachedVectorStore(RetrievalCacheMixin, InMemoryVectorStore):
+    """In-memory vector store caching its searches."""
+
+
+class EmbeddingsVectorStore(InMemoryVectorStore):
+    """In-memory vector store writing precomputed embeddings asynchronously, as PGVector does."""
+
+    async def aadd_embeddings(self, texts, embeddings, metadatas=None, ids=None, **kwargs):
+        for text, embedding, id_ in zip(texts, embeddings, ids):
+            self.store[id_] = {"id": id_, "vector": embedding, "text": text, "metadata": {}}
+        return ids
+
+
+class CachedEmbeddingsVectorStore(RetrievalCacheMixin, EmbeddingsVectorStore):
+    """In-memory vector store writing precomputed embeddings and caching its searches."""
+
+
+def build_store(index, store_class=CachedVectorStore):
+    store = store_class(embedding=CountingEmbedding(size=8))
+    store.retrieval_cache = RetrievalCache(max_size=16)
+    store.retrieval_index = index
+    store.add_texts(["first text", "second text"], ids=["1", "2"])
+    return store
+
+
+def test_retrieval_cache__should_serve_identical_searches_from_the_cache():
+    """Test for RetrievalCacheMixin caching searches by normalized query, k and filters"""
+    store = build_store("identical")
+    filters = [MetadataFilter(field="source", value="faq")]
+
+    first = store.similarity_search("first  text", k=1, filters=filters)
+    first[0].metadata["modified"] = True
+    second = store.similarity_search(" first text ", k=1, filters=filters)
+    store.similarity_search("first text", k=2, filters=filters)
+    store.similarity_search("first text", k=1, filters=[MetadataFilter(field="source", value="guide")])
+
+    assert second[0].page_content == "first text" and "modified" not in second[0].metadata
+    assert store.embedding.queries == 3
+    assert len(store.retrieval_cache._entries) == 3
+
+
+def test_retrieval_cache__should_invalidate_the_index_on_write():
+    """Test for RetrievalCacheMixin bumping the generation of the index on writes, so that no stale result is served"""
+    store = build_store("invalidated")
+    generation = get_generation("invalidated")
+
+    assert [doc.id for doc in store.similarity_search("third text", k=3)] != ["3"]
+    store.add_texts(["third text"], ids=["3"])
+
+    assert get_generation("invalidated") == generation + 1
+    assert store.similarity_search("third text", k=1)[0].id == "3"
+    assert store.embedding.queries == 2
+
+
+def test_retrieval_cache__should_invalidate_the_index_on_async_embedding_writes():
+    """Test for RetrievalCacheMixin bumping the generation of the index when embeddings are written asynchronously"""
+    store = build_store("async-embeddings", CachedEmbeddingsVectorStore)
+    generation = get_generation("async-embeddings")
+
+    assert [doc.id for doc in store.similarity_search("third text", k=3)] != ["3"]
+    embedding = store.embedding.embed_query("third text")
+    asyncio.run(store.aadd_embeddings(["third text"], [embedding], ids=["3"]))
+
+    assert get_generation("async-embeddings") == generation + 1
+    assert store.similarity_search("third text", k=1)[0].id == "3"
+
+
+def test_retrieval_cache__should_share_entries_between_sync_and_async_searches():
+    """Test for RetrievalCacheMixin serving async searches from the entries of sync searches, and bypassing callables"""
+    store = build_store("async")
+
+    store.similarity_search_with_score("first text", k=1)
+    results = asyncio.run(store.asimilarity_search_with_score("first text", k=1))
+    store.similarity_search("first text", k=1, filter=lambda doc: True)
+    store.similarity_search("first text", k=1, filter=lambda doc: True)
+
+    assert results[0][0].page_content == "first text"
+    assert store.embedding.queries == 3
+
+
+def test_pgvector_factory__should_attach_the_retrieval_cache(monkeypatch):
+    """Test for PGVectorFactory sharing the retrieval cache of the settings, and invalidating it on bulk writes"""
+    monkeypatch.setattr(pgvector_factory, "copy_embeddings", lambda engine, **kwargs: None)
+    monkeypatch.setattr(pgvector_factory, "ensure_collection", lambda engine, name, *args, **kwargs: None)
+    em_settings = BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://bloomz", pooling="")
+    settings = dict(
+        provider=VectorDBProvider.PGVector,
+        db_url="localhost",
+        namespace="namespace",
+        async_mode=True,
+        bulk_load=True,
+        retrieval_cache=RetrievalCacheSetting(max_size=10),
+    )
+    factory = get_vector_db_factory(PGVectorSetting(index="first", **settings), em_settings)
+    first = factory.get_vector_store()
+    second = get_vector_db_factory(PGVectorSetting(index="second", **settings), em_settings).get_vector_store()
+    generation = get_generation(index_key(factory.db_settings))
+
+    factory.write_embeddings(texts=["text"], embeddings=[[1.0]])
+
+    assert first.retrieval_cache is second.retrieval_cache and first.retrieval_cache.max_size == 10
+    assert first.retrieval_index != second.retrieval_index
+    assert get_generation(first.retrieval_index) == generation + 1
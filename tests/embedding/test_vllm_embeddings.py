@@ -0,0 +1,105 @@
+import json
+import base64
+import struct
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from pydantic import ValidationError
+
+from tock_genai_core.models.embedding import EMProvider, VLLMEMSetting
+from tock_genai_core.services.embedding import VLLMEmbeddings
+from tock_genai_core.services.langchain.factory import get_em_factory
+
+
+class FakeVLLMHandler(BaseHTTPRequestHandler):
+    """Fake vLLM embedding API, embedding each text as [len(text), 0.5] and recording the requests."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append((self.path, request))
+        data = []
+        for index, text in enumerate(request["input"]):
+            embedding = [float(len(text)), 0.5]
+            if request["encoding_format"] == "base64":
+                embedding = base64.b64encode(struct.pack(f"<{len(embedding)}f", *embedding)).decode()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        body = json.dumps(
+            {
+                "object": "list",
+                "model": request["model"],
+                "data": data[::-1],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def vllm_url():
+    FakeVLLMHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeVLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("base64_encoded", [True, False])
+def test_vllm_embeddings__should_embed_in_batches(vllm_url, base64_encoded):
+    """Test for VLLMEmbeddings sending the texts in batches and keeping their order"""
+    embeddings = VLLMEmbeddings(model="model", api_base=vllm_url, batch_size=2, base64=base64_encoded)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    assert embeddings.embed_documents(texts) == [[float(len(text)), 0.5] for text in texts]
+    assert asyncio.run(embeddings.aembed_query("abc")) == [3.0, 0.5]
+
+    assert len(FakeVLLMHandler.requests) == 4
+    assert all(path == "/v1/embeddings" for path, _ in FakeVLLMHandler.requests)
+    assert sorted(request["input"] for _, request in FakeVLLMHandler.requests[:3]) == [
+        ["a", "bb"],
+        ["ccc", "dddd"],
+        ["eeeee"],
+    ]
+    assert FakeVLLMHandler.requests[0][1]["encoding_format"] == ("base64" if base64_encoded else "float")
+
+
+def test_vllm_em_factory__should_build_the_vllm_embeddings(vllm_url):
+    """Test for VLLMEMFactory building a VLLMEmbeddings with the settings batch size"""
+    settings = VLLMEMSetting(provider=EMProvider.Vllm, api_base=vllm_url, model="model", batch_size=8)
+    embeddings = get_em_factory(settings).get_model()
+
+    assert isinstance(embeddings, VLLMEmbeddings)
+    assert embeddings.batch_size == 8
+    assert embeddings.embed_query("abcd") == [4.0, 0.5]
+
+
+def test_vllm_embeddings__should_embed_in_several_event_loops(vllm_url):
+    """Test for VLLMEmbeddings using an async client per event loop"""
+    embeddings = VLLMEmbeddings(model="model", api_base=vllm_url)
+
+    async def embed(text):
+        return await embeddings.aembed_query(text), embeddings._get_async_client()
+
+    first, first_client = asyncio.run(embed("abc"))
+    second, second_client = asyncio.run(embed("abcd"))
+
+    assert (first, second) == ([3.0, 0.5], [4.0, 0.5])
+    assert first_client is not second_client
+
+
+def test_vllm_em_setting__should_reject_an_azure_endpoint():
+    """Test for VLLMEMSetting rejecting an api_base without the path of the OpenAI-compatible API"""
+    with pytest.raises(ValidationError):
+        VLLMEMSetting(provider=EMProvider.Vllm, api_base="http://vllm:8000", model="model")
@@ -16,7 +16,7 @@ from tock_genai_core.models.embedding import BloomZEMSetting, AzureOpenAIEMSetti
             ),
             AzureOpenAIEMFactory,
         ),
-        (VLLMEMSetting(provider=EMProvider.Vllm, api_base="http://api.com", model="model"), VLLMEMFactory),
+        (VLLMEMSetting(provider=EMProvider.Vllm, api_base="http://api.com/v1", model="model"), VLLMEMFactory),
     ],
 )
 def test_get_em_factory(settings, expected_output):
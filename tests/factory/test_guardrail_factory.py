@@ -1,13 +1,22 @@
 import pytest
 
 from tock_genai_core.services.langchain.factory import get_guardrail_factory
-from tock_genai_core.services.langchain.factory.guardrail import BloomzGuardrailFactory
-from tock_genai_core.models.guardrail import GuardrailProvider, BloomZGuardrailSetting
+from tock_genai_core.services.langchain.factory.guardrail import BloomzGuardrailFactory, CompositeGuardrailFactory
+from tock_genai_core.models.guardrail import GuardrailProvider, BloomZGuardrailSetting, CompositeGuardrailSetting
 
 
 @pytest.mark.parametrize(
     "settings, expected_output",
-    [(BloomZGuardrailSetting(provider=GuardrailProvider.BloomZ, api_base="http://api.com"), BloomzGuardrailFactory)],
+    [
+        (BloomZGuardrailSetting(provider=GuardrailProvider.BloomZ, api_base="http://api.com"), BloomzGuardrailFactory),
+        (
+            CompositeGuardrailSetting(
+                provider=GuardrailProvider.Composite,
+                guardrails=[BloomZGuardrailSetting(provider=GuardrailProvider.BloomZ, api_base="http://api.com")],
+            ),
+            CompositeGuardrailFactory,
+        ),
+    ],
 )
 def test_get_guardrail_factory(settings, expected_output):
     """Test for get_guardrail_factory function"""
@@ -0,0 +1,41 @@
+import sys
+import json
+import subprocess
+
+# Import time budget of the factory package, in seconds (measured around 0.7s, the margin absorbs slow CI runners).
+IMPORT_TIME_BUDGET = 2.0
+
+# Provider SDKs that must only be loaded when a provider using them is requested.
+PROVIDER_MODULES = [
+    "langchain_openai",
+    "langchain_postgres",
+    "langchain_community",
+    "opensearchpy",
+    "boto3",
+    "google.cloud.secretmanager",
+    "text_generation",
+]
+
+SCRIPT = f"""
+import sys, json, time
+start = time.perf_counter()
+import tock_genai_core.services.langchain.factory
+duration = time.perf_counter() - start
+print(json.dumps({{"duration": duration, "loaded": [m for m in {PROVIDER_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _import_factories() -> dict:
+    output = subprocess.run([sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_import__should_not_load_provider_sdks():
+    """Test that importing the factories doesn't import the provider SDKs"""
+    assert _import_factories()["loaded"] == []
+
+
+def test_import__should_be_within_budget():
+    """Test the import time of the factories"""
+    # Best of 3 runs, to be robust to a cold file system cache
+    assert min(_import_factories()["duration"] for _ in range(3)) < IMPORT_TIME_BUDGET
@@ -6,8 +6,9 @@ from tock_genai_core.models.llm import (
     AzureOpenAILLMSetting,
     HuggingFaceTextGenInferenceLLMSetting,
     VllmSetting,
+    RouterLLMSetting,
 )
-from tock_genai_core.services.langchain.factory.llm import TGIFactory, VllmFactory, AzureOpenAILLMFactory
+from tock_genai_core.services.langchain.factory.llm import TGIFactory, VllmFactory, AzureOpenAILLMFactory, RouterFactory
 
 
 @pytest.mark.parametrize(
@@ -42,6 +43,13 @@ from tock_genai_core.services.langchain.factory.llm import TGIFactory, VllmFacto
             ),
             VllmFactory,
         ),
+        (
+            RouterLLMSetting(
+                provider=LLMProvider.Router,
+                replicas=[VllmSetting(provider=LLMProvider.Vllm, model="model", api_base="http://api.com")],
+            ),
+            RouterFactory,
+        ),
     ],
 )
 def test_get_llm_factory(settings, expected_output):
@@ -0,0 +1,50 @@
+import pytest
+
+from tock_genai_core.models.embedding import BloomZEMSetting, EMProvider
+from tock_genai_core.services.langchain.factory import get_em_factory, factory_registry
+from tock_genai_core.services.langchain.factory.registry import FactoryRegistry
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    factory_registry.clear()
+    yield
+    factory_registry.clear()
+
+
+def test_get_model__should_reuse_model_for_identical_settings():
+    """Test for the memoization of factory models"""
+    first = get_em_factory(
+        BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://api.com", pooling="mean")
+    ).get_model()
+    second = get_em_factory(
+        BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://api.com", pooling="mean")
+    ).get_model()
+    other = get_em_factory(
+        BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://other.com", pooling="mean")
+    ).get_model()
+
+    assert first is second
+    assert first is not other
+
+
+def test_invalidate__should_rebuild_model():
+    """Test for FactoryRegistry.invalidate function"""
+    settings = BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://api.com", pooling="mean")
+    first = get_em_factory(settings).get_model()
+
+    assert factory_registry.invalidate(settings) == 1
+    assert get_em_factory(settings).get_model() is not first
+
+
+def test_get_or_create__should_evict_least_recently_used():
+    """Test for the LRU eviction of FactoryRegistry"""
+    registry = FactoryRegistry(max_size=2)
+    registry.get_or_create("a", object)
+    registry.get_or_create("b", object)
+    registry.get_or_create("a", object)
+    registry.get_or_create("c", object)
+
+    assert "a" in registry
+    assert "b" not in registry
+    assert "c" in registry
@@ -0,0 +1,64 @@
+import time
+import asyncio
+from typing import List
+
+from langchain_core.output_parsers import BaseOutputParser
+
+from tock_genai_core.services.guardrail import CompositeGuardrailOutputParser, GuardrailOutput
+
+
+class FakeGuardrailOutputParser(BaseOutputParser[dict]):
+    """Guardrail parser returning a fixed verdict after a delay."""
+
+    reasons: List[str] = []
+    delay: float = 0.0
+
+    def _verdict(self, text: str) -> dict:
+        return GuardrailOutput(
+            content=text, output_toxicity=bool(self.reasons), output_toxicity_reason=self.reasons
+        ).model_dump()
+
+    def parse(self, text: str) -> dict:
+        time.sleep(self.delay)
+        return self._verdict(text)
+
+    async def aparse(self, text: str) -> dict:
+        await asyncio.sleep(self.delay)
+        return self._verdict(text)
+
+
+def test_composite_guardrail__should_merge_reasons_when_no_toxicity():
+    """Test for CompositeGuardrailOutputParser.parse without any flagged text"""
+    parser = CompositeGuardrailOutputParser(
+        parsers=[FakeGuardrailOutputParser(), FakeGuardrailOutputParser(delay=0.05)],
+    )
+
+    assert parser.parse("hello") == {"content": "hello", "output_toxicity": False, "output_toxicity_reason": []}
+
+
+def test_composite_guardrail__should_short_circuit_on_toxicity():
+    """Test for CompositeGuardrailOutputParser.parse returning before the slow guardrails"""
+    parser = CompositeGuardrailOutputParser(
+        parsers=[FakeGuardrailOutputParser(delay=2), FakeGuardrailOutputParser(reasons=["insult"])],
+    )
+
+    start = time.perf_counter()
+    output = parser.parse("hello")
+
+    assert time.perf_counter() - start < 1
+    assert output["output_toxicity"] is True
+    assert output["output_toxicity_reason"] == ["insult"]
+
+
+def test_composite_guardrail__should_short_circuit_on_toxicity_async():
+    """Test for CompositeGuardrailOutputParser.aparse returning before the slow guardrails"""
+    parser = CompositeGuardrailOutputParser(
+        parsers=[FakeGuardrailOutputParser(delay=2), FakeGuardrailOutputParser(reasons=["insult"])],
+    )
+
+    start = time.perf_counter()
+    output = asyncio.run(parser.aparse("hello"))
+
+    assert time.perf_counter() - start < 1
+    assert output["output_toxicity"] is True
+    assert output["output_toxicity_reason"] == ["insult"]
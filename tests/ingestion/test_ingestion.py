@@ -0,0 +1,157 @@
+import threading
+from typing import Any, List
+
+import pytest
+from langchain_core.documents import Document
+
+from tock_genai_core.models.database import PGVectorSetting, VectorDBProvider
+from tock_genai_core.models.embedding import BloomZEMSetting, EMProvider
+from tock_genai_core.services.embedding import BloomzEmbeddings
+from tock_genai_core.services.ingestion import ingest_documents
+from tock_genai_core.services.langchain.factory.factories import VectorDBFactory
+
+
+class FakeVectorDBFactory(VectorDBFactory):
+    """Fake vector store factory recording the written and deleted chunks, and failing on the `fail_on` chunk id."""
+
+    written: List[Any] = []
+    deleted: List[str] = []
+    fail_on: str = ""
+
+    def get_vector_store(self):
+        raise NotImplementedError
+
+    def write_embeddings(self, texts, embeddings, metadatas=None, ids=None) -> None:
+        if self.fail_on in ids:
+            raise RuntimeError("Database unavailable.")
+        self.written.extend(zip(ids, texts, embeddings, metadatas))
+
+    def delete_embeddings(self, ids) -> None:
+        self.deleted.extend(ids)
+
+    def get_metadata_values(self, field, include_missing=False):
+        values = {
+            chunk_id: metadata.get(field)
+            for chunk_id, _, _, metadata in self.written
+            if include_missing or field in metadata
+        }
+        return {chunk_id: value for chunk_id, value in values.items() if chunk_id not in self.deleted}
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    lock = threading.Lock()
+    calls = []
+
+    def embed_documents(self, texts):
+        with lock:
+            calls.append(len(texts))
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(BloomzEmbeddings, "embed_documents", embed_documents)
+    return FakeVectorDBFactory(
+        db_settings=PGVectorSetting(provider=VectorDBProvider.PGVector, db_url="localhost", namespace="namespace"),
+        em_settings=BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://bloomz", pooling=""),
+        written=[],
+        deleted=[],
+    )
+
+
+def test_ingest_documents__should_chunk_embed_and_write(factory):
+    """Test for ingest_documents chunking the documents by tokens and writing their embeddings in batches"""
+    documents = [
+        Document(id="a", page_content="one two three four five six", metadata={"source": "a"}),
+        Document(id="b", page_content="seven eight", metadata={"source": "b"}),
+    ]
+
+    report = ingest_documents(
+        factory,
+        documents,
+        chunk_size=2,
+        chunk_overlap=0,
+        embedding_batch_size=2,
+        write_batch_size=3,
+        length_function=lambda text: len(text.split()),
+    )
+
+    assert sorted(chunk_id for chunk_id, _, _, _ in factory.written) == ["a:0", "a:1", "a:2", "b:0"]
+    assert ("a:1", "three four", [10.0], {"source": "a"}) in factory.written
+    assert (report.documents, report.skipped, report.chunks) == (2, 0, 4)
+    assert report.chunking.items == 2 and report.embedding.items == 4 and report.writing.items == 4
+    assert report.embedding.throughput > 0
+
+
+def test_ingest_documents__should_resume_from_checkpoint(factory, tmp_path):
+    """Test for ingest_documents checkpointing the ingested documents and resuming after a failure"""
+    checkpoint_path = str(tmp_path / "checkpoint")
+    documents = [Document(id=name, page_content=f"{name} text") for name in ["a", "b", "c"]]
+    factory.fail_on = "b:0"
+
+    with pytest.raises(RuntimeError):
+        ingest_documents(factory, documents, checkpoint_path, embedding_batch_size=1, write_batch_size=1)
+
+    factory.fail_on = ""
+    report = ingest_documents(factory, documents, checkpoint_path, embedding_batch_size=1, write_batch_size=1)
+
+    assert "b:0" in [chunk_id for chunk_id, _, _, _ in factory.written]
+    assert report.documents == 3 and report.skipped + report.chunks == 3 and report.skipped >= 1
+    assert ingest_documents(factory, documents, checkpoint_path).skipped == 3
+
+
+def test_ingest_documents__should_only_write_changed_chunks(factory):
+    """Test for ingest_documents only embedding the new or changed chunks, and deleting the removed ones"""
+    options = dict(chunk_size=2, chunk_overlap=0, length_function=lambda text: len(text.split()), incremental=True)
+    documents = [
+        Document(id="a", page_content="one two three four five six"),
+        Document(id="b", page_content="seven eight"),
+    ]
+    ingest_documents(factory, documents, **options)
+    first_run = len(factory.written)
+
+    report = ingest_documents(
+        factory,
+        [
+            Document(id="a", page_content="one two THREE FOUR five six"),
+            Document(id="c", page_content="nine ten"),
+        ],
+        **options,
+    )
+
+    written = factory.written[first_run:]
+    assert sorted(text for _, text, _, _ in written) == ["THREE FOUR", "nine ten"]
+    assert all(chunk_id == f"{chunk_id[0]}:{metadata['content_hash'][:16]}" for chunk_id, _, _, metadata in written)
+    assert len(factory.deleted) == 2 and factory.deleted[0].startswith("a:") and factory.deleted[1].startswith("b:")
+    assert (report.chunks, report.unchanged, report.deleted, report.embedding.items) == (2, 2, 2, 2)
+
+
+def test_ingest_documents__should_keep_the_moved_chunks(factory):
+    """Test for ingest_documents only writing the inserted chunk when a paragraph is inserted at the start"""
+    options = dict(chunk_size=2, chunk_overlap=0, length_function=lambda text: len(text.split()), incremental=True)
+    ingest_documents(factory, [Document(id="a", page_content="one two one two three four")], **options)
+    first_run = len(factory.written)
+
+    report = ingest_documents(
+        factory, [Document(id="a", page_content="zero zero one two one two three four")], **options
+    )
+
+    chunk_ids = [chunk_id for chunk_id, _, _, _ in factory.written]
+    assert [text for _, text, _, _ in factory.written[first_run:]] == ["zero zero"]
+    # The repeated chunk is identified by its occurrence
+    assert chunk_ids[0] + "-2" == chunk_ids[1]
+    assert (report.chunks, report.unchanged, report.deleted) == (1, 3, 0)
+
+
+def test_ingest_documents__should_replace_the_chunks_of_a_run_without_incremental(factory):
+    """Test for ingest_documents deleting the positional chunks of the ingested documents only, once incremental"""
+    options = dict(chunk_size=2, chunk_overlap=0, length_function=lambda text: len(text.split()))
+    documents = [
+        Document(id="a", page_content="one two three four"),
+        Document(id="b", page_content="five six"),
+    ]
+    ingest_documents(factory, documents, **options)
+
+    report = ingest_documents(factory, documents[:1], incremental=True, **options)
+
+    assert sorted(factory.deleted) == ["a:0", "a:1"]
+    assert (report.chunks, report.unchanged, report.deleted) == (2, 0, 2)
+    assert "b:0" in factory.get_metadata_values("content_hash", include_missing=True)
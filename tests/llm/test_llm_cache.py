@@ -0,0 +1,66 @@
+import time
+import asyncio
+
+from langchain_core.outputs import Generation
+from langchain_core.language_models import FakeStreamingListLLM
+
+from tock_genai_core.models.cache import CacheBackend, LLMCacheSetting
+from tock_genai_core.models.llm import LLMProvider, VllmSetting
+from tock_genai_core.services.langchain.factory import get_llm_factory
+from tock_genai_core.services.llm_cache import CachedStreamMixin, InMemoryLLMCache, SQLiteLLMCache
+
+
+class CachedFakeStreamingListLLM(CachedStreamMixin, FakeStreamingListLLM):
+    """Fake streaming LLM also caching its streamed calls."""
+
+
+def test_in_memory_cache__should_evict_and_expire():
+    """Test for InMemoryLLMCache eviction and expiration"""
+    cache = InMemoryLLMCache(max_size=1, ttl=0.1)
+    cache.update("first", "llm", [Generation(text="1")])
+    cache.update("second", "llm", [Generation(text="2")])
+
+    assert cache.lookup("first", "llm") is None
+    assert cache.lookup("second", "llm") == [Generation(text="2")]
+    time.sleep(0.2)
+    assert cache.lookup("second", "llm") is None
+
+
+def test_sqlite_cache__should_persist_responses(tmp_path):
+    """Test for SQLiteLLMCache persistence and eviction"""
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteLLMCache(path=path, max_size=1)
+    cache.update("first", "llm", [Generation(text="1")])
+    cache.update("second", "llm", [Generation(text="2")])
+
+    reopened = SQLiteLLMCache(path=path, max_size=1)
+    assert reopened.lookup("first", "llm") is None
+    assert reopened.lookup("second", "llm") == [Generation(text="2")]
+
+
+def test_cached_stream__should_replay_cached_response():
+    """Test for CachedStreamMixin replaying a cached streamed call"""
+    llm = CachedFakeStreamingListLLM(responses=["hello world", "other"], cache=InMemoryLLMCache())
+
+    assert "".join(llm.stream("prompt")) == "hello world"
+    replayed = list(llm.stream("prompt"))
+    assert replayed == ["hello ", "world"]
+    # The streamed response is shared with the non streamed calls
+    assert llm.invoke("prompt") == "hello world"
+    assert asyncio.run(llm.ainvoke("prompt")) == "hello world"
+
+
+def test_get_model__should_configure_cache():
+    """Test for the LLM cache configuration in the factories"""
+    settings = VllmSetting(
+        provider=LLMProvider.Vllm,
+        model="model",
+        api_base="http://api.com",
+        temperature=0,
+        cache=LLMCacheSetting(backend=CacheBackend.Memory, max_size=10),
+    )
+
+    model = get_llm_factory(settings).get_model()
+
+    assert isinstance(model, CachedStreamMixin)
+    assert isinstance(model.cache, InMemoryLLMCache) and model.cache.max_size == 10
@@ -0,0 +1,69 @@
+import time
+import asyncio
+from typing import Any, Iterator
+
+import pytest
+from langchain_core.outputs import GenerationChunk
+from langchain_core.language_models.llms import LLM
+
+from tock_genai_core.models.llm import LLMProvider, VllmSetting, RouterLLMSetting
+from tock_genai_core.services.langchain.factory import get_llm_factory
+from tock_genai_core.services.llm_metrics import StreamingMetrics, StreamingMetricsCallbackHandler
+
+
+class FakeStreamingLLM(LLM):
+    """Fake LLM streaming its response character by character."""
+
+    response: str = "hello"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _call(self, prompt: str, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> str:
+        return self.response
+
+    def _stream(self, prompt: str, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> Iterator:
+        for character in self.response:
+            time.sleep(0.01)
+            chunk = GenerationChunk(text=character)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def test_streaming_metrics__should_record_streamed_calls():
+    """Test for StreamingMetricsCallbackHandler recording the time to first token and the tokens per second"""
+    metrics = StreamingMetrics()
+    llm = FakeStreamingLLM(callbacks=[StreamingMetricsCallbackHandler("fake", metrics)])
+
+    llm.invoke("prompt")
+    assert metrics.get("fake") is None
+
+    assert "".join(llm.stream("prompt")) == "hello"
+    asyncio.run(llm.ainvoke("prompt"))
+    stats = metrics.get("fake")
+
+    assert stats.calls == 1
+    assert stats.tokens == 5
+    assert stats.last_ttft >= 0.01
+    assert 0 < stats.tokens_per_second <= 100
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        VllmSetting(provider=LLMProvider.Vllm, model="model", api_base="http://api.com", streaming=True),
+        RouterLLMSetting(
+            provider=LLMProvider.Router,
+            replicas=[VllmSetting(provider=LLMProvider.Vllm, model="model", api_base="http://api.com")],
+            streaming=True,
+        ),
+    ],
+)
+def test_get_model__should_enable_streaming(settings):
+    """Test for the streaming configuration in the factories"""
+    model = get_llm_factory(settings).get_model()
+
+    assert model.streaming
+    assert any(isinstance(callback, StreamingMetricsCallbackHandler) for callback in model.callbacks)
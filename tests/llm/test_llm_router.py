@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.language_models.llms import LLM
+from langchain_core.language_models import BaseChatModel, FakeListLLM
+
+from tock_genai_core.services.llm_router import RouterLLM
+
+
+class FailingLLM(LLM):
+    """LLM failing on every call."""
+
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "failing"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+        self.calls += 1
+        raise ConnectionError("replica down")
+
+
+class RecordingChatModel(BaseChatModel):
+    """Chat model recording the messages it receives."""
+
+    received: List[Any] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.received.append(messages)
+        message = AIMessage(content="bonjour", response_metadata={"model_name": "chat"})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class RecordingCallbackHandler(BaseCallbackHandler):
+    """Callback handler counting the started runs."""
+
+    def __init__(self):
+        self.starts = 0
+
+    def on_llm_start(self, *args: Any, **kwargs: Any) -> None:
+        self.starts += 1
+
+    def on_chat_model_start(self, *args: Any, **kwargs: Any) -> None:
+        self.starts += 1
+
+
+def test_router__should_balance_calls_among_replicas():
+    """Test for RouterLLM balancing equally loaded replicas"""
+    router = RouterLLM(replicas=[FakeListLLM(responses=["a"]), FakeListLLM(responses=["b"])])
+
+    assert sorted(router.invoke("hello").content for _ in range(2)) == ["a", "b"]
+
+
+def test_router__should_eject_failing_replica_and_use_fallback():
+    """Test for RouterLLM ejecting a failing replica and falling back"""
+    failing = FailingLLM()
+    router = RouterLLM(
+        replicas=[failing], fallbacks=[FakeListLLM(responses=["fallback"])], max_failures=2, ejection_duration=60
+    )
+
+    assert [router.invoke("hello").content for _ in range(4)] == ["fallback"] * 4
+    # The replica is not called anymore once ejected
+    assert failing.calls == 2
+    assert router.health[0].is_ejected()
+
+
+def test_router__should_stream_from_fallback():
+    """Test for RouterLLM streaming when the replica fails"""
+    router = RouterLLM(replicas=[FailingLLM()], fallbacks=[FakeListLLM(responses=["fallback"])])
+
+    assert "".join(chunk.content for chunk in router.stream("hello")) == "fallback"
+    assert asyncio.run(router.ainvoke("hello")).content == "fallback"
+
+
+def test_router__should_pass_the_messages_to_chat_replicas():
+    """Test for RouterLLM passing the chat messages to the replicas, with the callbacks of the router run"""
+    replica = RecordingChatModel()
+    handler = RecordingCallbackHandler()
+    router = RouterLLM(replicas=[FailingLLM()], fallbacks=[replica])
+    messages = [SystemMessage(content="Answer in French."), HumanMessage(content="hello")]
+
+    output = router.invoke(messages, config={"callbacks": [handler]})
+    streamed = list(router.stream(messages))
+
+    assert replica.received == [messages, messages]
+    assert output.content == "bonjour" and output.response_metadata == {"model_name": "chat"}
+    assert "".join(chunk.content for chunk in streamed) == "bonjour"
+    # The router run, the failed replica run and the fallback run
+    assert handler.starts == 3
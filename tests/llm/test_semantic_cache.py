@@ -0,0 +1,64 @@
+import time
+from typing import List
+
+from langchain_core.outputs import Generation
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import FakeListLLM
+
+from tock_genai_core.services.llm_cache import InMemoryLLMCache, TieredLLMCache
+from tock_genai_core.services.semantic_cache import SemanticLLMCache
+
+
+class FakeEmbeddings(Embeddings):
+    """Fake embeddings, paraphrases of the same question share the same direction."""
+
+    VECTORS = {
+        "what are your opening hours?": [1.0, 0.0, 0.0],
+        "when are you open?": [0.98, 0.2, 0.0],
+        "how do I close my account?": [0.0, 0.0, 1.0],
+    }
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.VECTORS[text]
+
+
+def test_semantic_cache__should_return_similar_answers():
+    """Test for SemanticLLMCache lookups above and below the similarity threshold"""
+    cache = SemanticLLMCache(embeddings=FakeEmbeddings(), similarity_threshold=0.9)
+    llm = FakeListLLM(responses=["From 9am to 5pm.", "From the settings page."], cache=cache)
+
+    assert llm.invoke("what are your opening hours?") == "From 9am to 5pm."
+    assert llm.invoke("when are you open?") == "From 9am to 5pm."
+    assert llm.invoke("how do I close my account?") == "From the settings page."
+    assert cache.metrics.lookups == 3
+    assert cache.metrics.hits == 1
+    assert cache.metrics.hit_rate == 1 / 3
+
+
+def test_semantic_cache__should_scope_and_expire_answers():
+    """Test for SemanticLLMCache namespace and LLM scoping, and expiration"""
+    first = SemanticLLMCache(embeddings=FakeEmbeddings(), namespace="first", ttl=0.1)
+    second = SemanticLLMCache(embeddings=FakeEmbeddings(), namespace="second")
+    second._index = first._index
+
+    first.update("what are your opening hours?", "llm", [Generation(text="From 9am to 5pm.")])
+
+    assert first.lookup("when are you open?", "llm") == [Generation(text="From 9am to 5pm.")]
+    assert first.lookup("when are you open?", "another llm") is None
+    assert second.lookup("when are you open?", "llm") is None
+    time.sleep(0.2)
+    assert first.lookup("when are you open?", "llm") is None
+
+
+def test_tiered_cache__should_store_in_every_cache():
+    """Test for TieredLLMCache lookups in order"""
+    exact, semantic = InMemoryLLMCache(), SemanticLLMCache(embeddings=FakeEmbeddings())
+    cache = TieredLLMCache([exact, semantic])
+
+    cache.update("what are your opening hours?", "llm", [Generation(text="From 9am to 5pm.")])
+
+    assert exact.lookup("when are you open?", "llm") is None
+    assert cache.lookup("when are you open?", "llm") == [Generation(text="From 9am to 5pm.")]
@@ -0,0 +1,160 @@
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from text_generation.errors import UnknownError
+
+from tock_genai_core.models.llm import HuggingFaceTextGenInferenceLLMSetting, LLMProvider
+from tock_genai_core.services.langchain.factory import get_llm_factory
+from tock_genai_core.services.tgi import TextGenerationInferenceLLM
+from tock_genai_core.services.admission import AdmissionController
+from tock_genai_core.services.langchain.factory.llm.tgi_factory import ManagedTextGenerationInferenceLLM
+
+TOKENS = ["Hello", " world", "!", "</s>"]
+
+
+class FakeTGIHandler(BaseHTTPRequestHandler):
+    """Fake TGI server, answering with the tokens of TOKENS and recording the requests and connections."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+    connections = set()
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(request)
+        self.connections.add(self.client_address)
+        if request["inputs"].startswith("slow"):
+            with self.lock:
+                FakeTGIHandler.active += 1
+                FakeTGIHandler.max_active = max(FakeTGIHandler.max_active, FakeTGIHandler.active)
+            time.sleep(0.05)
+            with self.lock:
+                FakeTGIHandler.active -= 1
+        if request["inputs"] == "gateway":
+            body = b"<html><body><h1>502 Bad Gateway</h1></body></html>"
+            self.send_response(502)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if request["stream"]:
+            body = b""
+            for token in TOKENS:
+                event = {"token": {"id": 0, "text": token, "logprob": 0.0, "special": token == "</s>"}}
+                body += b"data:" + json.dumps(event).encode() + b"\n\n"
+            content_type = "text/event-stream"
+        else:
+            body = json.dumps([{"generated_text": "".join(TOKENS[:-1])}]).encode()
+            content_type = "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def tgi_url():
+    FakeTGIHandler.requests = []
+    FakeTGIHandler.connections = set()
+    FakeTGIHandler.active = FakeTGIHandler.max_active = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTGIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_tgi__should_generate_and_stream_on_reused_connections(tgi_url):
+    """Test for TextGenerationInferenceLLM generating, streaming and reusing its sync connection"""
+    llm = TextGenerationInferenceLLM(inference_server_url=tgi_url, temperature=0)
+
+    assert llm.invoke("prompt") == "Hello world!"
+    assert list(llm.stream("prompt")) == ["Hello", " world", "!"]
+    assert llm.invoke("prompt", stop=[" world"]) == "Hello"
+
+    assert len(FakeTGIHandler.requests) == 3
+    assert FakeTGIHandler.requests[0]["parameters"]["temperature"] is None
+    assert FakeTGIHandler.requests[2]["parameters"]["stop"] == [" world"]
+    assert len(FakeTGIHandler.connections) == 1
+
+
+def test_tgi__should_batch_async_calls(tgi_url):
+    """Test for TextGenerationInferenceLLM sending async batches concurrently and streaming asynchronously"""
+    llm = TextGenerationInferenceLLM(inference_server_url=tgi_url, temperature=0.5, max_connections=2)
+
+    async def run():
+        result = await llm.agenerate(["a", "b", "c", "d"])
+        chunks = [chunk async for chunk in llm.astream("prompt", max_new_tokens=1)]
+        await llm.aclose()
+        return result, chunks
+
+    result, chunks = asyncio.run(run())
+
+    assert [generations[0].text for generations in result.generations] == ["Hello world!"] * 4
+    assert chunks == ["Hello", " world", "!"]
+    assert {request["inputs"] for request in FakeTGIHandler.requests[:4]} == {"a", "b", "c", "d"}
+    assert FakeTGIHandler.requests[4]["parameters"]["max_new_tokens"] == 1
+    assert FakeTGIHandler.requests[0]["parameters"]["do_sample"] is True
+    assert len(FakeTGIHandler.connections) <= 2
+
+
+def test_tgi__should_raise_the_text_generation_error_of_a_non_json_body(tgi_url):
+    """Test for TextGenerationInferenceLLM raising a text_generation error for an error page of a proxy"""
+    llm = TextGenerationInferenceLLM(inference_server_url=tgi_url)
+    streaming_llm = TextGenerationInferenceLLM(inference_server_url=tgi_url, streaming=True)
+
+    async def ainvoke(model):
+        try:
+            await model.ainvoke("gateway")
+        finally:
+            await model.aclose()
+
+    for model in [llm, streaming_llm]:
+        with pytest.raises(UnknownError, match="502 Bad Gateway"):
+            model.invoke("gateway")
+        with pytest.raises(UnknownError, match="502 Bad Gateway"):
+            asyncio.run(ainvoke(model))
+
+
+def test_tgi__should_admit_each_prompt_of_a_batch(tgi_url):
+    """Test for the TGI model holding an admission slot per prompt of an async batch"""
+    controller = AdmissionController("tgi", max_in_flight=2)
+    llm = ManagedTextGenerationInferenceLLM(inference_server_url=tgi_url, admission_controller=controller)
+
+    async def run():
+        try:
+            return await llm.agenerate([f"slow {i}" for i in range(6)])
+        finally:
+            await llm.aclose()
+
+    result = asyncio.run(run())
+
+    assert [generations[0].text for generations in result.generations] == ["Hello world!"] * 6
+    assert controller.admitted == 6 and controller.in_flight == 0
+    assert FakeTGIHandler.max_active == 2
+
+
+def test_tgi_factory__should_build_the_native_model(tgi_url):
+    """Test for TGIFactory building a TextGenerationInferenceLLM with the timeouts of the settings"""
+    settings = HuggingFaceTextGenInferenceLLMSetting(
+        provider=LLMProvider.TGI, api_base=tgi_url, streaming=True, timeout=5, max_connections=4
+    )
+    llm = get_llm_factory(settings).get_model()
+
+    assert isinstance(llm, TextGenerationInferenceLLM)
+    assert llm.timeout == 5 and llm.max_connections == 4
+    assert llm.invoke("prompt") == "Hello world!"
+    assert FakeTGIHandler.requests[0]["stream"] is True
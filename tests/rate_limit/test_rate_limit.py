@@ -0,0 +1,97 @@
+import time
+import asyncio
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from tock_genai_core.models.security.raw_secret_key import RawSecretKey
+from tock_genai_core.models.llm import AzureOpenAILLMSetting, LLMProvider
+from tock_genai_core.models.embedding import AzureOpenAIEMSetting, EMProvider
+from tock_genai_core.services.langchain.factory import get_em_factory, get_llm_factory
+from tock_genai_core.services.rate_limit import RateLimitedEmbeddings, RateLimiter, TokenBucket, estimate_tokens
+
+
+def test_token_bucket__should_pace_reservations():
+    """Test for TokenBucket delays once the burst is consumed"""
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.reserve(2) == 0
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve(1) == pytest.approx(0.2, abs=0.01)
+    bucket.refund(3)
+    assert bucket.reserve(1) == 0
+
+
+def test_rate_limiter__should_wait_for_the_most_limiting_quota():
+    """Test for RateLimiter combining the tokens and requests quotas"""
+    limiter = RateLimiter(tpm_limit=6000, rpm_limit=60)
+
+    # 10 seconds of burst for both quotas (95 requests, 950 tokens)
+    assert limiter._reserve(tokens=900, requests=1) == 0
+    assert limiter._reserve(tokens=100, requests=1) > 0
+
+
+def test_estimate_tokens__should_count_tokens():
+    """Test for estimate_tokens, with or without tiktoken encoding available"""
+    assert 0 < estimate_tokens(["hello world"]) <= 3
+
+
+def test_get_model__should_share_deployment_rate_limiter():
+    """Test for the rate limiter configuration in the Azure OpenAI factories"""
+    llm_settings = [
+        AzureOpenAILLMSetting(
+            provider=LLMProvider.AzureOpenAI,
+            api_key=RawSecretKey(value="key"),
+            temperature=temperature,
+            api_base="http://api.com",
+            api_version="2023-05-15",
+            deployment="gpt",
+            tpm_limit=10000,
+        )
+        for temperature in (0, 1)
+    ]
+    em_settings = AzureOpenAIEMSetting(
+        provider=EMProvider.AzureOpenAI,
+        api_key=RawSecretKey(value="key"),
+        api_base="http://api.com",
+        api_version="2023-05-15",
+        model="text-embedding-ada-002",
+        deployment="ada",
+        rpm_limit=100,
+    )
+
+    first, second = [get_llm_factory(settings).get_model() for settings in llm_settings]
+    embeddings = get_em_factory(em_settings).get_model()
+
+    assert first.rate_limiter is second.rate_limiter
+    assert first.rate_limiter.tpm_limit == 10000
+    assert isinstance(embeddings, RateLimitedEmbeddings)
+    assert embeddings.rate_limiter.rpm_limit == 100
+
+
+def test_rate_limited_embeddings__should_pace_each_request():
+    """Test for RateLimitedEmbeddings reserving the quotas request by request, just before each request"""
+
+    class RecordingEmbeddings(DeterministicFakeEmbedding):
+        calls: list = []
+
+        def embed_documents(self, texts):
+            self.calls.append((time.monotonic(), len(texts)))
+            return super().embed_documents(texts)
+
+    inner = RecordingEmbeddings(size=4)
+    # 10 requests per second, with a burst of 2 requests
+    limiter = RateLimiter(rpm_limit=600 / 0.95)
+    limiter._requests.capacity = limiter._requests._level = 2
+    embeddings = RateLimitedEmbeddings(inner, limiter, model=None, chunk_size=16)
+
+    vectors = embeddings.embed_documents([f"text {i}" for i in range(16 * 5)])
+
+    assert len(vectors) == 80 and [size for _, size in inner.calls] == [16] * 5
+    # The requests over the burst are spaced out instead of being sent back-to-back after a single wait
+    gaps = [later - earlier for (earlier, _), (later, _) in zip(inner.calls, inner.calls[1:])]
+    assert gaps[0] < 0.05 and all(gap == pytest.approx(0.1, abs=0.05) for gap in gaps[2:])
+
+    inner.calls.clear()
+    assert len(asyncio.run(embeddings.aembed_documents(["text"] * 40))) == 40
+    assert [size for _, size in inner.calls] == [16, 16, 8]
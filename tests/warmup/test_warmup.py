@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+from tock_genai_core.models.warmup import WarmupSetting
+from tock_genai_core.models.embedding import BloomZEMSetting, EMProvider
+from tock_genai_core.models.contextual_compressor import BloomZCompressorSetting, ContextualCompressorProvider
+from tock_genai_core.services import warmup as warmup_service
+from tock_genai_core.services.langchain.factory import factory_registry
+
+
+def test_warmup__should_report_each_provider(monkeypatch):
+    """Test for warmup function"""
+    factory_registry.clear()
+    embedding_response = MagicMock(status_code=200)
+    embedding_response.json.return_value = {"embedding": [[0.1, 0.2]]}
+    monkeypatch.setattr("tock_genai_core.services.embedding.requests.post", lambda *args, **kwargs: embedding_response)
+    monkeypatch.setattr(
+        "tock_genai_core.services.compressor.BloomzRerank.compress_documents",
+        MagicMock(side_effect=ConnectionError("unreachable")),
+    )
+
+    report = warmup_service.warmup(
+        WarmupSetting(
+            em=[BloomZEMSetting(provider=EMProvider.BloomZ, api_base="http://bloomz", pooling="mean")],
+            compressor=[
+                BloomZCompressorSetting(
+                    provider=ContextualCompressorProvider.BloomZ, endpoint="http://bloomz", min_score=0.5
+                )
+            ],
+        )
+    )
+
+    em_result, compressor_result = report.results
+    assert em_result.success and em_result.build_duration is not None and em_result.probe_duration is not None
+    assert not compressor_result.success and "unreachable" in compressor_result.error
+    assert not report.ready